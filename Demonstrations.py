@@ -0,0 +1,169 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+import numpy as np
+
+from new_House import House
+from SimpleSearch import SimpleSearch
+from Vec_Game_Env import Vec_Game_Env
+
+CHUNK_SIZE = 65536
+ARRAYS = ("obs", "actions", "rewards", "dones", "explored")
+
+
+class DemonstrationRecorder:
+    """
+    Streams transitions into chunked .npy files in a directory.
+
+    Every chunk k holds up to chunk_size transitions as obs_k.npy (T, obs_dim) float32,
+    actions_k.npy (T,) int8, rewards_k.npy (T,) float32, dones_k.npy (T,) bool and
+    explored_k.npy (T,) bool. actions are the demonstrator's actions; explored marks steps
+    where the env executed a random action instead (reward and done follow the executed one).
+    meta.json is written on close. Transitions added as batches keep their order, so with a
+    fixed batch of num_envs transition t belongs to env t % num_envs.
+    """
+
+    def __init__(self, directory, obs_dim, chunk_size=CHUNK_SIZE, meta=None):
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, "meta.json")):
+            raise FileExistsError(f"{directory} already holds demonstrations")
+        self.directory = directory
+        self.obs_dim = obs_dim
+        self.chunk_size = chunk_size
+        self.meta = dict(meta or {})
+        self.num_chunks = 0
+        self.num_steps = 0
+        self._buffers = {
+            "obs": np.empty((chunk_size, obs_dim), dtype=np.float32),
+            "actions": np.empty(chunk_size, dtype=np.int8),
+            "rewards": np.empty(chunk_size, dtype=np.float32),
+            "dones": np.empty(chunk_size, dtype=bool),
+            "explored": np.empty(chunk_size, dtype=bool),
+        }
+        self._filled = 0
+
+    def add(self, obs, actions, rewards, dones, explored=None):
+        """Adds a batch of transitions, (N, obs_dim) observations and (N,) arrays."""
+        obs = np.asarray(obs).reshape(-1, self.obs_dim)
+        batch = {"obs": obs, "actions": actions, "rewards": rewards, "dones": dones,
+                 "explored": np.zeros(len(obs), dtype=bool) if explored is None else explored}
+        start = 0
+        while start < len(obs):
+            count = min(len(obs) - start, self.chunk_size - self._filled)
+            for name, buffer in self._buffers.items():
+                buffer[self._filled:self._filled + count] = np.asarray(batch[name])[start:start + count]
+            self._filled += count
+            start += count
+            if self._filled == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        if self._filled == 0:
+            return
+        for name, buffer in self._buffers.items():
+            np.save(os.path.join(self.directory, f"{name}_{self.num_chunks:05d}.npy"), buffer[:self._filled])
+        self.num_chunks += 1
+        self.num_steps += self._filled
+        self._filled = 0
+
+    def close(self):
+        self.flush()
+        meta = dict(self.meta, obs_dim=self.obs_dim, chunk_size=self.chunk_size,
+                    chunks=self.num_chunks, steps=self.num_steps)
+        with open(os.path.join(self.directory, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+
+def iter_chunks(directory, mmap=True):
+    """Yields each chunk of a demonstration directory as a dict of (memory-mapped) arrays."""
+    with open(os.path.join(directory, "meta.json")) as f:
+        num_chunks = json.load(f)["chunks"]
+    for k in range(num_chunks):
+        yield {name: np.load(os.path.join(directory, f"{name}_{k:05d}.npy"), mmap_mode="r" if mmap else None)
+               for name in ARRAYS}
+
+
+def load_demonstrations(directory):
+    """All transitions of a demonstration directory as one dict of in-memory arrays."""
+    chunks = list(iter_chunks(directory))
+    if not chunks:
+        raise ValueError(f"{directory} holds no demonstrations")
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in ARRAYS}
+
+
+def record_simple_search(directory, num_steps, num_envs=256, ran_house=False, num_random_walls=10,
+                         exploration=0.1, seed=0, chunk_size=CHUNK_SIZE):
+    """
+    Records SimpleSearch rollouts on a Vec_Game_Env of num_envs houses.
+
+    SimpleSearch never gives up a stuck turn on its own, so with probability exploration an
+    env executes a random action while the SimpleSearch action is still recorded as the label.
+    That keeps the rollouts moving and shows the demonstrator's choice in off-path states.
+
+    Args:
+        directory: Output directory (see DemonstrationRecorder).
+        num_steps: Transitions to record, rounded up to whole vec steps.
+        num_envs, ran_house, num_random_walls: Vec_Game_Env parameters; the defaults match the
+            fixed layouts main.py trains on.
+        exploration: Probability of a random executed action per env step.
+        seed: Seed of the layouts, targets and exploration noise.
+        chunk_size: Transitions per chunk file.
+
+    Returns:
+        dict: Recording report (steps, episodes, seconds).
+    """
+    rng = np.random.default_rng(seed)
+    size = 512
+    robot_start_pos = [40, size // 2 - 10]
+    houses = [House(size, robot_start_pos, ran_house, num_random_walls, rng=rng) for _ in range(num_envs)]
+    env = Vec_Game_Env(num_envs, size=size, houses=houses)
+    agent = SimpleSearch(env.observation_space, env.action_space, ray_offsets=env.ray_offsets)
+    meta = {"policy": "SimpleSearch", "num_envs": num_envs, "ran_house": ran_house,
+            "num_random_walls": num_random_walls, "exploration": exploration, "seed": seed}
+    start = time.perf_counter()
+    episodes = 0
+    with DemonstrationRecorder(directory, env.observation_space.shape[0], chunk_size, meta) as recorder:
+        obs = env.reset()
+        for _ in range(-(-num_steps // num_envs)):
+            actions, _ = agent.predict(obs)
+            explored = rng.random(num_envs) < exploration
+            executed = np.where(explored, rng.integers(0, 3, size=num_envs), actions)
+            next_obs, rewards, dones, _ = env.step(executed)
+            recorder.add(obs, actions, rewards, dones, explored)
+            episodes += int(dones.sum())
+            obs = next_obs
+        recorder.meta["episodes"] = episodes
+    return {"steps": recorder.num_steps, "episodes": episodes, "seconds": time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record SimpleSearch demonstrations for behavior cloning")
+    parser.add_argument("directory", help="Output directory for the chunked arrays")
+    parser.add_argument("--steps", type=int, default=1000000)
+    parser.add_argument("--num-envs", type=int, default=256)
+    parser.add_argument("--random-layouts", action="store_true", help="Random layouts instead of the fixed ones")
+    parser.add_argument("--num-random-walls", type=int, default=10)
+    parser.add_argument("--exploration", type=float, default=0.1, help="Probability of a random executed action")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    report = record_simple_search(args.directory, args.steps, args.num_envs, args.random_layouts,
+                                  args.num_random_walls, args.exploration, args.seed, args.chunk_size)
+    size = sum(os.path.getsize(path) for path in glob.glob(os.path.join(args.directory, "*.npy")))
+    print(f"Recorded {report['steps']} steps ({report['episodes']} finished episodes) to {args.directory} "
+          f"in {report['seconds']:.1f} s, {size / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Headless evaluation of a policy over many seeded episodes, spread over a process pool.
+
+Episode i resets the env with seed base_seed + i and a resampled layout, so its layout, target
+and (for deterministic policies) outcome do not depend on the worker that runs it. Works for
+SimpleSearch, for a saved A2C model plus its VecNormalize statistics and for an A2C policy
+exported for NumpyPolicy:
+
+    python Evaluation.py simple --episodes 2000 --workers 8 --output simple.jsonl
+    python Evaluation.py a2c --model p_2.zip --vec-normalize p_4_vec_normalize.pkl --episodes 2000
+    python Evaluation.py numpy --model p_2_policy.npz --episodes 2000
+
+Per-episode results go to --output (JSON lines, or CSV for a .csv path); the summary reports
+success rate, steps and SPL with 95% confidence intervals.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import time
+
+import numpy as np
+
+from Game_Env import Game_Env
+from Metrics import mean_interval, spl_terms, wilson_interval
+
+MAX_STEPS = 3000
+RESULT_FIELDS = ("seed", "success", "steps", "reward", "path_length", "shortest_path_length", "spl",
+                 "layout_name", "layout_index", "target_x", "target_y")
+
+# Env and policy of a pool worker, built once by _init_worker
+_worker = {}
+
+
+def make_env(ran_house=True, num_random_walls=10, corpus=None, num_rays=17, fov=60.0, ray_noise=0.0):
+    return Game_Env(None, ran_house=ran_house, num_random_walls=num_random_walls, corpus=corpus,
+                    resample_layout=True, geodesic=True, num_rays=num_rays, fov=fov, ray_noise=ray_noise)
+
+
+def load_policy(policy, env, model_path=None, vec_normalize_path=None):
+    """
+    Builds predict(obs) -> action for a policy.
+
+    Args:
+        policy: "simple" for SimpleSearch, "a2c" for a saved A2C model or "numpy" for an A2C
+            policy exported with NumpyPolicy.export_policy.
+        env: Env whose spaces the policy is built for.
+        model_path: A2C model zip, or the exported .npz for "numpy".
+        vec_normalize_path: Optional VecNormalize pickle the A2C model was trained with.
+
+    Returns:
+        callable: Deterministic predict(obs) -> int action.
+    """
+    if policy == "simple":
+        from SimpleSearch import SimpleSearch
+        agent = SimpleSearch(env.observation_space, env.action_space, ray_offsets=env.robot.get_ray_offsets())
+        return lambda obs: int(agent.predict(obs)[0])
+    if policy == "numpy":
+        from NumpyPolicy import NumpyPolicy
+        if model_path is None:
+            raise ValueError("A numpy policy needs the exported policy file")
+        numpy_policy = NumpyPolicy(model_path)
+        return lambda obs: int(numpy_policy.predict(obs)[0])
+    if policy != "a2c":
+        raise ValueError(f"Unknown policy {policy!r}")
+    if model_path is None:
+        raise ValueError("An A2C policy needs a model path")
+
+    import torch
+    from stable_baselines3 import A2C
+    from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
+    torch.set_num_threads(1)  # The pool provides the parallelism
+    model = A2C.load(model_path, device="cpu")
+    if vec_normalize_path is None:
+        return lambda obs: int(model.predict(obs, deterministic=True)[0])
+    vec_normalize = VecNormalize.load(vec_normalize_path, DummyVecEnv([lambda: env]))
+    vec_normalize.training = False
+    return lambda obs: int(model.predict(vec_normalize.normalize_obs(obs), deterministic=True)[0])
+
+
+def run_episode(env, predict, seed, max_steps=MAX_STEPS):
+    """Runs one episode with seed, truncated after max_steps. Returns its result dict."""
+    obs, _ = env.reset(seed=seed)
+    terminated = False
+    steps = 0
+    total_reward = 0.0
+    while not terminated and steps < max_steps:
+        obs, reward, terminated, _, _ = env.step(predict(obs))
+        total_reward += reward
+        steps += 1
+    house = env.house
+    return {
+        "seed": seed,
+        "success": bool(terminated),
+        "steps": steps,
+        "reward": float(total_reward),
+        "path_length": float(env.path_length),
+        "shortest_path_length": float(env.shortest_path_length),
+        "spl": float(spl_terms([terminated], [env.shortest_path_length], [env.path_length])[0]),
+        "layout_name": house.layout_name,
+        "layout_index": house.layout_index,
+        "target_x": float(house.target_pos[0]),
+        "target_y": float(house.target_pos[1]),
+    }
+
+
+def _init_worker(policy, model_path, vec_normalize_path, env_kwargs, max_steps, live_view=None,
+                 trajectory_log=None):
+    env = make_env(**env_kwargs)
+    if trajectory_log is not None:
+        if multiprocessing.current_process().name != "MainProcess":
+            trajectory_log = os.path.join(trajectory_log, f"worker_{os.getpid()}")
+            # Writes the last chunk when the worker exits
+            multiprocessing.util.Finalize(env, env.stop_trajectory_log, exitpriority=10)
+        env.start_trajectory_log(trajectory_log)
+    if live_view is not None:
+        with live_view.get_lock():  # Only the first worker to start shows its episodes
+            if not live_view.value:
+                live_view.value = 1
+                env.attach_viewer(title="Evaluation")
+    _worker.update(env=env, predict=load_policy(policy, env, model_path, vec_normalize_path), max_steps=max_steps)
+
+
+def _run_worker_episode(seed):
+    return run_episode(_worker["env"], _worker["predict"], seed, _worker["max_steps"])
+
+
+def evaluate(policy, seeds, workers=None, model_path=None, vec_normalize_path=None, env_kwargs=None,
+             max_steps=MAX_STEPS, chunksize=None, live_view=False, trajectory_log=None):
+    """
+    Runs one episode per seed across a process pool.
+
+    Args:
+        policy, model_path, vec_normalize_path: Policy to evaluate, see load_policy.
+        seeds: Episode seeds.
+        workers: Worker processes, defaults to the CPU count. 1 runs in this process.
+        env_kwargs: make_env arguments (ran_house, num_random_walls, corpus, num_rays, fov, ray_noise).
+        max_steps: Steps before an episode counts as failed.
+        chunksize: Episodes handed to a worker at a time.
+        live_view: Show the episodes of one worker in a viewer window (see Game_Env.attach_viewer).
+        trajectory_log: Directory to log every episode to (TrajectoryLog.py), one log per worker
+            in worker_<pid> subdirectories when there is a pool. The seed identifies an episode.
+
+    Returns:
+        list: Result dicts in seed order.
+    """
+    seeds = [int(seed) for seed in seeds]
+    env_kwargs = env_kwargs or {}
+    workers = workers or os.cpu_count() or 1
+    init_args = (policy, model_path, vec_normalize_path, env_kwargs, max_steps,
+                 multiprocessing.Value("b", 0) if live_view else None, trajectory_log)
+    if workers == 1:
+        _init_worker(*init_args)
+        try:
+            return [_run_worker_episode(seed) for seed in seeds]
+        finally:
+            _worker["env"].close()
+    if chunksize is None:
+        chunksize = max(1, len(seeds) // (workers * 8))
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=init_args) as pool:
+        results = pool.map(_run_worker_episode, seeds, chunksize=chunksize)
+        pool.close()
+        pool.join()  # Let the workers exit normally, closing their viewers and logs
+    return results
+
+
+def summarize(results):
+    """Success rate, steps and SPL over results, each with its 95% confidence interval."""
+    successes = np.array([result["success"] for result in results])
+    steps = np.array([result["steps"] for result in results], dtype=np.float64)
+    num_successes = int(successes.sum())
+    spl, spl_low, spl_high = mean_interval([result["spl"] for result in results])
+    mean_steps, steps_low, steps_high = mean_interval(steps)
+    success_steps, success_steps_low, success_steps_high = mean_interval(steps[successes])
+    return {
+        "episodes": len(results),
+        "successes": num_successes,
+        "success_rate": num_successes / len(results) if results else 0.0,
+        "success_rate_ci": wilson_interval(num_successes, len(results)),
+        "mean_steps": mean_steps,
+        "mean_steps_ci": (steps_low, steps_high),
+        "mean_steps_success": success_steps,
+        "mean_steps_success_ci": (success_steps_low, success_steps_high),
+        "spl": spl,
+        "spl_ci": (spl_low, spl_high),
+    }
+
+
+def write_results(path, results):
+    """Writes per-episode results as JSON lines, or as CSV when path ends in .csv."""
+    with open(path, "w", newline="") as f:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        else:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+
+
+def print_summary(summary):
+    low, high = summary["success_rate_ci"]
+    print(f"episodes      {summary['episodes']}")
+    print(f"success rate  {summary['success_rate'] * 100:5.1f}%  [{low * 100:5.1f}%, {high * 100:5.1f}%]")
+    low, high = summary["mean_steps_ci"]
+    print(f"steps         {summary['mean_steps']:7.1f}  [{low:7.1f}, {high:7.1f}]")
+    low, high = summary["mean_steps_success_ci"]
+    print(f"steps (found) {summary['mean_steps_success']:7.1f}  [{low:7.1f}, {high:7.1f}]")
+    low, high = summary["spl_ci"]
+    print(f"SPL           {summary['spl']:7.3f}  [{low:7.3f}, {high:7.3f}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("policy", choices=("simple", "a2c", "numpy"))
+    parser.add_argument("--model", help="A2C model zip (exported .npz for numpy)")
+    parser.add_argument("--vec-normalize", help="VecNormalize pickle of the A2C model")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--base-seed", type=int, default=0, help="Seed of the first episode")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-steps", type=int, default=MAX_STEPS)
+    parser.add_argument("--fixed-layouts", action="store_true", help="Use the three fixed layouts")
+    parser.add_argument("--num-random-walls", type=int, default=10)
+    parser.add_argument("--corpus", help="Layout corpus to draw the layouts from")
+    parser.add_argument("--num-rays", type=int, default=17, help="Range sensor rays (e.g. 360 with --fov 360)")
+    parser.add_argument("--fov", type=float, default=60.0, help="Sensor field of view in degrees, 360 for lidar")
+    parser.add_argument("--ray-noise", type=float, default=0.0, help="Std of the per-ray angular noise (degrees)")
+    parser.add_argument("--output", help="Per-episode results (.jsonl or .csv)")
+    parser.add_argument("--live-view", action="store_true", help="Watch the episodes of one worker")
+    parser.add_argument("--trajectory-log", help="Directory to log every episode to, for TrajectoryLog.py replay")
+    args = parser.parse_args()
+
+    env_kwargs = dict(ran_house=not args.fixed_layouts, num_random_walls=args.num_random_walls, corpus=args.corpus,
+                      num_rays=args.num_rays, fov=args.fov, ray_noise=args.ray_noise)
+    start = time.perf_counter()
+    results = evaluate(args.policy, range(args.base_seed, args.base_seed + args.episodes), args.workers,
+                       args.model, args.vec_normalize, env_kwargs, args.max_steps, live_view=args.live_view,
+                       trajectory_log=args.trajectory_log)
+    elapsed = time.perf_counter() - start
+    if args.output:
+        write_results(args.output, results)
+    print_summary(summarize(results))
+    print(f"{len(results)} episodes in {elapsed:.1f} s ({len(results) / elapsed:.1f} episodes/s)")
+
+
+if __name__ == "__main__":
+    main()
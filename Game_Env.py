@@ -1,23 +1,29 @@
 import gymnasium as gym
 from gymnasium import spaces
-import pygame
 import numpy as np
 import math
 import time
 
 from SimpleSearch import SimpleSearch
+from LayoutCorpus import open_corpus
+from Metrics import spl
 from new_House import House
 from Robot import Robot
+from StepProfiler import StepProfiler, NullProfiler
 
 
 # Global
 dist_threshold = 30
+layout_pool_targets = 32  # Target positions drawn per pooled layout
 
 
 class Game_Env(gym.Env):
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 30}
 
-    def __init__(self, render_mode="human", size=512, ran_house=True):
+    def __init__(self, render_mode="human", size=512, ran_house=True, distance_field=False, num_random_walls=10,
+                 profile=False, corpus=None, layout_index=None, layout_seed=None, resample_layout=False,
+                 layout_pool_size=0, geodesic=False, reward_shaping=False, shaping_scale=1.0, shaping_gamma=0.99,
+                 render_scale=1.0, num_rays=17, fov=60.0, ray_length=None, ray_noise=0.0):
         super().__init__()
         self.render_mode = render_mode
         self.size = size
@@ -25,14 +31,47 @@ class Game_Env(gym.Env):
         self.clock = None
         self.font = None  # <-- Add font attribute
         self.start_time = 0
+        self.viewer = None  # Live view in a separate process, see attach_viewer
+        # rgb_array frames are drawn with NumPy (Rasterizer) at round(size * render_scale) pixels
+        self.render_scale = render_scale
+        self.rasterizer = None
+        self.trajectory_log = None  # TrajectoryWriter, see start_trajectory_log
+        self._viewer_walls = None  # Walls last sent to the viewer
 
         # --- Initialize House and Robot instances ---
         self.robot_start_pos = [40, size // 2 - 10]
-        self.house = House(size, self.robot_start_pos, ran_house)
+        # Layouts come from a pre-generated corpus (LayoutCorpus, or the path of one) when given,
+        # picked by layout_index, by layout_seed or at random; otherwise they are generated
+        if isinstance(corpus, str):
+            corpus = open_corpus(corpus)
+        if corpus is not None and layout_index is None and layout_seed is not None:
+            layout_index = corpus.index_of_seed(layout_seed)
+        house_rng = np.random.default_rng(layout_seed) if layout_seed is not None else self.np_random
+        self.house = House(size, self.robot_start_pos, ran_house, num_random_walls,
+                           bake_distance_field=distance_field, rng=house_rng, corpus=corpus,
+                           layout_index=layout_index)
+        self.corpus = corpus
+        # Per-episode layouts: with resample_layout every reset swaps in a new layout and target
+        # (also per reset with options={"resample_layout": True}). They are generated (or drawn
+        # from the corpus) on demand, or with layout_pool_size > 0 picked from that many layouts
+        # built once here, so a reset only switches references.
+        self.resample_layout = resample_layout
+        self.layout_pool = [self.house.get_layout(layout_pool_targets)] if layout_pool_size > 0 else []
+        for _ in range(layout_pool_size - 1):
+            self.house.resample(corpus)
+            self.layout_pool.append(self.house.get_layout(layout_pool_targets))
+        if layout_pool_size > 1:
+            self.house.set_layout(self.layout_pool[0])
+        # Range sensor: num_rays rays spread over fov degrees (fov=360 for a full lidar scan), ray_length
+        # max range (0.7 * size by default) and ray_noise the std (degrees) of per-ray angular noise
         self.robot = Robot(
             start_pos=self.robot_start_pos,
             start_angle=0.0,
-            ray_length=self.house.size * 0.7  # Ensure ray length is based on house size
+            num_rays=num_rays,
+            fov=fov,
+            ray_length=ray_length if ray_length is not None else self.house.size * 0.7,
+            ray_noise=ray_noise,
+            rng=self.np_random,
         )
 
         # --- Action and Observation Spaces (same as before) ---
@@ -45,6 +84,37 @@ class Game_Env(gym.Env):
 
         self.num_of_failed_moved = 0
 
+        # Latest sensor snapshot, shared by the observation, info and render() (see _sense)
+        self.sensors = None
+
+        # Preallocated buffers filled in place every step: raw ray distances and the observation.
+        # Observations alternate between two buffers, so a returned observation stays valid through
+        # the following step()/reset() (DummyVecEnv holds the terminal observation while it resets).
+        num_rays = self.robot.num_rays
+        self._rays = np.empty(num_rays, dtype=np.float64)
+        self._normalized_rays = np.empty(num_rays, dtype=np.float64)
+        self._ray_length = np.array(self.robot.ray_length, dtype=np.float64)  # 0-d, no scalar conversion per call
+        self._obs_buffers = np.zeros((2,) + self.observation_space.shape, dtype=np.float32)
+        self._obs_views = [(obs, obs[:num_rays]) for obs in self._obs_buffers]  # (observation, its rays)
+        self._obs_index = 0
+
+        # Shortest-path distances to the target (House.geodesic_field) for SPL and reward shaping.
+        # With geodesic=True the info of reset() and step() holds the geodesic distance to the
+        # target, the path length so far and the shortest path length of the episode. With
+        # reward_shaping=True, step() adds shaping_gamma * phi(s') - phi(s) to the reward, where
+        # phi = -shaping_scale * geodesic distance (0 once terminated), which keeps optimal policies.
+        self.geodesic = geodesic or reward_shaping
+        self.reward_shaping = reward_shaping
+        self.shaping_scale = shaping_scale
+        self.shaping_gamma = shaping_gamma
+        self.geodesic_field = None
+        self.path_length = 0.0
+        self.shortest_path_length = None
+        self._potential = 0.0
+
+        # Opt-in per-stage timings of step()/reset() (see get_step_stats and info["step_timings_us"])
+        self.set_profiling(profile)
+
     def check_collision_rays(self, rays):  # Keep the existing collision check for reward calculation
         # collision_dist = 0.2
         # count = 0
@@ -56,17 +126,21 @@ class Game_Env(gym.Env):
         # return False
 
         collision_dist = 0.2
-        for ray in rays:
-            if ray / self.robot.ray_length > collision_dist:
-                return False
-        return True
+        return bool(rays.max(initial=0.0) / self.robot.ray_length <= collision_dist)
 
     def step(self, action):
+        """
+        Gymnasium step. The returned observation is one of two reused buffers: it stays valid
+        through the next step() or reset() and is overwritten by the one after, so copy it to
+        keep it longer. info["rays"] (normalized ray distances) is a copy and can be kept.
+        """
+        profiler = self.profiler
+        profiler.start()
         prev_location = self.robot.pos
 
         # 1. Process Action
         if action == 0:
-            self.robot.move_forward(self.house.walls)  # Pass walls for collision check inside move_forward
+            self.robot.move_forward(self.house.wall_index)  # Pass walls for collision check inside move_forward
         elif action == 1:
             self.robot.turn_left()
         elif action == 2:
@@ -76,18 +150,21 @@ class Game_Env(gym.Env):
             self.num_of_failed_moved += 1
         else:
             self.num_of_failed_moved = 0
-
-        # 2. Calculate Rays and Observation
-        rays = self.robot.cast_rays(self.house.walls)
-
-        # 3. Check for Collision (AFTER movement, for reward calculation)
-        collision = self.check_collision_rays(rays)
-
-        # 4. Check if Target Found
-        target_found, distance_from_target, target_in_direction, rays = self._check_target_found(rays)
-
-        # 4. normalize
-        rays = np.array(rays, dtype=np.float32) / self.robot.ray_length  # Normalize
+            if self.geodesic:
+                self.path_length += math.hypot(self.robot.pos[0] - prev_location[0],
+                                               self.robot.pos[1] - prev_location[1])
+        profiler.lap("move")
+
+        # 2-4. Sense once: rays, collision (AFTER movement, for reward calculation) and target
+        sensors = self._sense()
+        collision = sensors["collision"]
+        target_found = sensors["target_found"]
+        distance_from_target = sensors["distance_from_target"]
+        target_in_direction = sensors["target_in_direction"]
+
+        # 5. normalize and set up obs (in place)
+        obs, rays = self._fill_obs()
+        profiler.lap("obs")
 
         # 6. Calculate Reward
         reward = self._calculate_reward(collision, target_found, distance_from_target, rays)
@@ -96,36 +173,171 @@ class Game_Env(gym.Env):
         terminated = target_found and (
                     distance_from_target <= dist_threshold)  # Episode ends only when target is found now
         truncated = False  # No truncation for now
-        info = {"rays": rays, "target_found": target_found, "collision": collision}  # Add collision info
-
-        # 8. set up obs:
-        obs = np.append(rays, [1 if target_found else 0, target_in_direction, self.num_of_failed_moved])
-
-        #9. render if necessary
+        info = {"rays": rays.copy(), "target_found": target_found, "collision": collision}  # Add collision info
+        if self.geodesic:
+            reward = self._update_geodesic(reward, terminated, info)
+        profiler.lap("reward")
+        if self.trajectory_log is not None:
+            self.trajectory_log.add_step(self.robot.pos, self.robot.angle, action, reward, sensors["rays"],
+                                         collision, target_found, terminated)
+            profiler.lap("log")
+
+        # 8. render if necessary
         if self.render_mode == "human":
             self.render()
+            profiler.lap("render")
+        if self.viewer is not None:
+            self._publish_view()
+            profiler.lap("render")
+
+        if self.profile:
+            info["step_timings_us"] = profiler.last_step_us()
 
         # print(">target: ", target_found, "> collision: ", collision, "> target dir: ", target_in_direction)
 
         return obs, reward, terminated, truncated, info
 
     def reset(self, seed=None, options=None):
+        """
+        Gymnasium reset. Like step(), returns an observation buffer that the second following
+        step() or reset() overwrites.
+        """
+        profiler = self.profiler
+        profiler.start()
         super().reset(seed=seed, options=options)
-        self.robot.pos = np.array(self.robot_start_pos, dtype=np.float32)
+        if options is not None and "resample_layout" in options:
+            resample_layout = options["resample_layout"]
+        else:
+            resample_layout = self.resample_layout
+        if resample_layout:
+            self._resample_layout()
+        self.robot.pos = np.array(self.robot_start_pos, dtype=np.float64)
         self.robot.angle = 0.0
+        self.robot.rng = self.np_random  # Replaced when reset() is seeded
+        self.num_of_failed_moved = 0
+        profiler.lap("reset")
         # Re-place target on reset (optional, can be fixed if you want target to stay in same place)
-        rays = self.robot.cast_rays(self.house.walls)
-        target_found, distance_from_target, target_in_direction, rays = self._check_target_found(rays)
-        rays = np.array(rays, dtype=np.float32) / self.robot.ray_length  # Normalize
-        obs = np.append(rays, [1 if target_found else 0, target_in_direction, self.num_of_failed_moved])
+        self._sense()
+        obs, _ = self._fill_obs()
+        profiler.lap("obs")
+        info = {}
+        if self.geodesic:
+            self._start_geodesic(info)
+            profiler.lap("geodesic")
+        if self.trajectory_log is not None:
+            self._begin_logged_episode(seed)
+            profiler.lap("log")
 
         # --- Start Timer ---
         self.start_time = time.time()
 
         if self.render_mode == "human":
             self.render()
+            profiler.lap("render")
+        if self.viewer is not None:
+            self._publish_view()
+            profiler.lap("render")
 
-        return obs, {}
+        return obs, info
+
+    def _resample_layout(self):
+        self.house.rng = self.np_random  # Replaced when reset() is seeded
+        if self.layout_pool:
+            self.house.set_layout(self.layout_pool[self.np_random.integers(len(self.layout_pool))])
+        else:
+            self.house.resample(self.corpus)
+
+    def set_profiling(self, enabled):
+        # Stage timers: step() records move, rays, target, obs, reward, log and render; reset() records
+        # reset, geodesic, log plus the same sensing stages. Off by default, then a no-op profiler is used.
+        self.profile = enabled
+        self.profiler = StepProfiler() if enabled else NullProfiler()
+
+    def get_step_stats(self):
+        """
+        Cumulative per-stage timings since profiling was enabled or last reset.
+
+        Returns:
+            dict: stage -> {"total_s", "calls", "mean_us"}, empty when profiling is off.
+                Use StepProfiler.collect_step_stats to aggregate over vec env workers.
+        """
+        return self.profiler.get_stats()
+
+    def reset_step_stats(self):
+        self.profiler.reset()
+
+    def attach_viewer(self, fps=None, title="Game_Env"):
+        """
+        Shows the env live in a separate viewer process (Viewer.py) drawing at fps (render_fps by
+        default). Every step and reset only writes a snapshot for it, so unlike render_mode="human"
+        the env runs at full speed; frames the viewer cannot keep up with are dropped. Closing the
+        window detaches the viewer.
+        """
+        from Viewer import Viewer
+
+        self.detach_viewer()
+        self.viewer = Viewer(self.size, self.robot.num_rays, fps or self.metadata["render_fps"], title)
+        self._viewer_walls = None
+        if self.sensors is not None:
+            self._publish_view()
+
+    def detach_viewer(self):
+        if self.viewer is not None:
+            self.viewer.close()
+            self.viewer = None
+
+    def _publish_view(self):
+        viewer = self.viewer
+        if viewer.closed:
+            self.detach_viewer()
+            return
+        if self.house.wall_array is not self._viewer_walls:
+            self._viewer_walls = self.house.wall_array
+            viewer.set_layout(self._viewer_walls, self.robot.get_ray_offsets(), self.house.target_size,
+                              self.robot.size)
+        viewer.publish(self.robot.pos, self.robot.angle, self.sensors["rays"], self.house.target_pos,
+                       time.time() - self.start_time)
+
+    def start_trajectory_log(self, directory, chunk_size=None):
+        """
+        Streams every following episode (layout, target, poses, actions, rewards, rays) into a
+        trajectory log in directory, for replay with TrajectoryLog.py. Closed by
+        stop_trajectory_log() or close().
+        """
+        from TrajectoryLog import CHUNK_SIZE, TrajectoryWriter
+
+        self.stop_trajectory_log()
+        self.trajectory_log = TrajectoryWriter(directory, self.size, self.robot.get_ray_offsets(),
+                                               self.robot.ray_length, self.robot.size, self.house.target_size,
+                                               chunk_size or CHUNK_SIZE)
+
+    def stop_trajectory_log(self):
+        if self.trajectory_log is not None:
+            self.trajectory_log.close()
+            self.trajectory_log = None
+
+    def _begin_logged_episode(self, seed):
+        house, sensors = self.house, self.sensors
+        self.trajectory_log.begin_episode(house.wall_array, house.target_pos, house.layout_name, house.layout_index,
+                                          seed)
+        self.trajectory_log.add_step(self.robot.pos, self.robot.angle, -1, 0.0, sensors["rays"],
+                                     sensors["collision"], sensors["target_found"])
+
+    def render_frame(self, out=None):
+        """
+        The current state as an (H, W, 3) uint8 RGB array, H = W = round(size * render_scale).
+        Walls and target come from a background cached per layout and target, so a frame only
+        draws the rays and the robot. Without out the frame is written into a reused buffer
+        that the next call overwrites; render() in rgb_array mode returns a new array instead.
+        """
+        if self.rasterizer is None:
+            from Rasterizer import Rasterizer
+            self.rasterizer = Rasterizer(self.size, self.render_scale)
+        sensors = self.sensors if self.sensors is not None else self._sense()
+        background = self.rasterizer.background(self.house.wall_array, self.house.target_pos,
+                                                self.house.target_size)
+        return self.rasterizer.render(background, self.robot.pos, self.robot.angle, self.robot.get_ray_offsets(),
+                                      sensors["rays"], self.robot.size, out=out)
 
     def render(self):
         if self.render_mode is None:
@@ -134,6 +346,11 @@ class Game_Env(gym.Env):
                 "You may experience issues when calling .step()."
             )
             return
+        if self.render_mode == "rgb_array":
+            resolution = max(int(round(self.size * self.render_scale)), 1)
+            return self.render_frame(out=np.empty((resolution, resolution, 3), dtype=np.uint8))
+
+        import pygame  # Loaded on first render, so headless training never imports it
 
         if self.window is None and self.render_mode == "human":
             pygame.init()
@@ -150,11 +367,10 @@ class Game_Env(gym.Env):
         # Draw House elements
         self.house.draw(canvas)
 
-        # Cast rays to get lengths for drawing
-        rays = self.robot.cast_rays(self.house.walls)
-        target_found, distance_from_target, target_in_direction, rays = self._check_target_found(rays)
+        # Ray lengths for drawing come from the snapshot taken by the last step()/reset()
+        sensors = self.sensors if self.sensors is not None else self._sense()
         # Draw Robot and Rays
-        self.robot.draw(canvas, rays)
+        self.robot.draw(canvas, sensors["rays"])
 
         # --- Draw Timer ---
         if self.start_time is not None and self.render_mode == "human":
@@ -163,18 +379,17 @@ class Game_Env(gym.Env):
             text_surface = self.font.render(timer_text, True, (0, 0, 0))  # Black color
             canvas.blit(text_surface, (10, 10))  # Position at top-left
 
-        if self.render_mode == "human":
-            self.window.blit(canvas, canvas.get_rect())
-            pygame.event.pump()
-            pygame.display.flip()
-            self.clock.tick(self.metadata["render_fps"])
-        else:  # rgb_array
-            return np.transpose(
-                np.array(pygame.surfarray.pixels3d(canvas)), axes=(1, 0, 2)
-            )
+        self.window.blit(canvas, canvas.get_rect())
+        pygame.event.pump()
+        pygame.display.flip()
+        self.clock.tick(self.metadata["render_fps"])
 
     def close(self):
+        self.detach_viewer()
+        self.stop_trajectory_log()
         if self.window is not None:
+            import pygame
+
             pygame.display.quit()
             pygame.font.quit() # <-- Quit font module
             pygame.quit()
@@ -182,6 +397,36 @@ class Game_Env(gym.Env):
             self.clock = None  # Reset clock state
             self.font = None  # Reset font state
 
+    def _sense(self):
+        # Cast rays and check collision / target once for the current pose
+        rays = self.robot.cast_rays(self.house.wall_index, out=self._rays)
+        self.profiler.lap("rays")
+        collision = self.check_collision_rays(rays)
+        target_found, distance_from_target, target_in_direction, rays = self._check_target_found(rays)
+        self.profiler.lap("target")
+        self.sensors = {
+            "rays": rays,  # Raw distances, target ray shortened to the target distance
+            "collision": collision,
+            "target_found": target_found,
+            "target_in_direction": target_in_direction,
+            "distance_from_target": distance_from_target,
+        }
+        return self.sensors
+
+    def _fill_obs(self):
+        # [ray1(norm), ..., rayN(norm), target_found(0/1), target_angle(degrees), failed_moves(count)]
+        # Returns the observation and a view of its normalized rays, both in the next obs buffer
+        num_rays = self.robot.num_rays
+        self._obs_index ^= 1
+        obs, obs_rays = self._obs_views[self._obs_index]
+        # Divide in float64 then cast-copy: a float32 out= on the divide would allocate a cast buffer
+        np.divide(self.sensors["rays"], self._ray_length, out=self._normalized_rays)
+        np.copyto(obs_rays, self._normalized_rays)
+        obs[num_rays] = self.sensors["target_found"]
+        obs[num_rays + 1] = self.sensors["target_in_direction"]
+        obs[num_rays + 2] = self.num_of_failed_moved
+        return obs, obs_rays
+
     def _calculate_reward(self, collision, target_found, distance_from_target, rays):
         if collision:
             return -20
@@ -194,6 +439,31 @@ class Game_Env(gym.Env):
                 return 1000
         return -5
 
+    def _start_geodesic(self, info):
+        self.geodesic_field = self.house.geodesic_field()
+        distance = self.geodesic_field.distance_at(self.robot.pos)
+        # The episode ends within dist_threshold of the target
+        self.shortest_path_length = max(distance - dist_threshold, 0.0)
+        self.path_length = 0.0
+        self._potential = -self.shaping_scale * distance if math.isfinite(distance) else 0.0
+        info.update(geodesic_distance=distance, path_length=0.0, shortest_path_length=self.shortest_path_length)
+
+    def _update_geodesic(self, reward, terminated, info):
+        distance = self.geodesic_field.distance_at(self.robot.pos)
+        info.update(geodesic_distance=distance, path_length=self.path_length,
+                    shortest_path_length=self.shortest_path_length)
+        if not self.reward_shaping:
+            return reward
+        if terminated:
+            potential = 0.0
+        elif math.isfinite(distance):
+            potential = -self.shaping_scale * distance
+        else:
+            potential = self._potential  # Off the field (should not happen): no shaping this step
+        reward += self.shaping_gamma * potential - self._potential
+        self._potential = potential
+        return reward
+
     def signed_angle_between(self):
         robot_pos = self.robot.pos
         target_pos = self.house.target_pos
@@ -224,37 +494,21 @@ class Game_Env(gym.Env):
 
     def _check_target_found(self, rays):
         distance_to_target, angle_vec = self.signed_angle_between()
+        ray_angles = self.robot.get_ray_offsets()  # Ray directions relative to the robot heading
 
-        # Get ray directions
-        num_rays = self.robot.num_rays
-        fov = self.robot.fov
-        angle_increment = fov / (num_rays - 1) if num_rays > 1 else 0
-        start_angle = 0 - fov / 2
-
-        target_found_by_ray = False  # Flag to track if target is found by ray
-        target_in_direction = 400
-
-        # for i in range(int(len(rays)/2)-1, int(len(rays)/2)+1):  # Iterate through rays and their directions
-        for i in range(len(rays)):  # Iterate through rays and their directions
-            ray_angle = start_angle + i * angle_increment
-
-            if abs(ray_angle - angle_vec) < 1.5:  # Adjust threshold (0.9 means quite aligned)
-                # print(f"Debug: Ray {i} direction similarity to target: {angle_vec:.3f}, {ray_angle:.3f} - Passed threshold")  # Debug print 2
-
-                # 3. Check for wall intersections along this ray *before* reaching target
-                intersection_point = (rays[i] >= distance_to_target)  # here add intersection of ray with target
-                if intersection_point:
-                    target_found_by_ray = True  # Set the flag to True TODO remove comment out
-                    rays[i] = distance_to_target
-                    # print(f"Debug: Ray {i} target intersection found. Distance to target: {distance_to_target:.2f}")  # Debug print 3
-                    if abs(target_in_direction) > abs(ray_angle):
-                        target_in_direction = ray_angle
-
-        if target_found_by_ray:
-            return True, distance_to_target, target_in_direction, rays  # Target found by ray AND within distance
-        else:
+        # Rays aligned with the target (within 1.5 degrees, wrapped for full scans) that reach it
+        # before hitting a wall
+        visible = np.abs((ray_angles - angle_vec + 180) % 360 - 180) < 1.5
+        visible &= rays >= distance_to_target
+        if not visible.any():
             return False, math.inf, 0, rays
 
+        rays[visible] = distance_to_target
+        # Report the visible ray closest to straight ahead
+        visible_angles = ray_angles[visible]
+        target_in_direction = float(visible_angles[np.argmin(np.abs(visible_angles))])
+        return True, distance_to_target, target_in_direction, rays  # Target found by ray AND within distance
+
 # if __name__ == "__main__":
 #     env = Game_Env(render_mode="human", ran_house=False)
 #     obs, _ = env.reset()
@@ -286,16 +540,19 @@ if __name__ == "__main__":
     # Uses the unmodified Game_Env class
     env = Game_Env(render_mode="human" if render_simple_algo else None,
                    ran_house=use_random_house,
-                   size=env_size)
+                   size=env_size,
+                   geodesic=True)  # Shortest path lengths for SPL
 
     # --- Simple Algorithm Setup ---
     # Pass the environment's spaces to the agent's constructor
-    simple_agent = SimpleSearch(env.observation_space, env.action_space)
+    simple_agent = SimpleSearch(env.observation_space, env.action_space, verbose=True,
+                                ray_offsets=env.robot.get_ray_offsets())
 
     # --- Simulation Loop ---
     episode_times = []
     success_count = 0
     total_steps = 0
+    successes, shortest_path_lengths, path_lengths = [], [], []
 
     for i in range(num_episodes):
         print(f"\n--- Episode {i+1}/{num_episodes} ---")
@@ -336,6 +593,9 @@ if __name__ == "__main__":
                 pass
 
         # --- Episode End ---
+        successes.append(terminated)
+        shortest_path_lengths.append(env.shortest_path_length)
+        path_lengths.append(env.path_length)
         end_time = time.time()
         duration = end_time - start_time
 
@@ -360,6 +620,7 @@ if __name__ == "__main__":
     print(f"Ran {num_episodes} episodes.")
     print(f"Total steps across all episodes: {total_steps}")
     print(f"Target found successfully in {success_count} episodes ({success_count/num_episodes*100:.1f}% success rate).")
+    print(f"SPL (success weighted by path length): {spl(successes, shortest_path_lengths, path_lengths):.3f}")
 
     if episode_times: # Calculate stats only if there were successful episodes
         average_time = np.mean(episode_times)
@@ -373,4 +634,4 @@ if __name__ == "__main__":
     elif num_episodes > 0:
         print("\nTarget was not found successfully in any episode.")
 
-    print("\nCompare these results (average time, success rate) with your A2C agent's performance.")
\ No newline at end of file
+    print("\nCompare these results (average time, success rate, SPL) with your A2C agent's performance.")
\ No newline at end of file
@@ -0,0 +1,435 @@
+import numpy as np
+
+
+def pack_walls(walls):
+    """
+    Packs wall rectangles into a (W, 4) float64 array of [x, y, width, height] rows.
+    Accepts anything rect-like (pygame.Rect, tuples) or an already packed array.
+    """
+    if isinstance(walls, np.ndarray):
+        if walls.ndim == 2 and walls.dtype == np.float64:
+            return walls
+        return walls.reshape(-1, 4).astype(np.float64)
+    return np.array([tuple(wall) for wall in walls], dtype=np.float64).reshape(-1, 4)
+
+
+def wall_rect(left, top, width, height):
+    """Integer (x, y, width, height) wall tuple, truncated like pygame.Rect."""
+    return int(left), int(top), int(width), int(height)
+
+
+def rects_overlap(a, b):
+    """
+    Strict overlap of two (x, y, width, height) rects, same result as pygame.Rect.colliderect.
+    Plain Python: for a handful of rects this is much cheaper than a NumPy call.
+    """
+    return (a[2] > 0 and a[3] > 0 and b[2] > 0 and b[3] > 0 and
+            a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+def ray_offsets(num_rays, fov):
+    """
+    Ray angles relative to the heading (degrees), (num_rays,), evenly spread over fov and
+    centred on the heading. A fov of 360 or more is a full circle: the rays are 360 / num_rays
+    apart starting behind the robot, so the first and last ray do not coincide.
+    """
+    if fov >= 360:
+        return -180.0 + np.arange(num_rays) * (360.0 / num_rays)
+    angle_increment = fov / (num_rays - 1) if num_rays > 1 else 0
+    return -fov / 2 + np.arange(num_rays) * angle_increment
+
+
+def ray_directions(angles_deg):
+    """Unit direction vectors (..., 2) for ray angles given in degrees."""
+    angles_rad = np.radians(angles_deg)
+    return np.stack((np.cos(angles_rad), np.sin(angles_rad)), axis=-1)
+
+
+def cast_rays(origins, directions, walls, max_length):
+    """
+    Batched ray / axis-aligned wall intersection (slab method).
+
+    Every ray is tested against every wall edge pair in a single broadcast, so the
+    cost is a handful of NumPy calls instead of a Python loop over rays x walls.
+
+    Args:
+        origins (np.ndarray): Ray origins, shape (..., 2).
+        directions (np.ndarray): Unit ray directions, shape (..., R, 2).
+        walls (np.ndarray): Packed walls, shape (W, 4) shared by every origin or
+            (..., W, 4) with one wall set per origin. Padding rows with zero width
+            and height placed far outside the house never produce a hit.
+        max_length (float): Maximum ray length, returned when nothing is hit.
+
+    Returns:
+        np.ndarray: Distance to the closest wall along each ray, shape (..., R).
+            Rays starting inside a wall return 0.
+    """
+    origins = np.asarray(origins, dtype=np.float64)
+    directions = np.asarray(directions, dtype=np.float64)
+    walls = np.asarray(walls, dtype=np.float64)
+
+    origin_x = origins[..., 0, None, None]  # (..., 1, 1)
+    origin_y = origins[..., 1, None, None]
+    # Avoid 0 * inf = nan for rays parallel to an axis
+    safe_directions = np.where(directions == 0.0, 1e-12, directions)
+    inv_x = 1.0 / safe_directions[..., 0, None]  # (..., R, 1)
+    inv_y = 1.0 / safe_directions[..., 1, None]
+    left = walls[..., None, :, 0]  # (..., 1, W)
+    top = walls[..., None, :, 1]
+    right = left + walls[..., None, :, 2]
+    bottom = top + walls[..., None, :, 3]
+
+    tx1 = (left - origin_x) * inv_x  # (..., R, W)
+    tx2 = (right - origin_x) * inv_x
+    ty1 = (top - origin_y) * inv_y
+    ty2 = (bottom - origin_y) * inv_y
+
+    # Entry distance clamped at 0 (ray starting inside a wall); a wall behind the ray then has
+    # t_far < 0 <= t_near and is rejected by the same test as a ray that misses it
+    t_near = np.maximum(np.minimum(tx1, tx2), np.minimum(ty1, ty2))
+    np.maximum(t_near, 0.0, out=t_near)
+    t_far = np.minimum(np.maximum(tx1, tx2), np.maximum(ty1, ty2))
+    np.minimum(t_far, max_length, out=t_far)
+
+    distances = np.where(t_near <= t_far, t_near, max_length)
+    if distances.shape[-1] == 0:
+        return np.full(distances.shape[:-1], float(max_length))
+    return distances.min(axis=-1)
+
+
+def robot_boxes(positions, size):
+    """
+    Axis-aligned robot boxes (..., 4) for robot centres (..., 2).
+    Coordinates are truncated to integers, matching pygame.Rect.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    corners = np.trunc(positions - size)
+    extent = np.full_like(corners, int(size * 2))
+    return np.concatenate((corners, extent), axis=-1)
+
+
+def boxes_hit_walls(boxes, walls):
+    """
+    True where a box (..., 4) overlaps any wall, with the same strict-edge semantics
+    as pygame.Rect.colliderect. walls is (W, 4) or (..., W, 4) like in cast_rays.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64)[..., None, :]  # (..., 1, 4)
+    walls = np.asarray(walls, dtype=np.float64)
+    overlap = ((boxes[..., 0] < walls[..., 0] + walls[..., 2]) & (walls[..., 0] < boxes[..., 0] + boxes[..., 2]) &
+               (boxes[..., 1] < walls[..., 1] + walls[..., 3]) & (walls[..., 1] < boxes[..., 1] + boxes[..., 3]) &
+               (walls[..., 2] > 0) & (walls[..., 3] > 0))
+    return overlap.any(axis=-1)
+
+
+class WallGrid:
+    """
+    Uniform grid spatial index over packed walls, built once per House layout.
+
+    Each cell lists the walls overlapping it (padded table, -1 = no wall), so box queries
+    only test walls in the cells the box covers, and rays walk their cells front to back
+    and stop as soon as the closest hit lies before the cells still to visit.
+    Layouts with few walls skip the grid, since one brute-force call is cheaper there.
+    """
+
+    def __init__(self, walls, size, cell_size=128, brute_force_below=512):
+        self.walls = pack_walls(walls)
+        self.size = size
+        self.cell_size = float(cell_size)
+        self.num_cells = max(1, int(np.ceil(size / cell_size)))
+        self.brute_force = len(self.walls) < brute_force_below
+
+        # [left, top, -right, -bottom]: a box overlaps a wall iff all four are < [x1, y1, -x0, -y0]
+        # (filled in place: this runs on every layout change, see House.resample)
+        self._overlap_edges = np.empty((len(self.walls) + 1, 4))
+        self._overlap_edges[:-1, :2] = self.walls[:, :2]
+        np.negative(self.walls[:, :2] + self.walls[:, 2:], out=self._overlap_edges[:-1, 2:])
+        self._overlap_edges[-1] = np.inf
+        empty = (self.walls[:, 2:] <= 0).any(axis=1)
+        if empty.any():
+            self._overlap_edges[:-1][empty] = np.inf  # Empty walls never collide
+        if self.brute_force:
+            self.cell_table = None  # Not needed: every query tests all walls
+            return
+
+        # Index -1 (no wall) gathers the trailing padding row, which never hits
+        self._padded_walls = np.vstack((self.walls, [[-10.0 * size, -10.0 * size, 0.0, 0.0]]))
+        n = self.num_cells
+        first = self._cell_coords(self.walls[:, :2])
+        last = self._cell_coords(self.walls[:, :2] + self.walls[:, 2:])
+        cell_lists = [[] for _ in range(n * n + 1)]  # Extra trailing cell stays empty (outside the grid)
+        for wall_index, ((x0, y0), (x1, y1)) in enumerate(zip(first, last)):
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    cell_lists[cy * n + cx].append(wall_index)
+        max_per_cell = max(1, max(len(cell) for cell in cell_lists))
+        self.cell_table = np.full((n * n + 1, max_per_cell), -1, dtype=np.int64)
+        for cell_index, cell in enumerate(cell_lists):
+            self.cell_table[cell_index, :len(cell)] = cell
+        self._cell_grid = self.cell_table[:n * n].reshape(n, n, max_per_cell)  # [cy, cx] view
+
+    def _cell_coords(self, points):
+        return np.clip(np.floor(np.asarray(points) / self.cell_size), 0, self.num_cells - 1).astype(np.int64)
+
+    def _cell_range(self, low, high):
+        last = self.num_cells - 1
+        return min(max(int(low // self.cell_size), 0), last), min(max(int(high // self.cell_size), 0), last)
+
+    def candidates(self, box):
+        """Indices into the padded wall table of walls in the cells covered by box [x, y, w, h]."""
+        x0, x1 = self._cell_range(box[0], box[0] + box[2])
+        y0, y1 = self._cell_range(box[1], box[1] + box[3])
+        return self._cell_grid[y0:y1 + 1, x0:x1 + 1].ravel()
+
+    def box_hits(self, box):
+        """True if box [x, y, w, h] overlaps a wall (pygame.Rect.colliderect semantics)."""
+        limits = np.array([box[0] + box[2], box[1] + box[3], -box[0], -box[1]])
+        edges = self._overlap_edges if self.brute_force else self._overlap_edges[self.candidates(box)]
+        return bool((edges < limits).all(axis=1).any())
+
+    def point_in_wall(self, point):
+        return self.box_hits(np.array([point[0], point[1], 1.0, 1.0]))
+
+    def robot_collides(self, pos, size):
+        return self.box_hits(robot_boxes(pos, size))
+
+    def cast_rays(self, origin, directions, max_length):
+        """Same result as cast_rays(origin, directions, walls, max_length) for one origin (2,)."""
+        origin = np.asarray(origin, dtype=np.float64)
+        directions = np.asarray(directions, dtype=np.float64)
+        if self.brute_force or np.any(origin < 0) or np.any(origin >= self.num_cells * self.cell_size):
+            return cast_rays(origin, directions, self.walls, max_length)
+
+        cell_ids, t_entry = self._traverse(origin, directions, max_length)
+        num_steps = cell_ids.shape[1]
+
+        best = np.full(len(directions), float(max_length))
+        active = np.arange(len(directions))
+        start, band = 0, 8
+        while True:
+            stop = min(start + band, num_steps)
+            walls = self._padded_walls[self.cell_table[cell_ids[active, start:stop]].reshape(len(active), -1)]
+            best[active] = np.minimum(best[active], cast_rays(origin, directions[active, None, :], walls,
+                                                              max_length)[:, 0])
+            if stop == num_steps:
+                return best
+            # Walls in later cells lie at or beyond the distance where the ray enters them
+            active = active[best[active] > t_entry[active, stop]]
+            if not len(active):
+                return best
+            start, band = stop, band * 4
+
+    def _traverse(self, origin, directions, max_length):
+        """
+        Cells visited by every ray, front to back (R, S), and the distance at which each ray
+        enters them (R, S). Cells past max_length or outside the grid map to the empty trailing
+        cell. A ray changes cell each time it crosses a vertical or horizontal grid line, so the
+        sorted crossing distances split it into segments whose midpoints identify the cells.
+        """
+        n, size = self.num_cells, self.cell_size
+        num_crossings = int(max_length / size) + 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv_directions = 1.0 / directions  # (R, 2), inf for axis-parallel rays
+            # Distance to the first grid line ahead on each axis, then one cell per crossing
+            first_line = (np.floor(origin / size) + (directions > 0)) * size
+            first = (first_line - origin) * inv_directions
+            spacing = np.abs(size * inv_directions)
+            crossings = first[:, :, None] + spacing[:, :, None] * np.arange(num_crossings)
+        crossings[~(crossings >= 0)] = np.inf  # nan and negative (parallel rays)
+
+        t_entry = np.zeros((len(directions), 2 * num_crossings + 1))
+        t_entry[:, 1:] = np.sort(crossings.reshape(len(directions), -1), axis=1)
+        t_mid = np.minimum((t_entry[:, :-1] + t_entry[:, 1:]) * 0.5, max_length)
+        cells = np.floor((origin[None, None, :] + directions[:, None, :] * t_mid[:, :, None]) / size)
+        cells_x, cells_y = cells[..., 0], cells[..., 1]
+        valid = (t_entry[:, :-1] <= max_length) & (cells_x >= 0) & (cells_x < n) & (cells_y >= 0) & (cells_y < n)
+        cell_ids = np.where(valid, cells_y * n + cells_x, n * n).astype(np.int64)
+        return cell_ids, t_entry[:, :-1]
+
+
+class DistanceField:
+    """
+    Wall clearance field baked on the integer pixel grid of one layout.
+
+    clearance[y, x] is the min over walls of max(left - x, x - right, top - y, y - bottom). A
+    robot of half-size s centred at p collides with a wall exactly when clearance[floor(p)] < s
+    (same result as robot_boxes + boxes_hit_walls), so collision checks are one lookup. Rays
+    are cast exactly by the layout's WallGrid (see benchmarks/bench_distance_field.py).
+
+    The field is read-only once baked, so one instance can be shared by every House that uses
+    the same layout.
+    """
+
+    def __init__(self, walls, size, wall_grid=None):
+        self.walls = pack_walls(walls)
+        self.size = size
+        self.wall_grid = wall_grid if wall_grid is not None else WallGrid(self.walls, size)
+
+        coords = np.arange(size, dtype=np.float64)
+        clearance = np.full((size, size), np.inf)
+        for left, top, width, height in self.walls:
+            # Separable signed per-axis gaps
+            gap_x = np.maximum(left - coords, coords - (left + width))
+            gap_y = np.maximum(top - coords, coords - (top + height))
+            np.minimum(clearance, np.maximum(gap_y[:, None], gap_x[None, :]), out=clearance)
+        self.clearance = clearance.astype(np.float32)
+        self.clearance.flags.writeable = False
+
+    def robot_collides(self, pos, size):
+        x, y = int(np.floor(pos[0])), int(np.floor(pos[1]))
+        if not (0 <= x < self.size and 0 <= y < self.size):
+            return True
+        return bool(self.clearance[y, x] < size)
+
+    def cast_rays(self, origin, directions, max_length):
+        """Same result as cast_rays(origin, directions, walls, max_length) for one origin (2,)."""
+        return self.wall_grid.cast_rays(origin, directions, max_length)
+
+
+class ReachableArea:
+    """
+    Robot centre positions reachable from a start position without touching a wall.
+
+    With the truncation of robot_boxes, a robot of half-size s centred at x overlaps the
+    integer wall span [left, left + width) exactly when left - s + 1 <= x < left + width + s,
+    so the blocked centres are the walls grown by the robot. The edges of the grown walls cut
+    the house into a grid of rectangles that are each entirely free or entirely blocked; the
+    flood fill runs on that compressed grid (a few hundred cells) instead of on pixels, by
+    alternately spreading along free row runs and free column runs until nothing changes.
+    """
+
+    def __init__(self, walls, size, start, robot_size):
+        walls = pack_walls(walls)
+        walls = walls[(walls[:, 2] > 0) & (walls[:, 3] > 0)]
+        self.size = size
+        low = walls[:, :2] - robot_size + 1  # Grown walls [low, high) per axis
+        high = walls[:, :2] + walls[:, 2:] + robot_size
+        # Cell i of an axis spans [edges[i], edges[i + 1])
+        self.x_edges = np.unique(np.clip(np.concatenate(([0.0, size], low[:, 0], high[:, 0])), 0, size))
+        self.y_edges = np.unique(np.clip(np.concatenate(([0.0, size], low[:, 1], high[:, 1])), 0, size))
+        x_cells, y_cells = self.x_edges[:-1], self.y_edges[:-1]
+        in_x = (low[:, 0, None] <= x_cells) & (x_cells < high[:, 0, None])  # (W, nx)
+        in_y = (low[:, 1, None] <= y_cells) & (y_cells < high[:, 1, None])  # (W, ny)
+        self.free = (in_y.T.astype(np.float32) @ in_x.astype(np.float32)) == 0  # (ny, nx)
+        self.reachable = self._flood(np.asarray(start, dtype=np.float64))
+        self.reachable.flags.writeable = False
+        # Summed-area table: reachable cells in [y0, y1) x [x0, x1) in four lookups (see any_in)
+        self._reachable_sums = np.zeros((self.reachable.shape[0] + 1, self.reachable.shape[1] + 1), dtype=np.int64)
+        np.cumsum(np.cumsum(self.reachable, axis=0), axis=1, out=self._reachable_sums[1:, 1:])
+
+    def _flood(self, start):
+        free = self.free
+        reach = np.zeros_like(free)
+        ix, iy = self._cell_index(start[0], self.x_edges), self._cell_index(start[1], self.y_edges)
+        if ix < 0 or iy < 0 or not free[iy, ix]:
+            return reach
+        reach[iy, ix] = True
+
+        # Label free runs along rows and along columns (labels of blocked cells are masked out)
+        row_starts = free.copy()
+        row_starts[:, 1:] &= ~free[:, :-1]
+        row_labels = np.cumsum(row_starts.ravel()).reshape(free.shape)
+        col_starts = free.copy()
+        col_starts[1:, :] &= ~free[:-1, :]
+        col_labels = np.cumsum(col_starts.T.ravel()).reshape(free.shape[::-1]).T
+
+        count = 1
+        while True:
+            for labels in (row_labels, col_labels):
+                reached_runs = np.zeros(labels.flat[-1] + 1, dtype=bool)  # Labels grow along the scan
+                reached_runs[labels[reach]] = True
+                reach = reached_runs[labels] & free
+            new_count = np.count_nonzero(reach)
+            if new_count == count:
+                return reach
+            count = new_count
+
+    def _cell_index(self, value, edges):
+        index = int(np.searchsorted(edges, value, side="right")) - 1
+        return index if 0 <= index < len(edges) - 1 else -1
+
+    def contains(self, points):
+        """True where the robot can be centred at points (..., 2) after starting at start."""
+        points = np.asarray(points, dtype=np.float64)
+        ix = np.searchsorted(self.x_edges, points[..., 0], side="right") - 1
+        iy = np.searchsorted(self.y_edges, points[..., 1], side="right") - 1
+        inside = (ix >= 0) & (ix < len(self.x_edges) - 1) & (iy >= 0) & (iy < len(self.y_edges) - 1)
+        return inside & self.reachable[np.where(inside, iy, 0), np.where(inside, ix, 0)]
+
+    def any_in(self, left, top, right, bottom):
+        """
+        True where some reachable position lies in the box [left, right] x [top, bottom].
+        Takes scalars or arrays of box coordinates (one summed-area table lookup per box).
+        """
+        x0 = np.maximum(np.searchsorted(self.x_edges, left, side="right") - 1, 0)
+        y0 = np.maximum(np.searchsorted(self.y_edges, top, side="right") - 1, 0)
+        x1 = np.maximum(np.minimum(np.searchsorted(self.x_edges, right, side="right"), len(self.x_edges) - 1), x0)
+        y1 = np.maximum(np.minimum(np.searchsorted(self.y_edges, bottom, side="right"), len(self.y_edges) - 1), y0)
+        table = self._reachable_sums
+        return (table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]) > 0
+
+    def near(self, points, margin):
+        """
+        True where a reachable position lies within margin (per axis) of points (..., 2). With
+        margin = robot size there is no wall between the two, and the robot box touches the point.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        return self.any_in(points[..., 0] - margin, points[..., 1] - margin,
+                           points[..., 0] + margin, points[..., 1] + margin)
+
+
+class GeodesicField:
+    """
+    Shortest-path distance from every robot centre to a target, around the walls.
+
+    The house is covered by cell_size cells; a cell is free when some reachable robot centre
+    lies in it (see ReachableArea), which keeps narrow passages open. Distances grow from the
+    free cells next to the target (robot box within reach of it) over 8-connected neighbours,
+    so they overestimate the Euclidean shortest path by at most ~8% (octile metric). Relaxation
+    sweeps run until nothing changes; afterwards distance_at is a single lookup.
+    """
+
+    def __init__(self, reachable_area, target, robot_size, cell_size=8):
+        self.cell_size = cell_size
+        size = reachable_area.size
+        n = int(np.ceil(size / cell_size))
+        self.num_cells = n
+        low = np.arange(n) * cell_size
+        high = np.minimum(low + cell_size, size) - 1
+        free = reachable_area.any_in(low[None, :], low[:, None], high[None, :], high[:, None])  # (n, n) [y, x]
+
+        # Distances live inside an inf border, so shifted views never wrap around
+        padded = np.full((n + 2, n + 2), np.inf, dtype=np.float32)
+        distance = padded[1:-1, 1:-1]
+        centres = low + cell_size / 2
+        gap_x = centres - target[0]
+        gap_y = centres - target[1]
+        reach = robot_size + cell_size / 2
+        seeds = free & (np.abs(gap_y)[:, None] <= reach) & (np.abs(gap_x)[None, :] <= reach)
+        distance[seeds] = np.hypot(gap_y[:, None], gap_x[None, :])[seeds]
+
+        blocked = np.where(free, 0.0, np.inf).astype(np.float32)
+        straight, diagonal = np.float32(cell_size), np.float32(cell_size * np.sqrt(2))
+        neighbours = ((padded[:-2, 1:-1], straight), (padded[2:, 1:-1], straight),
+                      (padded[1:-1, :-2], straight), (padded[1:-1, 2:], straight),
+                      (padded[:-2, :-2], diagonal), (padded[:-2, 2:], diagonal),
+                      (padded[2:, :-2], diagonal), (padded[2:, 2:], diagonal))
+        best = np.empty_like(distance)
+        step = np.empty_like(distance)
+        while True:
+            best.fill(np.inf)
+            for shifted, cost in neighbours:
+                np.add(shifted, cost, out=step)
+                np.minimum(best, step, out=best)
+            best += blocked
+            if not (best < distance).any():
+                break
+            np.minimum(distance, best, out=distance)
+        self.distance = distance.copy()
+        self.distance.flags.writeable = False
+
+    def distance_at(self, pos):
+        """Shortest-path distance from robot centre pos to the target, inf if it cannot get there."""
+        last = self.num_cells - 1
+        x = min(max(int(pos[0] // self.cell_size), 0), last)
+        y = min(max(int(pos[1] // self.cell_size), 0), last)
+        return float(self.distance[y, x])
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+import Geometry
+from new_House import House
+
+MAGIC = b"SCXLAYT1"
+ALIGNMENT = 64
+LAYOUT_NAMES = ("layout1", "layout2", "layout3")
+
+# Open corpora per path: envs in one process share a single mapping
+_open_corpora = {}
+
+
+class LayoutCorpus:
+    """
+    Read-only corpus of pre-generated house layouts stored in one memory-mapped file.
+
+    File layout: 8 byte magic, uint64 header length, JSON header (generation parameters and
+    the offset, dtype and shape of every array), then the arrays, each aligned to 64 bytes:
+        walls         (total_walls, 4) float64  walls of all layouts, back to back
+        wall_offsets  (count + 1,) int64        layout k owns walls[wall_offsets[k]:wall_offsets[k + 1]]
+        targets       (count, M, 2) float32     M reachable target positions per layout
+        seeds         (count,) int64            seed layout k was generated from, sorted
+        layout_ids    (count,) int8             -1 for random layouts, else index into LAYOUT_NAMES
+
+    Every accessor returns a view into the mapping, so the OS page cache holds one copy of the
+    corpus however many envs and processes read it.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self._data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if bytes(self._data[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a layout corpus")
+        header_length = int(self._data[8:16].view(np.uint64)[0])
+        header = json.loads(bytes(self._data[16:16 + header_length]).decode("utf-8"))
+        self.meta = header["meta"]
+        self.size = self.meta["size"]
+        self.robot_start_pos = np.array(self.meta["robot_start_pos"])
+
+        # Plain ndarray views of the mapping: slicing a np.memmap costs several us per call
+        data = np.asarray(self._data)
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            nbytes = int(np.prod(spec["shape"])) * dtype.itemsize
+            start = spec["offset"]
+            arrays[name] = data[start:start + nbytes].view(dtype).reshape(spec["shape"])
+        self.wall_data = arrays["walls"]
+        self.wall_offsets = arrays["wall_offsets"]
+        self.targets = arrays["targets"]
+        self.seeds = arrays["seeds"]
+        self.layout_ids = arrays["layout_ids"]
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def walls(self, index):
+        """Walls of layout index as a (W, 4) float64 view (left, top, width, height)."""
+        return self.wall_data[self.wall_offsets[index]:self.wall_offsets[index + 1]]
+
+    def target_candidates(self, index):
+        """(M, 2) float32 view of the target positions validated for layout index."""
+        return self.targets[index]
+
+    def layout_name(self, index):
+        layout_id = self.layout_ids[index]
+        return LAYOUT_NAMES[layout_id] if layout_id >= 0 else None
+
+    def index_of_seed(self, seed):
+        index = int(np.searchsorted(self.seeds, seed))
+        if index == len(self.seeds) or self.seeds[index] != seed:
+            raise KeyError(f"Seed {seed} is not in layout corpus {self.path}")
+        return index
+
+    def sample_index(self, rng):
+        return int(rng.integers(len(self)))
+
+
+def open_corpus(path):
+    """Opens the corpus at path, reusing the mapping if this process already opened it."""
+    path = os.path.abspath(path)
+    if path not in _open_corpora:
+        _open_corpora[path] = LayoutCorpus(path)
+    return _open_corpora[path]
+
+
+def _valid_targets(house, reachable_area, count, rng, max_rounds=50):
+    # Integer target positions over the area House.place_target draws from, outside every wall
+    # (point semantics of House.is_inside_wall) and next to a position the robot can reach
+    low = house.wall_thickness
+    walls = house.wall_array
+    high = house.size - house.wall_thickness
+    found = []
+    num_found = 0
+    for _ in range(max_rounds):
+        candidates = rng.integers(low, high + 1, size=(count * 2, 2)).astype(np.float32)
+        inside = ((candidates[:, None, 0] >= walls[:, 0]) & (candidates[:, None, 0] < walls[:, 0] + walls[:, 2])
+                  & (candidates[:, None, 1] >= walls[:, 1]) & (candidates[:, None, 1] < walls[:, 1] + walls[:, 3])
+                  ).any(axis=1)
+        free = candidates[~inside & reachable_area.near(candidates, house.robot_size)]
+        found.append(free)
+        num_found += len(free)
+        if num_found >= count:
+            return np.concatenate(found)[:count]
+    return None
+
+
+def validate_layout(walls, size, robot_start_pos, robot_size=10):
+    """
+    Returns a list of problems with a layout: walls outside the house or without area, or a
+    robot start position that collides with a wall.
+    """
+    problems = []
+    if len(walls) == 0:
+        return ["no walls"]
+    if (walls[:, 2:] <= 0).any():
+        problems.append("wall without area")
+    if (walls[:, :2] < 0).any() or (walls[:, :2] + walls[:, 2:] > size).any():
+        problems.append("wall outside the house")
+    start_box = Geometry.robot_boxes(np.asarray(robot_start_pos, dtype=np.float64), robot_size)
+    if Geometry.boxes_hit_walls(start_box, walls):
+        problems.append("robot start position inside a wall")
+    return problems
+
+
+def generate_corpus(path, count, size=512, num_random_walls=10, robot_start_pos=None, base_seed=0,
+                    randomize_house=True, targets_per_layout=32):
+    """
+    Generates count layouts with seeds base_seed, base_seed + 1, ... and writes them to path.
+    Layouts failing validation are skipped, so a seed may be missing from the corpus.
+
+    Args:
+        path: Output file.
+        count: Number of seeds to generate.
+        size, num_random_walls, randomize_house: House parameters, as for Game_Env.
+        robot_start_pos: Robot start position the layouts are validated for. Defaults to the
+            Game_Env start position for size.
+        base_seed: Seed of the first layout.
+        targets_per_layout: Number of valid target positions stored per layout.
+
+    Returns:
+        dict: Generation report (layouts written, seeds skipped with reasons, bytes, seconds).
+    """
+    if robot_start_pos is None:
+        robot_start_pos = [40, size // 2 - 10]
+    start = time.perf_counter()
+    house = House(size, robot_start_pos, randomize_house, num_random_walls)
+    walls, wall_counts, targets, seeds, layout_ids = [], [], [], [], []
+    skipped = {}
+    for seed in range(base_seed, base_seed + count):
+        house.rng = np.random.default_rng(seed)
+        house.layout_name = None
+        house.wall_array = Geometry.pack_walls(house._create_layout())
+        problems = validate_layout(house.wall_array, size, robot_start_pos)
+        if not problems:
+            reachable_area = Geometry.ReachableArea(house.wall_array, size, robot_start_pos, house.robot_size)
+            candidates = _valid_targets(house, reachable_area, targets_per_layout, house.rng)
+        if problems or candidates is None:
+            skipped[seed] = problems or ["not enough reachable target positions"]
+            continue
+        walls.append(house.wall_array)
+        wall_counts.append(len(house.wall_array))
+        targets.append(candidates)
+        seeds.append(seed)
+        layout_ids.append(LAYOUT_NAMES.index(house.layout_name) if house.layout_name else -1)
+    if not seeds:
+        raise ValueError("No valid layouts were generated")
+
+    arrays = {
+        "walls": np.concatenate(walls).astype(np.float64),
+        "wall_offsets": np.concatenate(([0], np.cumsum(wall_counts))).astype(np.int64),
+        "targets": np.stack(targets).astype(np.float32),
+        "seeds": np.array(seeds, dtype=np.int64),
+        "layout_ids": np.array(layout_ids, dtype=np.int8),
+    }
+    meta = {
+        "size": size,
+        "robot_start_pos": [int(v) for v in robot_start_pos],
+        "num_random_walls": num_random_walls,
+        "randomize_house": randomize_house,
+        "targets_per_layout": targets_per_layout,
+        "base_seed": base_seed,
+        "count": len(seeds),
+    }
+    nbytes = _write_corpus(path, arrays, meta)
+    return {"layouts": len(seeds), "skipped": skipped, "bytes": nbytes,
+            "seconds": time.perf_counter() - start}
+
+
+def _write_corpus(path, arrays, meta):
+    # Header offsets depend on the header length, so lay the arrays out until it is stable
+    header_length = 0
+    while True:
+        offset = _align(16 + header_length)
+        specs = {}
+        for name, array in arrays.items():
+            specs[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+            offset = _align(offset + array.nbytes)
+        header = json.dumps({"meta": meta, "arrays": specs}).encode("utf-8")
+        if len(header) <= header_length:
+            break
+        header_length = len(header) + 64
+    header = header.ljust(header_length)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(header_length).tobytes())
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (specs[name]["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+        nbytes = f.tell()
+    os.replace(tmp_path, path)
+    _open_corpora.pop(os.path.abspath(path), None)
+    return nbytes
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and validate a memory-mapped layout corpus")
+    parser.add_argument("path", help="Corpus file to write (or to check with --check)")
+    parser.add_argument("--count", type=int, default=10000, help="Number of seeds to generate")
+    parser.add_argument("--size", type=int, default=512)
+    parser.add_argument("--num-random-walls", type=int, default=10)
+    parser.add_argument("--fixed-layouts", action="store_true", help="Use the three fixed layouts instead of random ones")
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--targets-per-layout", type=int, default=32, help="Reachable target positions per layout")
+    parser.add_argument("--check", action="store_true", help="Validate an existing corpus instead of generating one")
+    args = parser.parse_args()
+
+    if args.check:
+        corpus = LayoutCorpus(args.path)
+        invalid = [k for k in range(len(corpus))
+                   if validate_layout(corpus.walls(k), corpus.size, corpus.robot_start_pos)
+                   or not Geometry.ReachableArea(corpus.walls(k), corpus.size, corpus.robot_start_pos, 10)
+                   .near(corpus.target_candidates(k), 10).all()]
+        print(f"{args.path}: {len(corpus)} layouts, {len(corpus.wall_data)} walls, "
+              f"{len(invalid)} invalid, meta {corpus.meta}")
+        if invalid:
+            raise SystemExit(f"Invalid layouts: {invalid[:20]}")
+        return
+
+    report = generate_corpus(args.path, args.count, size=args.size, num_random_walls=args.num_random_walls,
+                             base_seed=args.base_seed, randomize_house=not args.fixed_layouts,
+                             targets_per_layout=args.targets_per_layout)
+    print(f"Wrote {report['layouts']} layouts to {args.path}: {report['bytes'] / 1024:.1f} KiB, "
+          f"{report['bytes'] / report['layouts']:.0f} bytes per layout, {report['seconds']:.1f} s")
+    for seed, problems in report["skipped"].items():
+        print(f"  skipped seed {seed}: {', '.join(problems)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def spl(successes, shortest_path_lengths, path_lengths):
+    """
+    Success weighted by Path Length: mean over episodes of S_i * l_i / max(p_i, l_i).
+
+    Args:
+        successes: Per-episode success flags.
+        shortest_path_lengths: Per-episode shortest path lengths l_i (Game_Env info
+            "shortest_path_length", needs geodesic=True).
+        path_lengths: Per-episode distances actually travelled p_i (info "path_length").
+
+    Returns:
+        float: SPL in [0, 1]; 1 means every episode succeeded along a shortest path.
+    """
+    terms = spl_terms(successes, shortest_path_lengths, path_lengths)
+    return float(np.mean(terms)) if len(terms) else 0.0
+
+
+def spl_terms(successes, shortest_path_lengths, path_lengths):
+    """Per-episode SPL terms S_i * l_i / max(p_i, l_i) (see spl)."""
+    successes = np.asarray(successes, dtype=np.float64)
+    shortest = np.asarray(shortest_path_lengths, dtype=np.float64)
+    taken = np.asarray(path_lengths, dtype=np.float64)
+    # Episodes that start within reach of the target have l_i = 0 and count as fully efficient
+    ratios = np.where(shortest > 0, shortest / np.maximum(np.maximum(taken, shortest), 1e-9), 1.0)
+    return successes * ratios
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score interval (default 95%) for a success rate; (0, 1) without trials."""
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z ** 2 / trials
+    centre = (rate + z ** 2 / (2 * trials)) / denominator
+    half_width = z * np.sqrt(rate * (1 - rate) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+    return float(centre - half_width), float(centre + half_width)
+
+
+def mean_interval(values, z=1.96):
+    """Mean and normal-approximation interval (default 95%) of per-episode values."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return float("nan"), float("nan"), float("nan")
+    mean = float(values.mean())
+    if len(values) == 1:
+        return mean, mean, mean
+    half_width = z * values.std(ddof=1) / np.sqrt(len(values))
+    return mean, float(mean - half_width), float(mean + half_width)
@@ -0,0 +1,151 @@
+"""
+NumPy-only inference for trained A2C policies.
+
+export_policy reads a Policy_A2C zip and its VecNormalize pickle (this needs stable-baselines3
+and torch, once) and writes the actor weights and observation statistics to one .npz file.
+NumpyPolicy runs the observation normalization and the actor forward pass from that file
+with NumPy alone, for one observation or a batch:
+
+    python NumpyPolicy.py p_2.zip p_2_vec_normalize.pkl p_2_policy.npz
+
+    policy = NumpyPolicy("p_2_policy.npz")
+    action, _ = policy.predict(obs)
+"""
+import argparse
+
+import numpy as np
+
+FORMAT_VERSION = 1
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0),
+}
+
+
+class NumpyPolicy:
+    """
+    Actor of an exported A2C policy (see export_policy), with the predict() interface of SB3.
+
+    Observations are normalized like VecNormalize.normalize_obs (float64, then float32) and the
+    MLP runs in float32 like torch, so deterministic actions match SB3's.
+    """
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"{path}: unsupported policy file version {int(data['format_version'])}")
+            self.activation_name = str(data["activation"])
+            self.norm_obs = bool(data["norm_obs"])
+            self.obs_mean = data["obs_mean"]
+            self.obs_scale = np.sqrt(data["obs_var"] + float(data["epsilon"]))
+            self.clip_obs = float(data["clip_obs"])
+            num_layers = int(data["num_layers"])
+            self.weights = [np.ascontiguousarray(data[f"weight_{i}"].T) for i in range(num_layers)]
+            self.biases = [data[f"bias_{i}"] for i in range(num_layers)]
+            self.action_weight = np.ascontiguousarray(data["action_weight"].T)
+            self.action_bias = data["action_bias"]
+        if self.activation_name not in ACTIVATIONS:
+            raise ValueError(f"{path}: unsupported activation {self.activation_name!r}")
+        self.activation = ACTIVATIONS[self.activation_name]
+        self.obs_dim = self.weights[0].shape[0] if self.weights else self.action_weight.shape[0]
+        self.num_actions = len(self.action_bias)
+
+    def normalize(self, obs):
+        if not self.norm_obs:
+            return np.asarray(obs, dtype=np.float32)
+        return np.clip((obs - self.obs_mean) / self.obs_scale, -self.clip_obs, self.clip_obs).astype(np.float32)
+
+    def logits(self, obs):
+        """Action logits for raw (un-normalized) observations, (obs_dim,) or (N, obs_dim)."""
+        hidden = self.normalize(obs)
+        for weight, bias in zip(self.weights, self.biases):
+            hidden = self.activation(hidden @ weight + bias)
+        return hidden @ self.action_weight + self.action_bias
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True, rng=None):
+        """
+        Args:
+            observation: One raw observation (obs_dim,) or a batch (N, obs_dim).
+            deterministic: Most likely action, else one sampled from the action distribution
+                with rng (a numpy Generator, default_rng() if None).
+
+        Returns:
+            tuple: (action, None) like SB3: an int64 array of shape () or (N,).
+        """
+        logits = self.logits(np.asarray(observation))
+        if deterministic:
+            return np.argmax(logits, axis=-1), None
+        probs = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probs /= probs.sum(axis=-1, keepdims=True)
+        rng = rng if rng is not None else np.random.default_rng()
+        uniform = rng.random(probs.shape[:-1] + (1,))
+        actions = np.minimum((np.cumsum(probs, axis=-1) < uniform).sum(axis=-1), self.num_actions - 1)
+        return actions, None
+
+
+def export_policy(model_path, vec_normalize_path, output_path):
+    """
+    Writes the actor of an A2C model zip and the observation statistics of its VecNormalize
+    pickle (None if the model was trained without one) to output_path (.npz).
+
+    Returns:
+        int: Size of the written file in bytes.
+    """
+    import os
+    import pickle
+
+    import torch as th
+    from stable_baselines3 import A2C
+    from stable_baselines3.common.torch_layers import FlattenExtractor
+
+    model = A2C.load(model_path, device="cpu")
+    policy = model.policy
+    if not isinstance(policy.pi_features_extractor, FlattenExtractor):
+        raise ValueError("Only MlpPolicy actors with a flatten feature extractor can be exported")
+    linear_layers = [layer for layer in policy.mlp_extractor.policy_net if isinstance(layer, th.nn.Linear)]
+    activation = policy.activation_fn.__name__.lower()
+    if activation not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation {policy.activation_fn.__name__}")
+
+    arrays = {
+        "format_version": np.array(FORMAT_VERSION),
+        "activation": np.array(activation),
+        "num_layers": np.array(len(linear_layers)),
+        "action_weight": policy.action_net.weight.detach().numpy().astype(np.float32),
+        "action_bias": policy.action_net.bias.detach().numpy().astype(np.float32),
+    }
+    for i, layer in enumerate(linear_layers):
+        arrays[f"weight_{i}"] = layer.weight.detach().numpy().astype(np.float32)
+        arrays[f"bias_{i}"] = layer.bias.detach().numpy().astype(np.float32)
+
+    obs_dim = model.observation_space.shape[0]
+    arrays.update(norm_obs=np.array(False), obs_mean=np.zeros(obs_dim), obs_var=np.ones(obs_dim),
+                  epsilon=np.array(1e-8), clip_obs=np.array(np.inf))
+    if vec_normalize_path is not None:
+        with open(vec_normalize_path, "rb") as f:
+            vec_normalize = pickle.load(f)
+        if vec_normalize.obs_rms.mean.shape != (obs_dim,):
+            raise ValueError(f"{vec_normalize_path} normalizes {vec_normalize.obs_rms.mean.shape} observations, "
+                             f"the model takes ({obs_dim},)")
+        arrays.update(norm_obs=np.array(vec_normalize.norm_obs),
+                      obs_mean=np.asarray(vec_normalize.obs_rms.mean, dtype=np.float64),
+                      obs_var=np.asarray(vec_normalize.obs_rms.var, dtype=np.float64),
+                      epsilon=np.array(vec_normalize.epsilon), clip_obs=np.array(vec_normalize.clip_obs))
+
+    with open(output_path, "wb") as f:
+        np.savez(f, **arrays)
+    return os.path.getsize(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an A2C model and its VecNormalize stats for NumpyPolicy")
+    parser.add_argument("model", help="A2C model zip")
+    parser.add_argument("vec_normalize", nargs="?", help="VecNormalize pickle of the model")
+    parser.add_argument("output", help="Policy file to write (.npz)")
+    args = parser.parse_args()
+    nbytes = export_policy(args.model, args.vec_normalize, args.output)
+    print(f"Wrote {args.output}: {nbytes / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 
+import numpy as np
+import torch as th
 from stable_baselines3 import A2C
+from stable_baselines3.common.vec_env import VecNormalize
+
+from Demonstrations import load_demonstrations
 
 
 class Policy_A2C:
@@ -10,4 +15,59 @@ class Policy_A2C:
         self.model = A2C.load(model_path)
 
     def save_model(self, model_path):
-        self.model.save(model_path)
\ No newline at end of file
+        self.model.save(model_path)
+
+    def pretrain(self, demonstrations, epochs=5, batch_size=256, learning_rate=1e-3, seed=0, update_obs_stats=True):
+        """
+        Behavior-cloning warm start: fits the policy network to the demonstrated actions
+        (cross-entropy) before RL starts. The value network is left untouched.
+
+        If the model's env is a VecNormalize with norm_obs, the demonstrations are normalized
+        with the env's own observation statistics, so the policy is fitted on the same inputs
+        RL and evaluation give it. By default the demonstrations are first added to those
+        statistics.
+
+        Args:
+            demonstrations: Demonstration directory (see Demonstrations.py) or a dict with
+                "obs" and "actions" arrays.
+            epochs: Passes over the demonstrations.
+            batch_size: Transitions per gradient step.
+            learning_rate: Adam learning rate.
+            seed: Seed of the batch shuffling.
+            update_obs_stats: Add the demonstrations to the VecNormalize statistics first; pass False
+                to normalize with statistics the env already has (e.g. a resumed run).
+
+        Returns:
+            list: (mean loss, action accuracy) per epoch.
+        """
+        if isinstance(demonstrations, str):
+            demonstrations = load_demonstrations(demonstrations)
+        obs = np.asarray(demonstrations["obs"], dtype=np.float32)
+        actions = np.asarray(demonstrations["actions"], dtype=np.int64)
+        env = self.model.get_env()
+        if isinstance(env, VecNormalize) and env.norm_obs:
+            if update_obs_stats:
+                env.obs_rms.update(obs)
+            obs = env.normalize_obs(obs).astype(np.float32)
+
+        policy = self.model.policy
+        policy.set_training_mode(True)
+        optimizer = th.optim.Adam(policy.parameters(), lr=learning_rate)
+        obs_tensor = th.as_tensor(obs, device=policy.device)
+        action_tensor = th.as_tensor(actions, device=policy.device)
+        rng = np.random.default_rng(seed)
+        history = []
+        for _ in range(epochs):
+            total_loss, correct = 0.0, 0
+            for batch in np.array_split(rng.permutation(len(obs)), max(1, len(obs) // batch_size)):
+                batch = th.as_tensor(batch, device=policy.device)
+                distribution = policy.get_distribution(obs_tensor[batch])
+                loss = -distribution.log_prob(action_tensor[batch]).mean()
+                optimizer.zero_grad()
+                loss.backward()
+                optimizer.step()
+                total_loss += loss.item() * len(batch)
+                correct += int((distribution.distribution.probs.argmax(dim=1) == action_tensor[batch]).sum())
+            history.append((total_loss / len(obs), correct / len(obs)))
+        policy.set_training_mode(False)
+        return history
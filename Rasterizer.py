@@ -0,0 +1,153 @@
+import numpy as np
+
+BACKGROUND_CACHE_SIZE = 64
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+
+
+class Rasterizer:
+    """
+    NumPy rendering of Game_Env frames as (H, W, 3) uint8 RGB arrays, same picture as render().
+
+    Walls and target are rasterized once per (layout, target) into a cached background image;
+    a frame is a copy of the background with the rays, the robot and its heading stamped in.
+    Everything is drawn directly at the output resolution, round(size * scale) pixels square,
+    so downsampled frames are also cheaper to make. render_batch draws N envs into one
+    (N, H, W, 3) array.
+
+    Args:
+        size: House size in house units (pixels of render()).
+        scale: Output pixels per house unit.
+        cache_size: Backgrounds kept; at least the number of envs drawn together.
+    """
+
+    def __init__(self, size=512, scale=1.0, cache_size=BACKGROUND_CACHE_SIZE):
+        self.size = size
+        self.scale = scale
+        self.cache_size = cache_size
+        self.resolution = max(int(round(size * scale)), 1)
+        self._backgrounds = {}  # (id(walls), target, target_size) -> (walls, background)
+        self._discs = {}  # radius -> (D, 2) pixel offsets of a filled disc
+        self._out = None  # Reused output buffer
+
+    def background(self, walls, target_pos, target_size):
+        """
+        Cached background: white floor, black walls ((W, 4) left, top, width, height) and the
+        green target. walls must not be modified in place (the cache is keyed on the object).
+        """
+        key = (id(walls), float(target_pos[0]), float(target_pos[1]), target_size)
+        cached = self._backgrounds.get(key)
+        if cached is not None and cached[0] is walls:
+            return cached[1]
+        image = np.full((self.resolution, self.resolution, 3), WHITE, dtype=np.uint8)
+        for left, top, width, height in np.asarray(walls).reshape(-1, 4):
+            left, top = int(left), int(top)  # Truncated like pygame.Rect
+            x0, y0 = self._pixel(left), self._pixel(top)
+            x1 = max(self._pixel(left + int(width)), x0 + 1)
+            y1 = max(self._pixel(top + int(height)), y0 + 1)
+            image[max(y0, 0):max(y1, 0), max(x0, 0):max(x1, 0)] = BLACK
+        self._stamp_discs(image[None], np.asarray(target_pos, dtype=np.int64)[None], target_size, GREEN)
+        image.flags.writeable = False
+        if len(self._backgrounds) >= self.cache_size:
+            del self._backgrounds[next(iter(self._backgrounds))]
+        self._backgrounds[key] = (walls, image)
+        return image
+
+    def render(self, background, pos, angle, ray_offsets, rays, robot_size, out=None):
+        """
+        One frame: background (from background()) with the rays, robot and heading drawn in.
+
+        Args:
+            pos, angle: Robot position and heading (degrees).
+            ray_offsets: Ray angles relative to the heading (degrees), (R,).
+            rays: Ray distances, (R,).
+            out: Optional (H, W, 3) uint8 buffer. Without it a buffer owned by the rasterizer is
+                reused, so the returned frame is overwritten by the next call; copy it to keep it.
+
+        Returns:
+            np.ndarray: The (H, W, 3) frame.
+        """
+        if out is None:
+            if self._out is None or self._out.shape[0] != 1:
+                self._out = np.empty((1, self.resolution, self.resolution, 3), dtype=np.uint8)
+            out = self._out[0]
+        self.render_batch(background[None], np.asarray(pos)[None], np.asarray([angle]), ray_offsets,
+                          np.asarray(rays)[None], robot_size, out=out[None])
+        return out
+
+    def render_batch(self, backgrounds, positions, angles, ray_offsets, rays, robot_size, out=None):
+        """
+        N frames at once: backgrounds (N, H, W, 3), a list of N (H, W, 3) or one (H, W, 3)
+        shared by all, positions (N, 2), angles (N,), rays (N, R). out as in render, (N, H, W, 3).
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        num_frames = len(positions)
+        if out is None:
+            if self._out is None or self._out.shape[0] != num_frames:
+                self._out = np.empty((num_frames, self.resolution, self.resolution, 3), dtype=np.uint8)
+            out = self._out
+        elif not out.flags.c_contiguous:
+            raise ValueError("out must be a C-contiguous (N, H, W, 3) uint8 array")
+        if isinstance(backgrounds, (list, tuple)):
+            for frame, background in zip(out, backgrounds):
+                np.copyto(frame, background)
+        else:
+            np.copyto(out, backgrounds)
+
+        angles_rad = np.radians(np.asarray(angles, dtype=np.float64))
+        ray_angles = angles_rad[:, None] + np.radians(np.asarray(ray_offsets, dtype=np.float64))[None, :]
+        directions = np.stack((np.cos(ray_angles), np.sin(ray_angles)), axis=-1)  # (N, R, 2)
+        self._draw_lines(out, positions, directions, np.asarray(rays, dtype=np.float64), RED)
+        self._stamp_discs(out, positions.astype(np.int64), robot_size, BLUE)
+
+        # Heading: robot_size long and 3 pixels wide, like pygame.draw.line(..., 3)
+        heading = np.stack((np.cos(angles_rad), np.sin(angles_rad)), axis=-1)  # (N, 2)
+        normal = np.stack((-heading[:, 1], heading[:, 0]), axis=-1)
+        lengths = np.full((num_frames, 3), float(robot_size))
+        widths = np.array([-1.0, 0.0, 1.0]) / self.scale  # One output pixel apart
+        starts = positions[:, None, :] + widths[None, :, None] * normal[:, None, :]
+        self._draw_lines(out, starts, np.broadcast_to(heading[:, None, :], starts.shape), lengths, WHITE)
+        return out
+
+    def _pixel(self, coordinate):
+        return int(round(coordinate * self.scale)) if self.scale != 1.0 else int(coordinate)
+
+    def _draw_lines(self, out, origins, directions, lengths, color):
+        # Segments from origins (N, L, 2) or (N, 2) along unit directions (N, L, 2) for lengths
+        # (N, L) in house units, sampled once per output pixel
+        num_frames, resolution = out.shape[0], out.shape[1]
+        if origins.ndim == 2:
+            origins = origins[:, None, :]
+        pixel_lengths = lengths * self.scale
+        steps = np.arange(int(np.ceil(pixel_lengths.max(initial=0.0))) + 1)
+        xs = np.floor((origins[..., 0] * self.scale)[..., None] + directions[..., 0, None] * steps).astype(np.int64)
+        ys = np.floor((origins[..., 1] * self.scale)[..., None] + directions[..., 1, None] * steps).astype(np.int64)
+        keep = (steps <= pixel_lengths[..., None]) & (xs >= 0) & (xs < resolution) & (ys >= 0) & (ys < resolution)
+        rows = ys + (np.arange(num_frames) * resolution)[:, None, None]  # (N, L, S)
+        out.reshape(-1, 3)[(rows * resolution + xs)[keep]] = color
+
+    def _stamp_discs(self, out, centers, radius, color):
+        # Filled discs of radius (house units) at integer centers (N, 2), like pygame.draw.circle
+        num_frames, resolution = out.shape[0], out.shape[1]
+        offsets = self._disc(radius)
+        pixels = np.floor(centers * self.scale).astype(np.int64)[:, None, :] + offsets  # (N, D, 2)
+        xs, ys = pixels[..., 0], pixels[..., 1]
+        inside = (xs >= 0) & (xs < resolution) & (ys >= 0) & (ys < resolution)
+        rows = ys + (np.arange(num_frames) * resolution)[:, None]
+        out.reshape(-1, 3)[(rows * resolution + xs)[inside]] = color
+
+    def _disc(self, radius):
+        offsets = self._discs.get(radius)
+        if offsets is None:
+            # pygame fills the pixels cx - r .. cx + r - 1, so the disc is centred half a pixel up-left
+            pixel_radius = max(radius * self.scale, 0.5)
+            reach = int(np.ceil(pixel_radius))
+            ys, xs = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+            inside = (xs + 0.5) ** 2 + (ys + 0.5) ** 2 <= pixel_radius ** 2
+            offsets = np.stack((xs[inside], ys[inside]), axis=-1)
+            self._discs[radius] = offsets
+        return offsets
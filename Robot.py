@@ -1,20 +1,37 @@
 
-import pygame
 import numpy as np
 import math
 
+import Geometry
+
 
 class Robot:
-    def __init__(self, start_pos, start_angle, size=10, speed=5, num_rays=17, fov=60.0, ray_length=None):
+    def __init__(self, start_pos, start_angle, size=10, speed=5, num_rays=17, fov=60.0, ray_length=None,
+                 reuse_rays=True, ray_noise=0.0, rng=None):
         self.size = size
-        self.pos = np.array(start_pos, dtype=np.float32)
+        self.pos = np.array(start_pos, dtype=np.float64)
         self.angle = float(start_angle)
         self.speed = speed
         self.num_rays = num_rays
-        self.fov = fov  # field of view
+        self.fov = fov  # field of view, 360 for a full lidar scan (see Geometry.ray_offsets)
         self.ray_length = ray_length if ray_length is not None else 512 * 0.7  # Default ray length
         if self.ray_length is None:
             raise ValueError("ray_length must be specified or default must be calculable from house size")
+        # Angular noise: every cast perturbs each ray direction by N(0, ray_noise) degrees
+        self.ray_noise = ray_noise
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # Last ray cast, reused when the pose is unchanged or only rotated by whole ray steps
+        self.reuse_rays = reuse_rays
+        self._last_cast = None  # (walls, x, y, angle, num_rays, fov, ray_length, distances)
+        self.rays_cast = 0  # Number of rays actually traced against the walls
+
+        # Per-ray tables relative to the heading, rebuilt only when num_rays or fov change
+        self._ray_table_key = None
+        self._ray_offsets = None  # Relative ray angles (degrees)
+        self._ray_unit_vectors = None  # Relative ray directions, (num_rays, 2)
+        self._ray_spacing = 0.0  # Angle between neighbouring rays (degrees)
+        self._full_circle = False
 
     def move_forward(self, walls):  # Added walls argument
         angle_rad = math.radians(self.angle)
@@ -30,17 +47,11 @@ class Robot:
             return True  # Collision occurred (robot stayed in place)
 
     def check_collision_walls(self, walls):
-        robot_rect = pygame.Rect(
-            self.pos[0] - self.size,
-            self.pos[1] - self.size,
-            self.size * 2,
-            self.size * 2
-        )
+        if isinstance(walls, (Geometry.WallGrid, Geometry.DistanceField)):  # Spatial index or baked field
+            return walls.robot_collides(self.pos, self.size)
 
-        for wall in walls:
-            if robot_rect.colliderect(wall):
-                return True
-        return False
+        robot_rect = Geometry.robot_boxes(self.pos, self.size)
+        return bool(Geometry.boxes_hit_walls(robot_rect, Geometry.pack_walls(walls)))
 
 
         # for wall in walls:
@@ -67,20 +78,115 @@ class Robot:
         self.angle -= angle_step
         return True
 
-    def cast_rays(self, walls):
+    def get_ray_offsets(self):
+        # Ray angles relative to the robot heading (degrees), read-only
+        self._update_ray_tables()
+        return self._ray_offsets
+
+    def get_ray_angles(self):
+        return self.angle + self.get_ray_offsets()
+
+    def get_ray_directions(self):
+        # Unit ray directions (num_rays, 2): the relative table rotated by the heading
+        self._update_ray_tables()
+        angle_rad = math.radians(self.angle)
+        cos, sin = math.cos(angle_rad), math.sin(angle_rad)
+        return self._ray_unit_vectors @ np.array([[cos, sin], [-sin, cos]])
+
+    def _update_ray_tables(self):
+        if self._ray_table_key == (self.num_rays, self.fov):
+            return
+        offsets = Geometry.ray_offsets(self.num_rays, self.fov)
+        unit_vectors = Geometry.ray_directions(offsets)
+        offsets.flags.writeable = False
+        unit_vectors.flags.writeable = False
+        self._ray_offsets, self._ray_unit_vectors = offsets, unit_vectors
+        self._full_circle = self.fov >= 360
+        self._ray_spacing = offsets[1] - offsets[0] if self.num_rays > 1 else 0.0
+        self._ray_table_key = (self.num_rays, self.fov)
+
+    def cast_rays(self, walls, out=None):
+        # walls: Geometry.WallGrid / DistanceField, list of (x, y, w, h) rects or a packed (W, 4) array.
+        # The cache is keyed on the walls object, so walls must not be modified in place.
+        # out: optional float64 (num_rays,) buffer to write the distances into.
+        reused = self._reuse_last_cast(walls)
+        if reused is None:
+            distances = np.empty(self.num_rays)
+            missing = slice(0, self.num_rays)
+        else:
+            distances, missing = reused
+
+        if missing.stop > missing.start:
+            if self.ray_noise > 0:
+                angles = self.angle + self.get_ray_offsets()[missing]
+                directions = Geometry.ray_directions(angles + self.rng.normal(0.0, self.ray_noise, len(angles)))
+            else:
+                directions = self.get_ray_directions()[missing]
+            if isinstance(walls, (Geometry.WallGrid, Geometry.DistanceField)):
+                distances[missing] = walls.cast_rays(self.pos, directions, self.ray_length)
+            else:
+                distances[missing] = Geometry.cast_rays(self.pos, directions, Geometry.pack_walls(walls),
+                                                        self.ray_length)
+            self.rays_cast += missing.stop - missing.start
+
+        if self.reuse_rays:
+            self._last_cast = (walls, self.pos[0], self.pos[1], self.angle,
+                               self.num_rays, self.fov, self.ray_length, distances)
+        if out is not None:
+            out[:] = distances
+            return out
+        return distances.copy()  # Callers may overwrite entries (see Game_Env._check_target_found)
+
+    def _reuse_last_cast(self, walls):
+        """
+        Re-indexes the cached distances for the current pose.
+        Returns (distances, missing) where missing is the slice of rays that still need casting,
+        or None when nothing can be reused.
+        """
+        if not self.reuse_rays or self._last_cast is None or self.ray_noise > 0:
+            return None
+        last_walls, x, y, angle, num_rays, fov, ray_length, last_distances = self._last_cast
+        if (last_walls is not walls or x != self.pos[0] or y != self.pos[1] or
+                num_rays != self.num_rays or fov != self.fov or ray_length != self.ray_length):
+            return None
+        if self.angle == angle:
+            return last_distances.copy(), slice(0, 0)  # Blocked move: nothing changed
+
+        # A turn by a whole number of ray spacings shifts the fan: ray i now is old ray i + shift
+        self._update_ray_tables()
+        if self._ray_spacing == 0:
+            return None
+        shift = (self.angle - angle) / self._ray_spacing
+        rounded_shift = round(shift)
+        if abs(shift - rounded_shift) > 1e-9:
+            return None
+        if self._full_circle:  # A full scan only rotates, every ray is reused
+            return np.roll(last_distances, -int(rounded_shift)), slice(0, 0)
+        if abs(rounded_shift) >= self.num_rays:
+            return None
+        shift = int(rounded_shift)
+        distances = np.empty(self.num_rays)
+        if shift > 0:
+            distances[:-shift] = last_distances[shift:]
+            return distances, slice(self.num_rays - shift, self.num_rays)
+        distances[-shift:] = last_distances[:shift]
+        return distances, slice(0, -shift)
+
+    def cast_rays_clipline(self, walls):  # Reference implementation, kept for parity checks
+        import pygame  # Only needed for this reference
+
+        walls = [pygame.Rect(wall) for wall in walls]
         rays = []
-        angle_increment = self.fov / (self.num_rays - 1) if self.num_rays > 1 else 0
-        start_angle = self.angle - self.fov / 2
 
-        for i in range(self.num_rays):
-            ray_angle = start_angle + i * angle_increment
+        for ray_angle in self.get_ray_angles():
             ray_direction = np.array([math.cos(math.radians(ray_angle)), math.sin(math.radians(ray_angle))])
             ray_origin = self.pos
             ray_end = ray_origin + ray_direction * self.ray_length
 
             closest_intersection_distance = self.ray_length  # Initialize max distance
             for wall in walls:
-                intersection_point = wall.clipline(ray_origin[0], ray_origin[1], ray_end[0], ray_end[1])
+                intersection_point = wall.clipline(float(ray_origin[0]), float(ray_origin[1]),
+                                                  float(ray_end[0]), float(ray_end[1]))
                 if intersection_point:
                     p1, p2 = intersection_point  # clipline returns two points if it intersects
                     intersection = np.array(p1) if p1 else np.array(p2)  # Take the valid point
@@ -101,20 +207,12 @@ class Robot:
         return rays
 
     def get_ray_endpoints(self, ray_lengths):  # For visualization
-        endpoints = []
-        angle_increment = self.fov / (self.num_rays - 1) if self.num_rays > 1 else 0
-        start_angle = self.angle - self.fov / 2
-
-        for i in range(self.num_rays):
-            ray_angle = start_angle + i * angle_increment
-            ray_direction = np.array([math.cos(math.radians(ray_angle)), math.sin(math.radians(ray_angle))])
-            ray_origin = self.pos
-            ray_length = ray_lengths[i]  # Use the actual ray length
-            ray_end = ray_origin + ray_direction * ray_length
-            endpoints.append(ray_end)
-        return endpoints
+        # (num_rays, 2) end points of rays with the given lengths along the noise-free directions
+        return self.pos + np.asarray(ray_lengths)[:, None] * self.get_ray_directions()
 
     def draw(self, surface, ray_lengths):
+        import pygame  # Only needed for rendering
+
         # Draw Rays
         ray_endpoints = self.get_ray_endpoints(ray_lengths)
         for end_point in ray_endpoints:
@@ -0,0 +1,108 @@
+import time
+
+
+class StepProfiler:
+    """
+    Low-overhead per-stage timers for environment steps.
+
+    Call start() at the beginning of a step or reset and lap(stage) after each stage: the
+    time since the previous mark is added to that stage. Cumulative totals and lap counts
+    are kept per stage, the timings of the latest step in last_step.
+    """
+
+    def __init__(self):
+        self.totals = {}  # stage -> cumulative ns
+        self.counts = {}  # stage -> number of laps
+        self.last_step = {}  # stage -> ns spent in the latest step
+        self._mark = 0
+
+    def start(self):
+        self.last_step = {}
+        self._mark = time.perf_counter_ns()
+
+    def lap(self, stage):
+        now = time.perf_counter_ns()
+        elapsed = now - self._mark
+        self._mark = now
+        self.totals[stage] = self.totals.get(stage, 0) + elapsed
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+        self.last_step[stage] = self.last_step.get(stage, 0) + elapsed
+
+    def last_step_us(self):
+        return {stage: elapsed / 1e3 for stage, elapsed in self.last_step.items()}
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: stage -> {"total_s", "calls", "mean_us"}. Plain values, so the stats can be
+                sent back from SubprocVecEnv workers and merged with merge_step_stats.
+        """
+        return {stage: {"total_s": total / 1e9, "calls": self.counts[stage],
+                        "mean_us": total / self.counts[stage] / 1e3}
+                for stage, total in self.totals.items()}
+
+    def reset(self):
+        self.totals = {}
+        self.counts = {}
+        self.last_step = {}
+
+
+class NullProfiler:
+    """Used when profiling is off: same interface as StepProfiler, records nothing."""
+
+    last_step = {}
+
+    def start(self):
+        pass
+
+    def lap(self, stage):
+        pass
+
+    def last_step_us(self):
+        return {}
+
+    def get_stats(self):
+        return {}
+
+    def reset(self):
+        pass
+
+
+def merge_step_stats(stats_list):
+    """Sums per-stage stats of several envs (e.g. the workers of a vec env)."""
+    merged = {}
+    for stats in stats_list:
+        for stage, values in stats.items():
+            total = merged.setdefault(stage, {"total_s": 0.0, "calls": 0})
+            total["total_s"] += values["total_s"]
+            total["calls"] += values["calls"]
+    for values in merged.values():
+        values["mean_us"] = values["total_s"] / values["calls"] * 1e6 if values["calls"] else 0.0
+    return merged
+
+
+def diff_step_stats(current, previous):
+    """Per-stage stats accumulated between two snapshots from get_step_stats/collect_step_stats."""
+    diff = {}
+    for stage, values in current.items():
+        before = previous.get(stage, {"total_s": 0.0, "calls": 0}) if previous else {"total_s": 0.0, "calls": 0}
+        calls = values["calls"] - before["calls"]
+        total_s = values["total_s"] - before["total_s"]
+        if calls > 0:
+            diff[stage] = {"total_s": total_s, "calls": calls, "mean_us": total_s / calls * 1e6}
+    return diff
+
+
+def collect_step_stats(vec_env):
+    """
+    Step stats of every env behind a (possibly wrapped, e.g. VecNormalize) vec env, merged.
+    A batched Vec_Game_Env already profiles the whole batch; DummyVecEnv / SubprocVecEnv
+    workers are queried one by one.
+    """
+    from stable_baselines3.common.vec_env import VecEnvWrapper  # Keeps Game_Env importable without SB3 / torch
+
+    while isinstance(vec_env, VecEnvWrapper):
+        vec_env = vec_env.venv
+    if hasattr(vec_env, "get_step_stats"):
+        return vec_env.get_step_stats()
+    return merge_step_stats(vec_env.env_method("get_step_stats"))
@@ -0,0 +1,237 @@
+import copy
+import glob
+import os
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+import torch as th
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+class EpochCallback(BaseCallback):
+    """
+    Splits a single learn() call into epochs of steps_per_epoch env steps (summed over envs).
+
+    At every epoch boundary the episodes training_logger saw finish during the epoch are
+    summarized (count, mean return and length, success rate; NaN means without episodes),
+    together with the wall time and env steps/sec of the epoch. on_epoch_end(epoch, snapshot)
+    is then called if given, e.g. to save a checkpoint; returning False from it stops training.
+    Register it after training_logger in the CallbackList so the epoch's last step is counted.
+    """
+
+    def __init__(self, steps_per_epoch, training_logger, on_epoch_end=None, verbose=0):
+        super().__init__(verbose)
+        self.steps_per_epoch = steps_per_epoch
+        self.training_logger = training_logger
+        self.on_epoch_end = on_epoch_end
+        self.snapshots = []  # One dict per finished epoch
+        self._epoch_start_time = None
+        self._epoch_start_steps = 0
+        self._last_totals = None
+
+    def _on_training_start(self) -> None:
+        self._epoch_start_time = time.perf_counter()
+        self._epoch_start_steps = self.num_timesteps
+        self._last_totals = self.training_logger.get_totals()
+
+    def _on_step(self) -> bool:
+        if self.num_timesteps - self._epoch_start_steps < self.steps_per_epoch:
+            return True
+        return self._end_epoch()
+
+    def _end_epoch(self):
+        now = time.perf_counter()
+        totals = self.training_logger.get_totals()
+        episodes = totals["episodes"] - self._last_totals["episodes"]
+        seconds = now - self._epoch_start_time
+        snapshot = {
+            "epoch": len(self.snapshots) + 1,
+            "timesteps": self.num_timesteps,
+            "episodes": episodes,
+            "reward": (totals["return"] - self._last_totals["return"]) / episodes if episodes else float("nan"),
+            "length": (totals["length"] - self._last_totals["length"]) / episodes if episodes else float("nan"),
+            "success_rate": (totals["successes"] - self._last_totals["successes"]) / episodes if episodes
+            else float("nan"),
+            "seconds": seconds,
+            "steps_per_sec": (self.num_timesteps - self._epoch_start_steps) / seconds,
+        }
+        self.snapshots.append(snapshot)
+        self._last_totals = totals
+        self._epoch_start_time, self._epoch_start_steps = now, self.num_timesteps
+
+        self.logger.record("epoch/number", snapshot["epoch"])
+        self.logger.record("epoch/episodes", episodes)
+        self.logger.record("epoch/steps_per_sec", snapshot["steps_per_sec"])
+        if episodes:
+            self.logger.record("epoch/mean_return", snapshot["reward"])
+            self.logger.record("epoch/success_rate", snapshot["success_rate"])
+        if self.verbose > 0:
+            print(f"     epoch {snapshot['epoch']}: {episodes} episodes, mean return {snapshot['reward']:.1f}, "
+                  f"{snapshot['steps_per_sec']:.0f} steps/s")
+        if self.on_epoch_end is not None and self.on_epoch_end(snapshot["epoch"], snapshot) is False:
+            return False
+        return True
+
+    def get_rewards(self):
+        return [snapshot["reward"] for snapshot in self.snapshots]
+
+    def get_episode_lengths(self):
+        return [snapshot["length"] for snapshot in self.snapshots]
+
+
+class AsyncCheckpointCallback(BaseCallback):
+    """
+    Checkpoints the training state every save_freq env steps (at the next rollout start) and at
+    the end of training, without stalling the rollout loop.
+
+    On the training thread the callback only copies the state: model parameters and optimizer
+    state, VecNormalize statistics, the Python / NumPy / torch RNG states and the env RNGs,
+    plus extra_state() if given. A background thread serializes the copy with torch.save to
+    a temporary file, renames it to checkpoint_<timesteps>.pt (atomic) and removes all but the
+    newest keep_last checkpoints. At most one copy waits behind the one being written.
+
+    Resume with latest_checkpoint, load_checkpoint and restore_checkpoint.
+    """
+
+    def __init__(self, directory, save_freq, vec_normalize=None, keep_last=3, extra_state=None, save_on_end=True,
+                 verbose=0):
+        super().__init__(verbose)
+        self.directory = directory
+        self.save_freq = save_freq
+        self.vec_normalize = vec_normalize
+        self.keep_last = keep_last
+        self.extra_state = extra_state
+        self.save_on_end = save_on_end
+        self.snapshot_seconds = []  # Time the training thread spent per checkpoint
+        self._last_saved = None
+        self._queue = queue.Queue(maxsize=1)
+        self._writer = None
+        self._error = None
+
+    def _on_training_start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._last_saved = self.num_timesteps
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+            self._writer.start()
+
+    def _on_rollout_start(self) -> None:
+        # Between rollouts the weights include the latest update and no transitions are pending
+        if self._error is not None:
+            raise RuntimeError("Writing a checkpoint failed") from self._error
+        if self.num_timesteps - self._last_saved >= self.save_freq:
+            self.checkpoint()
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_training_end(self) -> None:
+        if self.save_on_end and self.num_timesteps != self._last_saved:
+            self.checkpoint()
+        self.wait()
+
+    def checkpoint(self):
+        """Copies the current training state and queues it for writing."""
+        start = time.perf_counter()
+        state = capture_state(self.model, self.vec_normalize)
+        if self.extra_state is not None:
+            state["extra"] = copy.deepcopy(self.extra_state())
+        path = os.path.join(self.directory, f"checkpoint_{self.num_timesteps:012d}.pt")
+        self._queue.put((path, state))
+        self._last_saved = self.num_timesteps
+        self.snapshot_seconds.append(time.perf_counter() - start)
+
+    def wait(self):
+        """Blocks until every queued checkpoint is on disk."""
+        self._queue.join()
+        if self._error is not None:
+            raise RuntimeError("Writing a checkpoint failed") from self._error
+
+    def _write_loop(self):
+        while True:
+            path, state = self._queue.get()
+            try:
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    th.save(state, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+                for old_path in list_checkpoints(self.directory)[:-self.keep_last]:
+                    os.remove(old_path)
+                if self.verbose > 0:
+                    print(f"     checkpoint saved: {path}")
+            except Exception as error:  # Surfaced on the training thread
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+
+def capture_state(model, vec_normalize=None):
+    """Copy of everything needed to resume training model (see AsyncCheckpointCallback)."""
+    state = {
+        "num_timesteps": model.num_timesteps,
+        "episode_num": model._episode_num,
+        "parameters": copy.deepcopy(model.get_parameters()),
+        "rng": {
+            "python": random.getstate(),
+            "numpy": np.random.get_state(),
+            "torch": th.get_rng_state(),
+            "envs": _env_rng_states(model.get_env()),
+        },
+    }
+    if vec_normalize is not None:
+        state["vec_normalize"] = {
+            "obs_rms": copy.deepcopy(vec_normalize.obs_rms),
+            "ret_rms": copy.deepcopy(vec_normalize.ret_rms),
+        }
+    return state
+
+
+def _env_rng_states(vec_env):
+    try:
+        generators = vec_env.get_attr("np_random")
+    except AttributeError:  # Vec_Game_Env keeps no per-env generators
+        return None
+    return [copy.deepcopy(generator.bit_generator.state) for generator in generators]
+
+
+def list_checkpoints(directory):
+    """Checkpoint paths in directory, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, "checkpoint_*.pt")))
+
+
+def latest_checkpoint(directory):
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[-1] if checkpoints else None
+
+
+def load_checkpoint(path):
+    # Checkpoints hold RNG states and running statistics, not only tensors
+    return th.load(path, weights_only=False)
+
+
+def restore_checkpoint(model, state, vec_normalize=None):
+    """
+    Restores a checkpoint into model (built with the same architecture and env) and
+    vec_normalize. Continue with model.learn(remaining_steps, reset_num_timesteps=False);
+    episodes in flight when the checkpoint was taken start over.
+    """
+    model.set_parameters(state["parameters"], exact_match=True, device=model.device)
+    model.num_timesteps = state["num_timesteps"]
+    model._episode_num = state["episode_num"]
+    random.setstate(state["rng"]["python"])
+    np.random.set_state(state["rng"]["numpy"])
+    th.set_rng_state(state["rng"]["torch"])
+    env_states = state["rng"]["envs"]
+    if env_states is not None:
+        for i, env_state in enumerate(env_states):
+            generator = np.random.Generator(getattr(np.random, env_state["bit_generator"])())
+            generator.bit_generator.state = env_state
+            model.get_env().set_attr("np_random", generator, indices=i)
+    if vec_normalize is not None and "vec_normalize" in state:
+        vec_normalize.obs_rms = copy.deepcopy(state["vec_normalize"]["obs_rms"])
+        vec_normalize.ret_rms = copy.deepcopy(state["vec_normalize"]["ret_rms"])
@@ -1,37 +1,208 @@
+import time
+from collections import deque
 
 import numpy as np
 from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecNormalize
+
+from StepProfiler import collect_step_stats, diff_step_stats
+
+
+class RingBuffer:
+    """Fixed-capacity array of the latest values; the oldest are overwritten."""
+
+    def __init__(self, capacity, dtype=np.float64):
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.capacity = capacity
+        self.count = 0  # Values appended so far
+
+    def extend(self, values):
+        values = np.asarray(values)
+        kept = values[-self.capacity:]
+        start = self.count + len(values) - len(kept)
+        self.data[(start + np.arange(len(kept))) % self.capacity] = kept
+        self.count += len(values)
+
+    def values(self):
+        """Stored values, oldest first."""
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return np.roll(self.data, -(self.count % self.capacity))
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
 
 class TrainingLogger(BaseCallback):
     """
-    Custom callback to log rewards, episode lengths, and loss during training.
+    Per-env episode metrics and throughput during training, at constant memory.
+
+    Return, length and collision steps of the running episode of every env live in arrays of
+    num_envs entries. When an env's episode ends (dones), its totals go into ring buffers of
+    the last window episodes and into cumulative totals. Returns are the original env rewards
+    (before VecNormalize). An episode is a success when its last step found the target
+    (info["target_found"]) and it was not cut off by a time limit. get_rolling_stats
+    summarizes the window and the throughput; the SB3 logger gets the same values on every
+    rollout.
+
+    With log_stage_timings=True (envs created with profile=True), every rollout also logs the
+    env stage timings (mean us per stage call, summed over vec env workers) next to the
+    rollout reward, plus the wall time per vec step. For in-process vec envs (DummyVecEnv,
+    Vec_Game_Env) wall time minus env time is what the policy and the rollout buffer took.
     """
 
-    def __init__(self, verbose=0):
+    def __init__(self, verbose=0, log_stage_timings=False, window=100, rollout_window=100):
         super(TrainingLogger, self).__init__(verbose)
-        self.losses = []
-        self.current_episode_reward = 0
-        self.current_episode_length = 0
+        self.window = window
+        self.episode_returns = RingBuffer(window)
+        self.episode_lengths = RingBuffer(window, dtype=np.int64)
+        self.episode_successes = RingBuffer(window, dtype=bool)
+        self.episode_collisions = RingBuffer(window, dtype=np.int64)
+        self.policy_losses = RingBuffer(window)
+        self.value_losses = RingBuffer(window)
+        self.totals = {"steps": 0, "episodes": 0, "return": 0.0, "length": 0, "successes": 0, "collisions": 0}
 
-    def _on_step(self) -> bool:
-        # Log rewards and steps
-        reward = np.mean(self.locals["rewards"])
-        self.current_episode_reward += reward
-        self.current_episode_length += 1
-        # print("current reward: ", self.current_episode_reward)
+        self._returns = None  # Running episode of every env, allocated on training start
+        self._lengths = None
+        self._collisions = None
+        self._start_time = None
+        self._rollout_marks = deque(maxlen=rollout_window)  # (time, steps, episodes) per rollout end
 
-        # Capture loss (SB3 doesn't expose this directly, but we extract it)
-        loss = self.logger.name_to_value.get("loss", None)
-        if loss is not None:
-            self.losses.append(loss)
+        self.log_stage_timings = log_stage_timings
+        self.rollout_timings = deque(maxlen=rollout_window)  # Per rollout: reward, wall / env time per vec step, stages
+        self._rollout_reward = 0
+        self._rollout_steps = 0
+        self._rollout_start = None
+        self._last_stage_stats = None
 
+    def _on_training_start(self) -> None:
+        num_envs = self.training_env.num_envs
+        if self._returns is None or len(self._returns) != num_envs:
+            self._returns = np.zeros(num_envs, dtype=np.float64)
+            self._lengths = np.zeros(num_envs, dtype=np.int64)
+            self._collisions = np.zeros(num_envs, dtype=np.int64)
+        else:
+            # learn() resets the envs, so episodes in flight are dropped
+            self._returns[:] = 0.0
+            self._lengths[:] = 0
+            self._collisions[:] = 0
+        self._start_time = time.perf_counter()
+        self._rollout_marks.clear()
+        self._rollout_marks.append((self._start_time, self.totals["steps"], self.totals["episodes"]))
+
+    def _on_rollout_start(self) -> None:
+        self._rollout_reward = 0
+        self._rollout_steps = 0
+        self._rollout_start = time.perf_counter()
+        if self.log_stage_timings and self._last_stage_stats is None:
+            self._last_stage_stats = collect_step_stats(self.training_env)
+
+        # Losses of the update that just ran
+        policy_loss = self.logger.name_to_value.get("train/policy_loss", None)
+        if policy_loss is not None:
+            self.policy_losses.extend([policy_loss])
+            self.value_losses.extend([self.logger.name_to_value.get("train/value_loss", np.nan)])
+
+    def _on_step(self) -> bool:
+        rewards = self.locals["rewards"]
+        if isinstance(self.training_env, VecNormalize):
+            rewards = self.training_env.get_original_reward()
+        dones = self.locals["dones"]
+        infos = self.locals["infos"]
+        self._returns += rewards
+        self._lengths += 1
+        self._collisions += [info.get("collision", False) for info in infos]
+        self._rollout_reward += float(np.mean(rewards))
+        self._rollout_steps += 1
+        self.totals["steps"] += len(dones)
+
+        if dones.any():
+            ended = np.flatnonzero(dones)
+            successes = [bool(infos[i].get("target_found", False)) and not infos[i].get("TimeLimit.truncated", False)
+                         for i in ended]
+            self.episode_returns.extend(self._returns[ended])
+            self.episode_lengths.extend(self._lengths[ended])
+            self.episode_successes.extend(successes)
+            self.episode_collisions.extend(self._collisions[ended])
+            self.totals["episodes"] += len(ended)
+            self.totals["return"] += float(self._returns[ended].sum())
+            self.totals["length"] += int(self._lengths[ended].sum())
+            self.totals["successes"] += int(sum(successes))
+            self.totals["collisions"] += int(self._collisions[ended].sum())
+            self._returns[ended] = 0.0
+            self._lengths[ended] = 0
+            self._collisions[ended] = 0
         return True
 
+    def _on_rollout_end(self) -> None:
+        self._rollout_marks.append((time.perf_counter(), self.totals["steps"], self.totals["episodes"]))
+        stats = self.get_rolling_stats()
+        for key in ("mean_return", "mean_length", "success_rate", "mean_collisions", "steps_per_sec",
+                    "episodes_per_sec"):
+            if np.isfinite(stats[key]):
+                self.logger.record(f"episodes/{key}", stats[key])
+
+        if not self.log_stage_timings or self._rollout_steps == 0:
+            return
+        wall_us = (time.perf_counter() - self._rollout_start) / self._rollout_steps * 1e6
+        stage_stats = collect_step_stats(self.training_env)
+        stages = diff_step_stats(stage_stats, self._last_stage_stats)
+        self._last_stage_stats = stage_stats
+        env_us = sum(values["total_s"] for values in stages.values()) / self._rollout_steps * 1e6
+
+        self.rollout_timings.append({
+            "reward": float(self._rollout_reward),
+            "wall_us_per_step": wall_us,
+            "env_us_per_step": env_us,
+            "stages": stages,
+        })
+        self.logger.record("rollout/reward_sum", float(self._rollout_reward))
+        self.logger.record("timing/wall_us_per_step", wall_us)
+        self.logger.record("timing/env_us_per_step", env_us)
+        for stage, values in stages.items():
+            self.logger.record(f"timing/{stage}_us", values["mean_us"])
+        if self.verbose > 0:
+            stage_text = ", ".join(f"{stage} {values['mean_us']:.1f}" for stage, values in stages.items())
+            print(f"rollout reward {self._rollout_reward:.1f} | per vec step: wall {wall_us:.0f} us, "
+                  f"env {env_us:.0f} us | stage means (us): {stage_text}")
+
+    def get_rolling_stats(self):
+        """
+        Returns:
+            dict: Means over the last window episodes (mean_return, mean_length, success_rate,
+                mean_collisions; NaN before the first episode), their count, the cumulative
+                steps and episodes, and env steps / episodes per second over the last
+                rollouts (steps_per_sec, episodes_per_sec).
+        """
+        stats = {"episodes_in_window": len(self.episode_returns),
+                 "total_steps": self.totals["steps"], "total_episodes": self.totals["episodes"]}
+        for key, buffer in (("mean_return", self.episode_returns), ("mean_length", self.episode_lengths),
+                            ("success_rate", self.episode_successes), ("mean_collisions", self.episode_collisions)):
+            stats[key] = float(np.mean(buffer.values())) if len(buffer) else float("nan")
+        stats["steps_per_sec"] = stats["episodes_per_sec"] = float("nan")
+        if len(self._rollout_marks) > 1:
+            (start, start_steps, start_episodes), (end, end_steps, end_episodes) = \
+                self._rollout_marks[0], self._rollout_marks[-1]
+            if end > start:
+                stats["steps_per_sec"] = (end_steps - start_steps) / (end - start)
+                stats["episodes_per_sec"] = (end_episodes - start_episodes) / (end - start)
+        return stats
+
+    def get_totals(self):
+        """Cumulative steps, episodes and summed episode return, length, successes and collisions."""
+        return dict(self.totals)
+
     def get_rewards(self):
-        return self.current_episode_reward
+        """Returns of the last window finished episodes, oldest first."""
+        return self.episode_returns.values()
 
     def get_episode_lengths(self):
-        return self.current_episode_length
+        """Lengths of the last window finished episodes, oldest first."""
+        return self.episode_lengths.values()
 
     def get_losses(self):
-        return self.losses
+        """Policy and value losses of the last window updates, oldest first."""
+        return {"policy_loss": self.policy_losses.values(), "value_loss": self.value_losses.values()}
+
+    def get_stage_timings(self):
+        return list(self.rollout_timings)
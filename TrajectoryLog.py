@@ -0,0 +1,311 @@
+"""
+Episode trajectory logs: what a Game_Env did, step by step, for offline replay.
+
+Game_Env.start_trajectory_log(directory) streams every step into column chunks
+({column}_{k:05d}.npy, chunk_size rows each) and keeps a small episode table:
+
+    x, y             (T,) float64     robot position after the step (exact, for re-checking collisions)
+    angle            (T,) float32     heading (degrees, whole turn steps)
+    action           (T,) int8        action taken, -1 for the first row of an episode (after reset)
+    reward           (T,) float32
+    rays             (T, R) float32   ray distances (target ray shortened), as drawn by render()
+    collision        (T,) bool
+    target_found     (T,) bool
+
+    episodes.npz     start row, rows, seed, layout name / corpus index, target, walls slice, terminated
+    walls.npy        (W, 4) float32 walls of every distinct layout, back to back
+    meta.json        house size, ray angles and length, robot and target size, rows and chunks
+
+The tables are rewritten whenever a chunk is flushed, so a log is readable while it is being
+written (up to the last flushed chunk). Each table goes to a temporary file that is renamed into
+place, meta.json last, so readers never see a half-written table or a meta.json that counts rows
+the other tables do not have yet. TrajectoryLog reads a log back with memory-mapped
+chunks and renders any step without re-simulating:
+
+    python TrajectoryLog.py logs --list
+    python TrajectoryLog.py logs --episode 3 --video episode_3.gif
+    python TrajectoryLog.py logs --seed 1042 --step 120 --frame step_120.png
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+
+CHUNK_SIZE = 16384
+STEP_COLUMNS = ("x", "y", "angle", "action", "reward", "rays", "collision", "target_found")
+EPISODE_COLUMNS = ("start", "rows", "seed", "layout_name", "layout_index", "target_x", "target_y", "wall_start",
+                   "wall_count", "terminated")
+RENDER_BATCH = 64  # Frames rendered per Rasterizer.render_batch call
+
+
+class TrajectoryWriter:
+    """
+    Writes a trajectory log (see module docstring). Game_Env drives it: begin_episode on every
+    reset, add_step for the reset state and every step.
+
+    Args:
+        directory: Output directory, created if needed; must not hold a log yet.
+        size: House size.
+        ray_offsets: Ray angles relative to the heading (degrees).
+        ray_length, robot_size, target_size: For rendering the replay.
+        chunk_size: Rows per column chunk file.
+    """
+
+    def __init__(self, directory, size, ray_offsets, ray_length, robot_size, target_size, chunk_size=CHUNK_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(os.path.join(directory, "meta.json")):
+            raise FileExistsError(f"{directory} already holds a trajectory log")
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.meta = {"size": size, "ray_offsets": [float(offset) for offset in ray_offsets],
+                     "ray_length": float(ray_length), "robot_size": robot_size, "target_size": target_size,
+                     "chunk_size": chunk_size}
+        num_rays = len(ray_offsets)
+        self.x = np.empty(chunk_size, dtype=np.float64)
+        self.y = np.empty(chunk_size, dtype=np.float64)
+        self.angle = np.empty(chunk_size, dtype=np.float32)
+        self.action = np.empty(chunk_size, dtype=np.int8)
+        self.reward = np.empty(chunk_size, dtype=np.float32)
+        self.rays = np.empty((chunk_size, num_rays), dtype=np.float32)
+        self.collision = np.empty(chunk_size, dtype=bool)
+        self.target_found = np.empty(chunk_size, dtype=bool)
+        self.num_chunks = 0
+        self.num_rows = 0  # Rows flushed to chunk files
+        self._filled = 0
+        self.episodes = {name: [] for name in EPISODE_COLUMNS}
+        self._walls = []  # Distinct layouts, as written to walls.npy
+        self._wall_slices = {}  # id(walls) -> (walls, start, count)
+        self._num_walls = 0
+
+    def begin_episode(self, walls, target_pos, layout_name=None, layout_index=None, seed=None):
+        """Starts an episode in the layout walls (W, 4); rows added next belong to it."""
+        cached = self._wall_slices.get(id(walls))
+        if cached is None or cached[0] is not walls:
+            cached = (walls, self._num_walls, len(walls))
+            self._wall_slices[id(walls)] = cached
+            self._walls.append(np.asarray(walls, dtype=np.float32).reshape(-1, 4))
+            self._num_walls += len(walls)
+        episodes = self.episodes
+        episodes["start"].append(self.num_rows + self._filled)
+        episodes["rows"].append(0)
+        episodes["seed"].append(-1 if seed is None else int(seed))
+        episodes["layout_name"].append(layout_name or "")
+        episodes["layout_index"].append(-1 if layout_index is None else int(layout_index))
+        episodes["target_x"].append(float(target_pos[0]))
+        episodes["target_y"].append(float(target_pos[1]))
+        episodes["wall_start"].append(cached[1])
+        episodes["wall_count"].append(cached[2])
+        episodes["terminated"].append(False)
+
+    def add_step(self, pos, angle, action, reward, rays, collision, target_found, terminated=False):
+        """Appends one row to the current episode (action -1 for the state right after reset)."""
+        i = self._filled
+        self.x[i] = pos[0]
+        self.y[i] = pos[1]
+        self.angle[i] = angle
+        self.action[i] = action
+        self.reward[i] = reward
+        self.rays[i] = rays
+        self.collision[i] = collision
+        self.target_found[i] = target_found
+        self.episodes["rows"][-1] += 1
+        if terminated:
+            self.episodes["terminated"][-1] = True
+        self._filled = i + 1
+        if self._filled == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._filled:
+            for name in STEP_COLUMNS:
+                np.save(os.path.join(self.directory, f"{name}_{self.num_chunks:05d}.npy"),
+                        getattr(self, name)[:self._filled])
+            self.num_chunks += 1
+            self.num_rows += self._filled
+            self._filled = 0
+        self._write_tables()
+
+    def close(self):
+        self.flush()
+
+    def _write_tables(self):
+        walls = np.concatenate(self._walls) if self._walls else np.zeros((0, 4), dtype=np.float32)
+        with self._replace("walls.npy") as f:
+            np.save(f, walls)
+        with self._replace("episodes.npz") as f:
+            np.savez(f, **{name: np.array(values) for name, values in self.episodes.items()})
+        meta = dict(self.meta, chunks=self.num_chunks, rows=self.num_rows, episodes=len(self.episodes["start"]))
+        with self._replace("meta.json") as f:
+            f.write(json.dumps(meta, indent=2).encode("utf-8"))
+
+    @contextlib.contextmanager
+    def _replace(self, name):
+        # Write to a temporary file and rename it over name, so readers see the old or the new file
+        path = os.path.join(self.directory, name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+
+
+class TrajectoryLog:
+    """
+    Read access to a trajectory log. Chunks are memory-mapped, so opening a log and jumping to
+    a step only reads the rows asked for.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.chunk_size = self.meta["chunk_size"]
+        self.ray_offsets = np.array(self.meta["ray_offsets"])
+        self.walls = np.load(os.path.join(directory, "walls.npy"))
+        with np.load(os.path.join(directory, "episodes.npz")) as data:
+            episodes = {name: data[name] for name in EPISODE_COLUMNS}
+        # Episodes (or their last rows) that were not flushed yet are left out
+        complete = episodes["start"] < self.meta["rows"]
+        self.episodes = {name: values[complete] for name, values in episodes.items()}
+        self.episodes["rows"] = np.minimum(self.episodes["rows"], self.meta["rows"] - self.episodes["start"])
+        self._chunks = [{name: np.load(os.path.join(directory, f"{name}_{k:05d}.npy"), mmap_mode="r")
+                         for name in STEP_COLUMNS} for k in range(self.meta["chunks"])]
+
+    def __len__(self):
+        return len(self.episodes["start"])
+
+    def find_episode(self, seed):
+        """Index of the first episode reset with seed."""
+        matches = np.flatnonzero(self.episodes["seed"] == seed)
+        if not len(matches):
+            raise KeyError(f"No episode with seed {seed} in {self.directory}")
+        return int(matches[0])
+
+    def rows(self, start, stop):
+        """Step columns of log rows start:stop (across chunks) as a dict of arrays."""
+        parts = {name: [] for name in STEP_COLUMNS}
+        row = start
+        while row < stop:
+            chunk, offset = divmod(row, self.chunk_size)
+            count = min(stop - row, self.chunk_size - offset)
+            for name in STEP_COLUMNS:
+                parts[name].append(self._chunks[chunk][name][offset:offset + count])
+            row += count
+        return {name: np.concatenate(values) if len(values) != 1 else np.asarray(values[0])
+                for name, values in parts.items()}
+
+    def episode(self, index, steps=None):
+        """
+        Episode index: its step columns (row 0 is the state after reset), walls, target and the
+        rest of its episode table entry. steps: optional slice of the episode's rows.
+        """
+        info = {name: values[index].item() for name, values in self.episodes.items()}
+        start, num_rows = info["start"], info["rows"]
+        first, last, _ = (steps or slice(None)).indices(num_rows)
+        episode = self.rows(start + first, start + max(last, first))
+        wall_start = info["wall_start"]
+        episode.update(info, walls=self.walls[wall_start:wall_start + info["wall_count"]],
+                       target_pos=np.array([info["target_x"], info["target_y"]]))
+        return episode
+
+    def frames(self, index, steps=None, scale=1.0):
+        """Yields the (H, W, 3) frames of episode index (or of its rows steps), drawn with Rasterizer."""
+        from Rasterizer import Rasterizer
+
+        rasterizer = Rasterizer(self.meta["size"], scale)
+        episode = self.episode(index, steps)
+        background = rasterizer.background(episode["walls"], episode["target_pos"].astype(np.int64),
+                                           self.meta["target_size"])
+        positions = np.stack((episode["x"], episode["y"]), axis=-1)
+        for start in range(0, len(positions), RENDER_BATCH):
+            batch = slice(start, start + RENDER_BATCH)
+            yield from rasterizer.render_batch(background, positions[batch], episode["angle"][batch], self.ray_offsets,
+                                               episode["rays"][batch], self.meta["robot_size"])
+
+    def frame(self, index, step, scale=1.0):
+        """Frame of row step of episode index (0: after reset)."""
+        return next(self.frames(index, slice(step, step + 1), scale)).copy()
+
+
+def write_video(path, frames, fps=30):
+    """
+    Writes frames to path: .gif with Pillow, other extensions (e.g. .mp4) through ffmpeg,
+    which must be on the PATH.
+
+    Returns:
+        int: Frames written.
+    """
+    count = 0
+    if path.endswith(".gif"):
+        from PIL import Image
+
+        images = [Image.fromarray(np.array(frame)) for frame in frames]
+        if not images:
+            raise ValueError("No frames to write")
+        images[0].save(path, save_all=True, append_images=images[1:], duration=1000 / fps, loop=0)
+        return len(images)
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError(f"Writing {path} needs ffmpeg on the PATH; use a .gif path instead")
+    process = None
+    for frame in frames:
+        if process is None:
+            height, width = frame.shape[:2]
+            process = subprocess.Popen(["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                                        "-s", f"{width}x{height}", "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p",
+                                        path], stdin=subprocess.PIPE)
+        process.stdin.write(np.ascontiguousarray(frame).tobytes())
+        count += 1
+    if process is None:
+        raise ValueError("No frames to write")
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed writing {path}")
+    return count
+
+
+def print_episodes(log):
+    print(f"{log.directory}: {len(log)} episodes, {log.meta['rows']} rows")
+    print(" episode   seed  layout        steps  return     collisions  terminated")
+    for i in range(len(log)):
+        episode = log.episode(i)
+        layout = episode["layout_name"] or (f"corpus {episode['layout_index']}" if episode["layout_index"] >= 0
+                                            else "random")
+        print(f"{i:8d} {episode['seed']:6d}  {layout:<12} {episode['rows'] - 1:6d}  {episode['reward'].sum():10.1f}"
+              f"  {int(episode['collision'].sum()):10d}  {episode['terminated']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay episodes of a trajectory log")
+    parser.add_argument("directory")
+    parser.add_argument("--list", action="store_true", help="List the episodes")
+    parser.add_argument("--episode", type=int, help="Episode index")
+    parser.add_argument("--seed", type=int, help="Episode reset with this seed")
+    parser.add_argument("--step", type=int, help="Row of the episode for --frame (0: after reset)")
+    parser.add_argument("--frame", help="Write the frame of --step to this image file")
+    parser.add_argument("--video", help="Write the episode to this .gif (or, with ffmpeg, .mp4) file")
+    parser.add_argument("--first", type=int, default=0, help="First row for --video")
+    parser.add_argument("--last", type=int, default=None, help="Row after the last one for --video")
+    parser.add_argument("--scale", type=float, default=1.0, help="Output pixels per house unit")
+    parser.add_argument("--fps", type=int, default=30)
+    args = parser.parse_args()
+
+    log = TrajectoryLog(args.directory)
+    if args.list or (args.episode is None and args.seed is None):
+        print_episodes(log)
+        return
+    index = log.find_episode(args.seed) if args.seed is not None else args.episode
+    if args.frame:
+        from PIL import Image
+
+        Image.fromarray(log.frame(index, args.step or 0, args.scale)).save(args.frame)
+        print(f"Wrote {args.frame}")
+    if args.video:
+        count = write_video(args.video, log.frames(index, slice(args.first, args.last), args.scale), args.fps)
+        print(f"Wrote {args.video}: {count} frames")
+
+
+if __name__ == "__main__":
+    main()
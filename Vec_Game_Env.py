@@ -0,0 +1,337 @@
+import inspect
+import time
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+import Geometry
+from Game_Env import dist_threshold
+from LayoutCorpus import open_corpus
+from new_House import House
+from StepProfiler import StepProfiler, NullProfiler
+
+# Rays per ray casting call (64 envs at 17 rays): keeps the (envs, rays, walls) temporaries cache resident
+RAY_CAST_CHUNK = 64 * 17
+
+
+class Vec_Game_Env(VecEnv):
+    """
+    Batched version of Game_Env that simulates num_envs robots in one process.
+
+    Robot positions, angles, failed-move counters and targets live in arrays, and
+    movement, ray casting, target detection and reward are computed for all envs
+    with array operations. Per-step behaviour (observation layout, reward values,
+    termination) matches Game_Env. Finished envs are reset automatically, following
+    the Stable-Baselines3 VecEnv contract. With max_episode_steps, episodes are also
+    truncated after that many steps, like gymnasium's TimeLimit (info["TimeLimit.truncated"]).
+
+    Attributes are shared by the whole batch, so get_attr/set_attr/env_method act on
+    this object and return one entry per requested index; env_method calls the method
+    once. Methods of a single env (an index argument, e.g. attach_viewer) get the one
+    requested index. With profile=True the stage timings cover the whole batch (see
+    get_step_stats).
+    """
+    metadata = {"render_modes": []}
+
+    def __init__(self, num_envs, size=512, ran_house=True, num_random_walls=10, houses=None,
+                 robot_size=10, speed=5, num_rays=17, fov=60.0, angle_step=15, profile=False, corpus=None,
+                 reward_shaping=False, shaping_scale=1.0, shaping_gamma=0.99, ray_length=None, ray_noise=0.0,
+                 max_episode_steps=None):
+        self.size = size
+        self.robot_start_pos = np.array([40, size // 2 - 10], dtype=np.float64)
+        self.robot_size = robot_size
+        self.speed = speed
+        self.num_rays = num_rays
+        self.fov = fov
+        self.angle_step = angle_step
+        self.ray_length = ray_length if ray_length is not None else size * 0.7
+        # Angular noise: every cast perturbs each ray direction by N(0, ray_noise) degrees
+        self.ray_noise = ray_noise
+        self.rng = np.random.default_rng()  # Reseeded by seed() at the next reset
+
+        # --- One House per env, walls padded to a common count ---
+        # With a layout corpus (LayoutCorpus or path), env i gets layout i modulo the corpus size
+        if isinstance(corpus, str):
+            corpus = open_corpus(corpus)
+        if houses is None and corpus is not None:
+            houses = [House(size, self.robot_start_pos, corpus=corpus, layout_index=i % len(corpus))
+                      for i in range(num_envs)]
+        elif houses is None:
+            houses = [House(size, self.robot_start_pos, ran_house, num_random_walls) for _ in range(num_envs)]
+        if len(houses) != num_envs:
+            raise ValueError(f"Expected {num_envs} houses, got {len(houses)}")
+        self.houses = houses
+        max_walls = max(len(house.wall_array) for house in houses)
+        # Padding walls have zero size and sit far outside the house, so they are never hit
+        self.walls = np.zeros((num_envs, max_walls, 4), dtype=np.float64)
+        self.walls[:, :, :2] = -10.0 * size
+        for i, house in enumerate(houses):
+            self.walls[i, :len(house.wall_array)] = house.wall_array
+        self.target_pos = np.array([house.target_pos for house in houses], dtype=np.float64)
+
+        # --- Robot state ---
+        self.pos = np.tile(self.robot_start_pos, (num_envs, 1))
+        self.angle = np.zeros(num_envs, dtype=np.float64)
+        self.num_of_failed_moved = np.zeros(num_envs, dtype=np.int64)
+        self.max_episode_steps = max_episode_steps
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.rays = np.zeros((num_envs, num_rays), dtype=np.float64)  # Latest ray distances, target ray shortened
+        self._all_envs = np.arange(num_envs)
+
+        self.ray_offsets = Geometry.ray_offsets(num_rays, fov)  # Relative ray angles (degrees), fov=360 for lidar
+
+        observation_space = spaces.Box(low=0.0, high=1.0, shape=(num_rays + 3,), dtype=np.float32)
+        action_space = spaces.Discrete(3)
+        self.render_mode = None
+        super().__init__(num_envs, observation_space, action_space)
+
+        # Potential-based reward shaping from each env's geodesic field, as in Game_Env
+        self.reward_shaping = reward_shaping
+        self.shaping_scale = shaping_scale
+        self.shaping_gamma = shaping_gamma
+        if reward_shaping:
+            fields = [house.geodesic_field() for house in houses]
+            self.geodesic_cell_size = fields[0].cell_size
+            self.geodesic_distance = np.stack([field.distance for field in fields])  # (envs, cells, cells)
+            self._potential = np.zeros(num_envs, dtype=np.float64)
+
+        self.actions = np.zeros(num_envs, dtype=np.int64)
+        self.viewer = None  # Live view of one env, see attach_viewer
+        self._viewer_index = 0
+        self._viewer_start = 0.0
+        self._rasterizers = {}  # scale -> Rasterizer, see render_frames
+        self.set_profiling(profile)
+
+    # --- Simulation ---
+    def _move(self, actions):
+        forward = actions == 0
+        if forward.any():
+            angle_rad = np.radians(self.angle[forward])
+            direction = np.stack((np.cos(angle_rad), np.sin(angle_rad)), axis=-1)
+            proposed = self.pos[forward] + direction * self.speed
+            boxes = Geometry.robot_boxes(proposed, self.robot_size)
+            blocked = Geometry.boxes_hit_walls(boxes, self.walls[forward])
+            self.pos[forward] = np.where(blocked[:, None], self.pos[forward], proposed)
+            moved = np.zeros(self.num_envs, dtype=bool)
+            moved[forward] = ~blocked
+        else:
+            moved = np.zeros(self.num_envs, dtype=bool)
+
+        self.angle[actions == 1] += self.angle_step
+        self.angle[actions == 2] -= self.angle_step
+
+        # Like Game_Env, any step that leaves the position unchanged (including turns) counts as failed
+        self.num_of_failed_moved = np.where(moved, 0, self.num_of_failed_moved + 1)
+
+    def _cast_rays(self, envs):
+        ray_angles = self.angle[envs, None] + self.ray_offsets[None, :]
+        if self.ray_noise > 0:
+            ray_angles = ray_angles + self.rng.normal(0.0, self.ray_noise, ray_angles.shape)
+        directions = Geometry.ray_directions(ray_angles)
+        positions = self.pos[envs]
+        walls = self.walls[envs]
+        rays = np.empty((len(positions), self.num_rays), dtype=np.float64)
+        chunk_envs = max(RAY_CAST_CHUNK // self.num_rays, 1)
+        for start in range(0, len(positions), chunk_envs):
+            chunk = slice(start, start + chunk_envs)
+            rays[chunk] = Geometry.cast_rays(positions[chunk], directions[chunk], walls[chunk], self.ray_length)
+        return rays
+
+    def _sense(self, envs):
+        # envs: integer indices of the envs to observe
+        rays = self._cast_rays(envs)  # (n, R)
+        self.profiler.lap("rays")
+
+        # Collision: every ray is shorter than 20% of the ray length
+        collision = np.all(rays / self.ray_length <= 0.2, axis=1)
+
+        # Target detection, vectorized version of Game_Env._check_target_found
+        vec_to_target = self.target_pos[envs] - self.pos[envs]
+        distance_to_target = np.hypot(vec_to_target[:, 0], vec_to_target[:, 1])
+        angle_to_target = np.degrees(np.arctan2(vec_to_target[:, 1], vec_to_target[:, 0])) - self.angle[envs]
+        angle_to_target = (angle_to_target + 180) % 360 - 180
+
+        aligned = np.abs((self.ray_offsets[None, :] - angle_to_target[:, None] + 180) % 360 - 180) < 1.5
+        visible = aligned & (rays >= distance_to_target[:, None])
+        target_found = visible.any(axis=1)
+        rays = np.where(visible, distance_to_target[:, None], rays)
+
+        closest_ray = np.argmin(np.where(visible, np.abs(self.ray_offsets)[None, :], np.inf), axis=1)
+        target_in_direction = np.where(target_found, self.ray_offsets[closest_ray], 0.0)
+        distance_from_target = np.where(target_found, distance_to_target, np.inf)
+        self.profiler.lap("target")
+
+        obs = np.empty((len(rays), self.num_rays + 3), dtype=np.float32)
+        obs[:, :self.num_rays] = rays / self.ray_length
+        self.rays[envs] = rays
+        obs[:, self.num_rays] = target_found
+        obs[:, self.num_rays + 1] = target_in_direction
+        obs[:, self.num_rays + 2] = self.num_of_failed_moved[envs]
+        self.profiler.lap("obs")
+        return obs, collision, target_found, distance_from_target
+
+    def _calculate_reward(self, collision, target_found, distance_from_target):
+        reward = np.full(self.num_envs, -5.0, dtype=np.float32)
+        reward[target_found] = np.where(distance_from_target[target_found] > dist_threshold, -1.0, 1000.0)
+        reward[self.num_of_failed_moved >= 3] = -10.0
+        reward[collision] = -20.0
+        return reward
+
+    def _potentials(self, envs):
+        last = self.geodesic_distance.shape[1] - 1
+        cells = np.clip(self.pos[envs] // self.geodesic_cell_size, 0, last).astype(np.int64)
+        distance = self.geodesic_distance[envs, cells[:, 1], cells[:, 0]].astype(np.float64)
+        finite = np.isfinite(distance)
+        return np.where(finite, -self.shaping_scale * np.where(finite, distance, 0.0), self._potential[envs])
+
+    def _reset_envs(self, envs):
+        self.pos[envs] = self.robot_start_pos
+        self.angle[envs] = 0.0
+        self.num_of_failed_moved[envs] = 0
+        self.episode_steps[envs] = 0
+
+    # --- VecEnv API ---
+    def reset(self):
+        self.profiler.start()
+        self._reset_envs(self._all_envs)
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        self.profiler.lap("reset")
+        obs, _, _, _ = self._sense(self._all_envs)
+        if self.reward_shaping:
+            self._potential[:] = 0.0
+            self._potential = self._potentials(self._all_envs)
+        if self.viewer is not None:
+            self._viewer_start = time.time()
+            self._publish_view()
+        return obs
+
+    def step_async(self, actions):
+        self.actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        profiler = self.profiler
+        profiler.start()
+        self._move(self.actions)
+        profiler.lap("move")
+        obs, collision, target_found, distance_from_target = self._sense(self._all_envs)
+        rewards = self._calculate_reward(collision, target_found, distance_from_target)
+        dones = target_found & (distance_from_target <= dist_threshold)
+        if self.reward_shaping:
+            potential = self._potentials(self._all_envs)
+            potential[dones] = 0.0
+            rewards = (rewards + self.shaping_gamma * potential - self._potential).astype(np.float32)
+            self._potential = potential
+        self.episode_steps += 1
+        if self.max_episode_steps is not None:
+            truncated = ~dones & (self.episode_steps >= self.max_episode_steps)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+        dones = dones | truncated
+
+        infos = [{"target_found": bool(target_found[i]), "collision": bool(collision[i]),
+                  "TimeLimit.truncated": bool(truncated[i])} for i in range(self.num_envs)]
+        profiler.lap("reward")
+        done_envs = np.flatnonzero(dones)
+        if len(done_envs):
+            for i in done_envs:
+                infos[i]["terminal_observation"] = obs[i].copy()
+            self._reset_envs(done_envs)
+            profiler.lap("reset")
+            obs[done_envs], _, _, _ = self._sense(done_envs)
+            if self.reward_shaping:
+                self._potential[done_envs] = 0.0
+                self._potential[done_envs] = self._potentials(done_envs)
+
+        if self.viewer is not None:
+            if dones[self._viewer_index]:
+                self._viewer_start = time.time()
+            self._publish_view()
+            profiler.lap("render")
+
+        if self.profile:
+            step_timings = profiler.last_step_us()  # Batch timings, shared by every env's info
+            for info in infos:
+                info["step_timings_us"] = step_timings
+        return obs, rewards, dones, infos
+
+    # --- Live view ---
+    def attach_viewer(self, index=0, fps=30, title="Vec_Game_Env"):
+        """Shows env index live in a separate viewer process, like Game_Env.attach_viewer."""
+        from Viewer import Viewer
+
+        self.detach_viewer()
+        self.viewer = Viewer(self.size, self.num_rays, fps, f"{title} [{index}]")
+        self._viewer_index = index
+        house = self.houses[index]
+        self.viewer.set_layout(house.wall_array, self.ray_offsets, house.target_size, self.robot_size)
+        self._viewer_start = time.time()
+        self._publish_view()
+
+    def detach_viewer(self):
+        if self.viewer is not None:
+            self.viewer.close()
+            self.viewer = None
+
+    def _publish_view(self):
+        if self.viewer.closed:
+            self.detach_viewer()
+            return
+        i = self._viewer_index
+        self.viewer.publish(self.pos[i], self.angle[i], self.rays[i], self.target_pos[i],
+                            time.time() - self._viewer_start)
+
+    # --- Frames ---
+    def render_frames(self, scale=1.0, out=None):
+        """
+        RGB frames of all envs as one (num_envs, H, W, 3) uint8 array, H = W = round(size * scale),
+        drawn with NumPy (Rasterizer). Without out the array is reused by the next call with the
+        same scale; copy it to keep it.
+        """
+        from Rasterizer import Rasterizer
+
+        rasterizer = self._rasterizers.get(scale)
+        if rasterizer is None:
+            rasterizer = self._rasterizers[scale] = Rasterizer(self.size, scale, cache_size=self.num_envs)
+        backgrounds = [rasterizer.background(house.wall_array, self.target_pos[i], house.target_size)
+                       for i, house in enumerate(self.houses)]
+        return rasterizer.render_batch(backgrounds, self.pos, self.angle, self.ray_offsets, self.rays,
+                                       self.robot_size, out=out)
+
+    # --- Profiling ---
+    def set_profiling(self, enabled):
+        # Stage timers for the whole batch: move, rays, target, obs, reward and reset
+        self.profile = enabled
+        self.profiler = StepProfiler() if enabled else NullProfiler()
+
+    def get_step_stats(self):
+        """Cumulative per-stage timings of the batch, same format as Game_Env.get_step_stats."""
+        return self.profiler.get_stats()
+
+    def reset_step_stats(self):
+        self.profiler.reset()
+
+    def close(self):
+        self.detach_viewer()
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        indices = list(self._get_indices(indices))
+        method = getattr(self, method_name)
+        if "index" in inspect.signature(method).parameters:
+            if len(indices) != 1:
+                raise ValueError(f"{method_name} acts on one env, pass a single index instead of {indices}")
+            method_kwargs.setdefault("index", indices[0])
+        result = method(*method_args, **method_kwargs)
+        return [result for _ in indices]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
@@ -0,0 +1,192 @@
+"""
+Live view of an env, drawn by a separate process so the simulation never waits for the display.
+
+The env side (Viewer) writes compact snapshots into a small memory-mapped file: the robot pose,
+the ray distances and the target every step, the walls only when the layout changes. The viewer
+process (this file run as a script, started by Viewer) reads the latest snapshot at its own
+frame rate and draws it with pygame. Snapshots written between two frames are simply
+overwritten, so a slow display drops frames instead of slowing down the env.
+
+    env = Game_Env(None)
+    env.attach_viewer()  # Also Vec_Game_Env.attach_viewer, or vec_env.env_method("attach_viewer", indices=0)
+
+The viewer is started with subprocess rather than multiprocessing, so envs inside daemonic
+workers (SubprocVecEnv, multiprocessing.Pool) can open one too.
+"""
+import math
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+MAX_WALLS = 256
+
+# Header slots of the snapshot file (float64). The env writes the snapshot under a sequence
+# lock: SEQUENCE is odd while it writes, so the viewer retries instead of drawing a torn state.
+(SEQUENCE, LAYOUT_VERSION, NUM_WALLS, NUM_RAYS, X, Y, ANGLE, TARGET_X, TARGET_Y, TARGET_SIZE, ROBOT_SIZE,
+ ELAPSED, STOP, CLOSED, FRAMES_DRAWN) = range(15)
+HEADER_SIZE = 16
+# Written by the viewer process only: CLOSED (window closed) and FRAMES_DRAWN
+
+_SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None  # RAM-backed where available
+
+
+class Viewer:
+    """
+    Env side of a live view: starts the viewer process and publishes snapshots to it.
+
+    Args:
+        size: House size in pixels (window size).
+        num_rays: Rays per snapshot.
+        fps: Frame rate of the viewer process.
+        title: Window title.
+    """
+
+    def __init__(self, size=512, num_rays=17, fps=30, title="Game_Env"):
+        self.size = size
+        self.num_rays = num_rays
+        self.published = 0  # Snapshots written
+        self._layout_version = 0
+        length = HEADER_SIZE + 2 * num_rays + 4 * MAX_WALLS
+        fd, self.path = tempfile.mkstemp(prefix="viewer_", suffix=".bin", dir=_SHARED_DIR)
+        os.close(fd)
+        self._values = np.asarray(np.memmap(self.path, dtype=np.float64, mode="w+", shape=(length,)))
+        self._offsets = self._values[HEADER_SIZE:HEADER_SIZE + num_rays]
+        self._rays = self._values[HEADER_SIZE + num_rays:HEADER_SIZE + 2 * num_rays]
+        self._walls = self._values[HEADER_SIZE + 2 * num_rays:].reshape(MAX_WALLS, 4)
+        self._values[NUM_RAYS] = num_rays
+        self._process = subprocess.Popen([sys.executable, os.path.abspath(__file__), self.path, str(size),
+                                          str(num_rays), str(fps), title, str(os.getpid())],
+                                         stdin=subprocess.DEVNULL,
+                                         env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+
+    @property
+    def closed(self):
+        """True once the window was closed or the viewer process ended (checked every 256 snapshots)."""
+        if self._values[CLOSED] != 0:
+            return True
+        return self.published % 256 == 0 and self._process.poll() is not None
+
+    @property
+    def frames_drawn(self):
+        return int(self._values[FRAMES_DRAWN])
+
+    def set_layout(self, walls, ray_offsets, target_size, robot_size):
+        """
+        Sends a new layout: walls (W, 4) as (left, top, width, height), the ray angles relative
+        to the heading (degrees) and the target and robot radii.
+        """
+        if len(walls) > MAX_WALLS:
+            raise ValueError(f"The viewer draws at most {MAX_WALLS} walls, the layout has {len(walls)}")
+        values = self._values
+        values[SEQUENCE] += 1
+        self._layout_version += 1
+        self._walls[:len(walls)] = walls
+        self._offsets[:] = ray_offsets
+        values[NUM_WALLS] = len(walls)
+        values[TARGET_SIZE] = target_size
+        values[ROBOT_SIZE] = robot_size
+        values[LAYOUT_VERSION] = self._layout_version
+        values[SEQUENCE] += 1
+
+    def publish(self, pos, angle, rays, target_pos, elapsed=0.0):
+        """Writes the latest pose, ray distances and target; the viewer draws whichever is latest."""
+        values = self._values
+        values[SEQUENCE] += 1
+        values[X] = pos[0]
+        values[Y] = pos[1]
+        values[ANGLE] = angle
+        values[TARGET_X] = target_pos[0]
+        values[TARGET_Y] = target_pos[1]
+        values[ELAPSED] = elapsed
+        self._rays[:] = rays
+        values[SEQUENCE] += 1
+        self.published += 1
+
+    def close(self, timeout=2.0):
+        self._values[STOP] = 1
+        try:
+            self._process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:  # Already removed by the viewer process
+            pass
+
+
+def _read_snapshot(values):
+    # Copy of the snapshot between two writes, None while the env is writing
+    sequence = values[SEQUENCE]
+    if sequence % 2:
+        return None
+    snapshot = values.copy()
+    return snapshot if values[SEQUENCE] == sequence else None
+
+
+def run_viewer(path, size, num_rays, fps, title, parent_pid):
+    """Viewer process: draws the latest snapshot of path at fps until stopped or the window closes."""
+    import pygame
+
+    values = np.asarray(np.memmap(path, dtype=np.float64, mode="r+"))
+    pygame.init()
+    pygame.display.set_caption(title)
+    window = pygame.display.set_mode((size, size))
+    font = pygame.font.SysFont(None, 30)
+    clock = pygame.time.Clock()
+    static = None  # Walls, redrawn only when the layout version changes
+    layout_version = 0
+    last_sequence = -1
+    try:
+        while values[STOP] == 0 and os.getppid() == parent_pid:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                values[CLOSED] = 1
+                break
+            snapshot = _read_snapshot(values)
+            if snapshot is None or snapshot[SEQUENCE] == last_sequence or snapshot[LAYOUT_VERSION] == 0:
+                clock.tick(fps)
+                continue
+            dropped = max(int(snapshot[SEQUENCE] - last_sequence) // 2 - 1, 0) if last_sequence >= 0 else 0
+            last_sequence = snapshot[SEQUENCE]
+
+            if snapshot[LAYOUT_VERSION] != layout_version:
+                layout_version = snapshot[LAYOUT_VERSION]
+                walls = snapshot[HEADER_SIZE + 2 * num_rays:].reshape(MAX_WALLS, 4)[:int(snapshot[NUM_WALLS])]
+                static = pygame.Surface((size, size))
+                static.fill((255, 255, 255))  # white background
+                for left, top, width, height in walls:
+                    pygame.draw.rect(static, (0, 0, 0), (int(left), int(top), int(width), int(height)))
+            window.blit(static, (0, 0))
+
+            pos = snapshot[[X, Y]]
+            pygame.draw.circle(window, (0, 255, 0), snapshot[[TARGET_X, TARGET_Y]].astype(int),
+                               int(snapshot[TARGET_SIZE]))
+            ray_angles = np.radians(snapshot[ANGLE] + snapshot[HEADER_SIZE:HEADER_SIZE + num_rays])
+            rays = snapshot[HEADER_SIZE + num_rays:HEADER_SIZE + 2 * num_rays]
+            endpoints = pos + rays[:, None] * np.stack((np.cos(ray_angles), np.sin(ray_angles)), axis=-1)
+            for end_point in endpoints:
+                pygame.draw.line(window, (255, 0, 0), pos, end_point, 1)  # Red rays
+            robot_size = snapshot[ROBOT_SIZE]
+            pygame.draw.circle(window, (0, 0, 255), pos.astype(int), int(robot_size))  # Blue robot
+            heading = math.radians(snapshot[ANGLE])
+            pygame.draw.line(window, (255, 255, 255), pos,
+                             pos + np.array([math.cos(heading), math.sin(heading)]) * robot_size, 3)
+
+            text = f"Time: {snapshot[ELAPSED]:.2f}s  skipped {dropped}"
+            window.blit(font.render(text, True, (0, 0, 0)), (10, 10))
+            pygame.display.flip()
+            values[FRAMES_DRAWN] += 1
+            clock.tick(fps)
+    finally:
+        pygame.quit()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    run_viewer(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]), sys.argv[5], int(sys.argv[6]))
@@ -0,0 +1,95 @@
+"""
+Behavior-cloning warm start: records SimpleSearch demonstrations, then trains A2C (the
+main.py setup, with per-episode layouts) from scratch and from a BC-initialized policy and
+evaluates both at several points, next to SimpleSearch itself (slow).
+
+Run from the repository root:
+    python benchmarks/bench_behavior_cloning.py
+    python benchmarks/bench_behavior_cloning.py --rl-steps 200000 --eval-episodes 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import VecNormalize
+
+from Demonstrations import record_simple_search
+from Evaluation import evaluate, summarize
+from Game_Env import Game_Env
+from Policy_A2C import Policy_A2C
+
+NUM_ENVS = 5
+ENT_COEF = 0.015
+EVAL_MAX_STEPS = 1000
+
+
+def make_policy(demonstrations=None, epochs=3):
+    vec_env = make_vec_env(lambda: Game_Env(None, ran_house=False, resample_layout=True), n_envs=NUM_ENVS, seed=0)
+    normalized_vec_env = VecNormalize(vec_env, norm_obs=True, norm_reward=True, clip_obs=10., clip_reward=10.)
+    policy = Policy_A2C(normalized_vec_env, ENT_COEF)
+    policy.model.verbose = 0
+    if demonstrations is not None:
+        start = time.perf_counter()
+        loss, accuracy = policy.pretrain(demonstrations, epochs=epochs)[-1]
+        print(f"  behavior cloning: {epochs} epochs in {time.perf_counter() - start:.1f} s, "
+              f"loss {loss:.3f}, action accuracy {accuracy * 100:.1f}%")
+    return policy, normalized_vec_env
+
+
+def success_rate(tmp_dir, policy, normalized_vec_env, episodes):
+    model_path = os.path.join(tmp_dir, "model.zip")
+    vec_normalize_path = os.path.join(tmp_dir, "vec_normalize.pkl")
+    policy.save_model(model_path)
+    normalized_vec_env.save(vec_normalize_path)
+    results = evaluate("a2c", range(10000, 10000 + episodes), workers=1, model_path=model_path,
+                       vec_normalize_path=vec_normalize_path, env_kwargs=dict(ran_house=False),
+                       max_steps=EVAL_MAX_STEPS)
+    return summarize(results)
+
+
+def report(name, steps, summary):
+    low, high = summary["success_rate_ci"]
+    print(f"  {name:<12} {steps:7d} env steps: success {summary['success_rate'] * 100:5.1f}% "
+          f"[{low * 100:4.1f}, {high * 100:4.1f}], SPL {summary['spl']:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--demo-steps", type=int, default=300000)
+    parser.add_argument("--rl-steps", type=int, default=100000)
+    parser.add_argument("--evaluations", type=int, default=4, help="Evaluation points over the RL steps")
+    parser.add_argument("--eval-episodes", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        demonstrations = os.path.join(tmp_dir, "demos")
+        recorded = record_simple_search(demonstrations, args.demo_steps)
+        print(f"recorded {recorded['steps']} SimpleSearch steps ({recorded['episodes']} episodes) "
+              f"in {recorded['seconds']:.1f} s")
+        simple = summarize(evaluate("simple", range(10000, 10000 + args.eval_episodes), workers=1,
+                                    env_kwargs=dict(ran_house=False), max_steps=EVAL_MAX_STEPS))
+        report("SimpleSearch", 0, simple)
+
+        for name, demos in (("scratch", None), ("BC warm", demonstrations)):
+            print(f"{name}:")
+            policy, normalized_vec_env = make_policy(demos)
+            steps = 0
+            if demos is not None:
+                report(name, steps, success_rate(tmp_dir, policy, normalized_vec_env, args.eval_episodes))
+            for _ in range(args.evaluations):
+                chunk = args.rl_steps // args.evaluations
+                start = time.perf_counter()
+                policy.model.learn(total_timesteps=chunk, reset_num_timesteps=False)
+                steps += chunk
+                summary = success_rate(tmp_dir, policy, normalized_vec_env, args.eval_episodes)
+                report(name, steps, summary)
+                print(f"  {'':<12} ({chunk / (time.perf_counter() - start):.0f} training steps/s incl. evaluation)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Checkpointing check: time the training thread spends per AsyncCheckpointCallback checkpoint
+against a synchronous save of model and VecNormalize stats, rotation to the newest K files,
+and resuming a fresh model from the latest checkpoint.
+
+Run from the repository root:
+    python benchmarks/bench_checkpointing.py
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import torch as th
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
+from Game_Env import Game_Env
+from Policy_A2C import Policy_A2C
+from TrainingCallbacks import (AsyncCheckpointCallback, capture_state, latest_checkpoint, load_checkpoint,
+                               restore_checkpoint)
+
+NUM_ENVS = 5
+SAVE_FREQ = 1000
+TRAIN_STEPS = 10000
+KEEP_LAST = 2
+
+
+def make_policy():
+    vec_env = DummyVecEnv([lambda i=i: Game_Env(None, ran_house=False, layout_seed=i) for i in range(NUM_ENVS)])
+    vec_env.seed(0)
+    normalized_vec_env = VecNormalize(vec_env, clip_obs=10., clip_reward=10.)
+    policy = Policy_A2C(normalized_vec_env)
+    policy.model.verbose = 0
+    return policy, normalized_vec_env
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = os.path.join(tmp_dir, "checkpoints")
+        policy, normalized_vec_env = make_policy()
+        callback = AsyncCheckpointCallback(directory, SAVE_FREQ, normalized_vec_env, keep_last=KEEP_LAST)
+        start = time.perf_counter()
+        policy.model.learn(TRAIN_STEPS, callback=callback)
+        elapsed = time.perf_counter() - start
+
+        sync_seconds = []
+        for i in range(5):
+            sync_start = time.perf_counter()
+            policy.save_model(os.path.join(tmp_dir, "sync_model"))
+            normalized_vec_env.save(os.path.join(tmp_dir, "sync_vec_normalize.pkl"))
+            th.save(capture_state(policy.model, normalized_vec_env), os.path.join(tmp_dir, "sync_state.pt"))
+            sync_seconds.append(time.perf_counter() - sync_start)
+        print(f"{len(callback.snapshot_seconds)} checkpoints in {elapsed:.1f} s of training: "
+              f"{np.mean(callback.snapshot_seconds) * 1e3:.2f} ms on the training thread per checkpoint, "
+              f"synchronous save {np.mean(sync_seconds) * 1e3:.2f} ms")
+
+        files = sorted(os.listdir(directory))
+        if len(files) != KEEP_LAST or glob.glob(os.path.join(directory, "*.tmp")):
+            raise SystemExit(f"Expected the newest {KEEP_LAST} checkpoints, found {files}")
+        print(f"kept {files}")
+
+        state = load_checkpoint(latest_checkpoint(directory))
+        resumed, resumed_vec_env = make_policy()
+        restore_checkpoint(resumed.model, state, resumed_vec_env)
+        expected = policy.model.get_parameters()
+        restored = resumed.model.get_parameters()
+        same_weights = all(th.equal(expected["policy"][key], restored["policy"][key]) for key in expected["policy"])
+        same_stats = np.array_equal(resumed_vec_env.obs_rms.mean, normalized_vec_env.obs_rms.mean)
+        if not (same_weights and same_stats and resumed.model.num_timesteps == policy.model.num_timesteps):
+            raise SystemExit("Resumed model differs from the checkpointed one")
+        resumed.model.learn(2000, reset_num_timesteps=False)
+        print(f"resumed at {state['num_timesteps']} steps, continued to {resumed.model.num_timesteps}")
+
+
+if __name__ == "__main__":
+    main()
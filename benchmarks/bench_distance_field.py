@@ -0,0 +1,91 @@
+"""
+Baked clearance fields (Geometry.DistanceField) against exact geometry: bake and cache cost,
+collision and ray parity (both must be exact), and per-step cost.
+
+Run from the repository root:
+    python benchmarks/bench_distance_field.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Geometry
+from new_House import House
+from Robot import Robot
+
+NUM_POSES = 2000
+WIDE_FANS = [97, 361]
+
+
+def random_poses(house, rng, count):
+    poses = []
+    while len(poses) < count:
+        pos = rng.uniform(house.wall_thickness, house.size - house.wall_thickness, size=2)
+        if not house.is_inside_wall(pos):
+            poses.append((pos, rng.uniform(-180.0, 180.0)))
+    return poses
+
+
+def time_steps(robot, walls, poses):
+    robot.reuse_rays = False
+    start = time.perf_counter()
+    for pos, angle in poses:
+        robot.pos = pos
+        robot.angle = angle
+        robot.check_collision_walls(walls)
+        robot.cast_rays(walls)
+    return (time.perf_counter() - start) / len(poses) * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    house = House(512, [40, 246], randomize_house=False, bake_distance_field=True)
+    first_bake = time.perf_counter() - start
+    start = time.perf_counter()
+    shared = [House(512, [40, 246], randomize_house=False, bake_distance_field=True) for _ in range(20)]
+    per_house = (time.perf_counter() - start) / len(shared)
+    print(f"bake {house.layout_name}: {first_bake * 1e3:.1f} ms, later houses: {per_house * 1e3:.2f} ms each, "
+          f"{len({id(h.distance_field) for h in shared + [house]})} distinct fields for 3 fixed layouts")
+
+    field = house.distance_field
+    robot = Robot(start_pos=[40, 246], start_angle=0.0, ray_length=house.size * 0.7)
+    poses = random_poses(house, rng, NUM_POSES)
+
+    collision_mismatches = 0
+    worst_ray = 0.0
+    for pos, angle in poses:
+        probe = pos + rng.uniform(-12, 12, size=2)
+        exact = bool(Geometry.boxes_hit_walls(Geometry.robot_boxes(probe, robot.size), house.wall_array))
+        collision_mismatches += exact != field.robot_collides(probe, robot.size)
+        robot.pos = pos
+        robot.angle = angle
+        directions = Geometry.ray_directions(robot.get_ray_angles())
+        worst_ray = max(worst_ray, float(np.max(np.abs(
+            field.cast_rays(pos, directions, robot.ray_length) -
+            Geometry.cast_rays(pos, directions, house.wall_array, robot.ray_length)))))
+    print(f"collision mismatches: {collision_mismatches} / {len(poses)}, max ray error: {worst_ray:.2e} px")
+    if collision_mismatches or worst_ray > 1e-9:
+        raise SystemExit("Distance field differs from the exact tests")
+
+    print(f"per step (collision + {robot.num_rays} rays), {len(house.walls)} walls:")
+    print(f"  brute force:    {time_steps(robot, house.wall_array, poses):7.1f} us")
+    print(f"  wall grid:      {time_steps(robot, house.wall_grid, poses):7.1f} us")
+    print(f"  distance field: {time_steps(robot, field, poses):7.1f} us")
+
+    # Wider fans: ray cost dominates, the clearance lookup only saves the collision test
+    for num_rays in WIDE_FANS:
+        wide = Robot(start_pos=[40, 246], start_angle=0.0, num_rays=num_rays, fov=360.0,
+                     ray_length=house.size * 0.7)
+        print(f"{num_rays} rays over 360 deg: brute force {time_steps(wide, house.wall_array, poses[:300]):7.1f} us, "
+              f"wall grid {time_steps(wide, house.wall_grid, poses[:300]):7.1f} us, "
+              f"distance field {time_steps(wide, field, poses[:300]):7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Geodesic field check: build and lookup cost per layout, distances against the straight line,
+shaped rewards of Vec_Game_Env against Game_Env, and SPL of SimpleSearch vs random actions.
+
+With --train, A2C is also trained with and without reward shaping for --steps steps each and
+the success rate / SPL of the trained policies is reported (slow).
+
+Run from the repository root:
+    python benchmarks/bench_geodesic.py
+    python benchmarks/bench_geodesic.py --train --steps 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+import Geometry
+from Game_Env import Game_Env
+from Metrics import spl
+from new_House import House
+from SimpleSearch import SimpleSearch
+from Vec_Game_Env import Vec_Game_Env
+
+SIZE = 512
+START = [40, SIZE // 2 - 10]
+NUM_LAYOUTS = 50
+EVAL_EPISODES = 20
+MAX_STEPS = 3000
+
+
+def field_costs():
+    for num_random_walls in (0, 10, 40):
+        rng = np.random.default_rng(0)
+        houses = [House(SIZE, START, True, num_random_walls, rng=rng) for _ in range(NUM_LAYOUTS)]
+        start = time.perf_counter()
+        fields = [Geometry.GeodesicField(house.reachable_area, house.target_pos, house.robot_size)
+                  for house in houses]
+        build_ms = (time.perf_counter() - start) / NUM_LAYOUTS * 1e3
+        points = rng.uniform(0, SIZE, size=(1000, 2))
+        start = time.perf_counter()
+        for point in points:
+            fields[0].distance_at(point)
+        lookup_us = (time.perf_counter() - start) / len(points) * 1e6
+
+        ratios = []
+        for house, field in zip(houses, fields):
+            straight = np.hypot(*(house.target_pos - house.robot_start_pos))
+            geodesic = field.distance_at(house.robot_start_pos)
+            if not np.isfinite(geodesic):
+                raise SystemExit("Robot start cannot reach the target")
+            ratios.append(geodesic / straight)
+        print(f"{num_random_walls:2d} random walls: build {build_ms:5.2f} ms, lookup {lookup_us:4.2f} us, "
+              f"geodesic / straight line at start: min {min(ratios):.3f}, median {np.median(ratios):.3f}, "
+              f"max {max(ratios):.3f}")
+
+
+def check_shaping_parity(steps=3000):
+    envs = [Game_Env(None, ran_house=bool(i % 2), reward_shaping=True) for i in range(4)]
+    reference = DummyVecEnv([lambda env=env: env for env in envs])
+    batched = Vec_Game_Env(len(envs), houses=[env.house for env in envs], reward_shaping=True)
+    reference.reset()
+    batched.reset()
+    rng = np.random.default_rng(0)
+    worst = 0.0
+    for _ in range(steps):
+        actions = rng.integers(0, 3, size=len(envs))
+        _, expected_rewards, _, _ = reference.step(actions)
+        _, rewards, _, _ = batched.step(actions)
+        worst = max(worst, float(np.max(np.abs(expected_rewards - rewards))))
+    print(f"shaped rewards, Vec_Game_Env vs Game_Env over {steps} steps: max |diff| = {worst:.2e}")
+    if worst > 1e-3:
+        raise SystemExit("Shaped rewards differ")
+
+
+def evaluate(predict, episodes=EVAL_EPISODES, seed=0):
+    """Success rate and SPL of predict(obs) -> action over episodes with resampled layouts."""
+    env = Game_Env(None, ran_house=True, geodesic=True, resample_layout=True)
+    env.reset(seed=seed)
+    successes, shortest, taken = [], [], []
+    for _ in range(episodes):
+        obs, info = env.reset()
+        terminated = False
+        for _ in range(MAX_STEPS):
+            obs, _, terminated, _, info = env.step(predict(obs))
+            if terminated:
+                break
+        successes.append(terminated)
+        shortest.append(info["shortest_path_length"])
+        taken.append(info["path_length"])
+    return float(np.mean(successes)), spl(successes, shortest, taken)
+
+
+def train_and_evaluate(steps, reward_shaping):
+    from stable_baselines3 import A2C
+
+    vec_env = DummyVecEnv([lambda: Game_Env(None, ran_house=True, resample_layout=True, reward_shaping=reward_shaping)
+                           for _ in range(5)])
+    vec_env.seed(0)
+    model = A2C("MlpPolicy", vec_env, ent_coef=0.015, policy_kwargs=dict(net_arch=[64, 128, 64]), seed=0)
+    model.learn(total_timesteps=steps)
+    return evaluate(lambda obs: int(model.predict(obs, deterministic=True)[0]), seed=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--train", action="store_true", help="Compare A2C trained with and without shaping")
+    parser.add_argument("--steps", type=int, default=100000, help="Training steps per A2C run")
+    args = parser.parse_args()
+
+    field_costs()
+    check_shaping_parity()
+
+    spaces_env = Game_Env(None)
+    agent = SimpleSearch(spaces_env.observation_space, spaces_env.action_space)
+    rng = np.random.default_rng(0)
+    for name, predict in (("SimpleSearch", lambda obs: agent.predict(obs)[0]),
+                          ("random actions", lambda obs: int(rng.integers(0, 3)))):
+        success_rate, score = evaluate(predict)
+        print(f"{name:<16} success {success_rate * 100:5.1f}%, SPL {score:.3f} ({EVAL_EPISODES} episodes)")
+
+    if args.train:
+        for reward_shaping in (False, True):
+            success_rate, score = train_and_evaluate(args.steps, reward_shaping)
+            print(f"A2C {args.steps} steps, shaping {'on ' if reward_shaping else 'off'}: "
+                  f"success {success_rate * 100:5.1f}%, SPL {score:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Layout corpus check: generation rate and file size, House construction from the memory-mapped
+corpus vs generating the layout, zero-copy loading and seed reproducibility.
+
+Run from the repository root:
+    python benchmarks/bench_layout_corpus.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Game_Env import Game_Env
+from LayoutCorpus import LayoutCorpus, generate_corpus, validate_layout
+from new_House import House
+
+NUM_LAYOUTS = 2000
+NUM_HOUSES = 2000
+SIZE = 512
+START = [40, SIZE // 2 - 10]
+
+
+def houses_per_sec(make_house):
+    start = time.perf_counter()
+    for i in range(NUM_HOUSES):
+        make_house(i)
+    elapsed = time.perf_counter() - start
+    return NUM_HOUSES / elapsed, elapsed / NUM_HOUSES * 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "layouts.bin")
+        report = generate_corpus(path, NUM_LAYOUTS, size=SIZE, num_random_walls=10, base_seed=1000)
+        print(f"generated {report['layouts']} layouts ({len(report['skipped'])} skipped) in {report['seconds']:.2f} s, "
+              f"{report['bytes'] / 1024:.0f} KiB, {report['bytes'] / report['layouts']:.0f} bytes per layout")
+        corpus = LayoutCorpus(path)
+
+        invalid = [k for k in range(len(corpus)) if validate_layout(corpus.walls(k), SIZE, START)]
+        if invalid:
+            raise SystemExit(f"Invalid layouts in corpus: {invalid[:10]}")
+
+        rng = np.random.default_rng(0)
+        generated_rate, generated_us = houses_per_sec(lambda i: House(SIZE, START, True, 10, rng=rng))
+        loaded_rate, loaded_us = houses_per_sec(
+            lambda i: House(SIZE, START, corpus=corpus, layout_index=i % len(corpus), rng=rng))
+        print(f"House from generator: {generated_rate:8.0f} /s ({generated_us:6.1f} us)")
+        print(f"House from corpus:    {loaded_rate:8.0f} /s ({loaded_us:6.1f} us), {generated_us / loaded_us:.1f}x faster")
+
+        house = House(SIZE, START, corpus=corpus, layout_index=5)
+        if not (np.shares_memory(house.wall_array, corpus.wall_data) and house.wall_array.base is not None):
+            raise SystemExit("Corpus walls were copied")
+        if house.wall_array.flags.writeable:
+            raise SystemExit("Corpus walls are writeable")
+        print("corpus walls are loaded as read-only views (no copy)")
+
+        # Same seed -> same layout and target, from the corpus and from the generator
+        seed = int(corpus.seeds[7])
+        envs = [Game_Env(None, corpus=path, layout_seed=seed) for _ in range(2)]
+        generated = [Game_Env(None, layout_seed=seed) for _ in range(2)]
+        for a, b in (envs, generated):
+            if not (np.array_equal(a.house.wall_array, b.house.wall_array)
+                    and np.array_equal(a.house.target_pos, b.house.target_pos)):
+                raise SystemExit("Layouts are not reproducible by seed")
+        if not np.array_equal(envs[0].house.wall_array, generated[0].house.wall_array):
+            raise SystemExit("Corpus layout differs from the generated layout with the same seed")
+        print(f"seed {seed}: corpus and generator give the same layout, targets reproducible")
+
+
+if __name__ == "__main__":
+    main()
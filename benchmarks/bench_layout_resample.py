@@ -0,0 +1,89 @@
+"""
+Per-reset latency of Game_Env with per-episode layouts: plain reset, resampling from the
+generator (random and fixed layouts), from a prebuilt layout pool and from a layout corpus,
+compared with building a new env. Also checks that a resampled layout gives the same
+observations as a fresh env built on that layout.
+
+Run from the repository root:
+    python benchmarks/bench_layout_resample.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Game_Env import Game_Env
+from LayoutCorpus import generate_corpus
+
+NUM_RESETS = 2000
+
+
+def reset_latencies(env):
+    env.reset(seed=0)
+    env.set_profiling(True)  # The "reset" stage holds the layout swap, the rest is sensing
+    latencies = np.empty(NUM_RESETS)
+    for i in range(NUM_RESETS):
+        start = time.perf_counter_ns()
+        env.reset()
+        latencies[i] = time.perf_counter_ns() - start
+    return latencies / 1e3, env.get_step_stats()["reset"]["mean_us"]
+
+
+def report(name, latencies_us, layout_us=None):
+    p50, p90 = np.percentile(latencies_us, [50, 90])
+    layout_text = f"   layout swap {layout_us:7.1f} us" if layout_us is not None else ""
+    print(f"{name:<42} reset p50 {p50:7.1f} us   p90 {p90:7.1f} us{layout_text}")
+
+
+def check_parity(env, steps=200):
+    # A resampled env must behave like a fresh env constructed on the same layout and target
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        obs, _ = env.reset()
+        fresh = Game_Env(None, ran_house=True, layout_seed=0)
+        fresh.house.set_layout(env.house.get_layout())
+        fresh.house.target_pos = env.house.target_pos.copy()
+        fresh_obs, _ = fresh.reset()
+        if not np.array_equal(obs, fresh_obs):
+            raise SystemExit("Resampled layout gives different observations than a fresh env")
+        for action in rng.integers(0, 3, size=steps):
+            obs, reward, terminated, _, _ = env.step(int(action))
+            fresh_obs, fresh_reward, _, _, _ = fresh.step(int(action))
+            if not np.array_equal(obs, fresh_obs) or reward != fresh_reward:
+                raise SystemExit("Resampled layout gives different steps than a fresh env")
+            if terminated:
+                break
+
+
+def main():
+    report("reset, same layout", *reset_latencies(Game_Env(None, ran_house=True)))
+    for walls in (10, 40):
+        report(f"resample, generator ({walls} random walls)",
+               *reset_latencies(Game_Env(None, ran_house=True, num_random_walls=walls, resample_layout=True)))
+    report("resample, generator (fixed layouts)", *reset_latencies(Game_Env(None, ran_house=False, resample_layout=True)))
+    report("resample, fixed layouts + distance field",
+           *reset_latencies(Game_Env(None, ran_house=False, distance_field=True, resample_layout=True)))
+    report("resample, pool of 64 layouts",
+           *reset_latencies(Game_Env(None, ran_house=True, resample_layout=True, layout_pool_size=64)))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "layouts.bin")
+        generate_corpus(path, 1000)
+        report("resample, corpus of 1000 layouts", *reset_latencies(Game_Env(None, corpus=path, resample_layout=True)))
+
+    latencies = np.empty(200)
+    for i in range(len(latencies)):
+        start = time.perf_counter_ns()
+        Game_Env(None, ran_house=True).reset()
+        latencies[i] = time.perf_counter_ns() - start
+    report("new Game_Env + reset", latencies / 1e3)
+
+    check_parity(Game_Env(None, ran_house=True, resample_layout=True))
+    print("resampled layouts match fresh envs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Lidar mode check: Game_Env and Vec_Game_Env step cost as the range sensor grows from the
+default 17 rays over 60 degrees to full 360 degree scans of up to 1440 rays, against casting
+the same rays one at a time in a Python loop. Also checks Game_Env / Vec_Game_Env parity for a
+360 degree scan (target detection wraps around behind the robot), that angular noise is
+reproducible from the reset seed, and that SimpleSearch (with random actions mixed in) still
+finds targets with the wider fans.
+
+Run from the repository root:
+    python benchmarks/bench_lidar.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+from Game_Env import Game_Env
+from SimpleSearch import SimpleSearch
+from Vec_Game_Env import Vec_Game_Env
+
+FANS = [(17, 60.0), (90, 360.0), (360, 360.0), (720, 360.0), (1440, 360.0)]
+STEPS = 2000
+LOOP_CASTS = 50
+PARITY_ENVS = 4
+PARITY_STEPS = 1500
+VEC_ENVS = 64
+VEC_STEPS = 50
+SEARCH_EPISODES = 40
+SEARCH_MAX_STEPS = 3000
+
+
+def agent_for(env):
+    return SimpleSearch(env.observation_space, env.action_space, ray_offsets=env.robot.get_ray_offsets())
+
+
+def step_us(env, reuse_rays=True, steps=STEPS):
+    # Mean env.step time over the same random actions for every fan
+    env.robot.reuse_rays = reuse_rays
+    env.reset(seed=0)
+    elapsed = 0.0
+    for action in np.random.default_rng(0).integers(0, 3, size=steps):
+        start = time.perf_counter()
+        _, _, terminated, truncated, _ = env.step(int(action))
+        elapsed += time.perf_counter() - start
+        if terminated or truncated:
+            env.reset()
+    env.robot.reuse_rays = True
+    return elapsed / steps * 1e6
+
+
+def per_ray_loop_us(env, casts=LOOP_CASTS):
+    # The same rays cast one at a time from Python, as a per-ray sensor loop would
+    robot, walls = env.robot, env.house.wall_index
+    directions = robot.get_ray_directions()
+    start = time.perf_counter()
+    for _ in range(casts):
+        for direction in directions:
+            walls.cast_rays(robot.pos, direction[None], robot.ray_length)
+    return (time.perf_counter() - start) / casts * 1e6
+
+
+def batched_cast_us(env, casts=LOOP_CASTS):
+    robot, walls = env.robot, env.house.wall_index
+    robot.reuse_rays = False
+    start = time.perf_counter()
+    for _ in range(casts):
+        robot.cast_rays(walls)
+    robot.reuse_rays = True
+    return (time.perf_counter() - start) / casts * 1e6
+
+
+def check_parity(num_rays, fov):
+    envs = [Game_Env(None, ran_house=bool(i % 2), num_rays=num_rays, fov=fov) for i in range(PARITY_ENVS)]
+    reference = DummyVecEnv([lambda env=env: env for env in envs])
+    batched = Vec_Game_Env(PARITY_ENVS, houses=[env.house for env in envs], num_rays=num_rays, fov=fov)
+    agent = SimpleSearch(reference.observation_space, reference.action_space, ray_offsets=batched.ray_offsets)
+    rng = np.random.default_rng(0)
+    expected_obs, obs = reference.reset(), batched.reset()
+    worst_obs, mismatches, found = 0.0, 0, 0
+    for _ in range(PARITY_STEPS):
+        worst_obs = max(worst_obs, float(np.max(np.abs(expected_obs - obs))))
+        found += int(np.sum(obs[:, num_rays]))
+        actions, _ = agent.predict(expected_obs)
+        explore = rng.random(PARITY_ENVS) < 0.3
+        actions[explore] = rng.integers(0, 3, size=int(explore.sum()))
+        expected_obs, expected_rewards, expected_dones, _ = reference.step(actions)
+        obs, rewards, dones, _ = batched.step(actions)
+        mismatches += int(np.sum(expected_rewards != rewards) + np.sum(expected_dones != dones))
+    return worst_obs, mismatches, found
+
+
+def noisy_rollout(seed, steps=200):
+    env = Game_Env(None, num_rays=360, fov=360.0, ray_noise=0.5, layout_seed=0)
+    obs, _ = env.reset(seed=seed)
+    observations = [obs.copy()]
+    for action in np.random.default_rng(0).integers(0, 3, size=steps):
+        obs, *_ = env.step(int(action))
+        observations.append(obs.copy())
+    return np.array(observations)
+
+
+def search_success(num_rays, fov):
+    # SimpleSearch with 30% random actions (alone it can loop forever), same layouts for every fan
+    env = Game_Env(None, num_rays=num_rays, fov=fov, layout_seed=0, resample_layout=True)
+    agent = agent_for(env)
+    rng = np.random.default_rng(0)
+    successes, steps = 0, []
+    for episode in range(SEARCH_EPISODES):
+        obs, _ = env.reset(seed=episode)
+        for step in range(SEARCH_MAX_STEPS):
+            action = agent.predict(obs)[0] if rng.random() > 0.3 else int(rng.integers(0, 3))
+            obs, _, terminated, _, _ = env.step(action)
+            if terminated:
+                successes += 1
+                steps.append(step + 1)
+                break
+    return successes, np.mean(steps) if steps else float("nan")
+
+
+def vec_steps_per_second(num_rays, fov):
+    vec_env = Vec_Game_Env(VEC_ENVS, ran_house=False, num_rays=num_rays, fov=fov)
+    vec_env.reset()
+    actions = np.random.default_rng(0).integers(0, 3, size=(VEC_STEPS, VEC_ENVS))
+    start = time.perf_counter()
+    for step_actions in actions:
+        vec_env.step(step_actions)
+    return VEC_STEPS * VEC_ENVS / (time.perf_counter() - start)
+
+
+def main():
+    worst_obs, mismatches, found = check_parity(360, 360.0)
+    print(f"parity, 360 rays over 360 deg, {PARITY_STEPS} steps x {PARITY_ENVS} envs ({found} target sightings): "
+          f"max |obs diff| = {worst_obs:.2e}, reward/done mismatches = {mismatches}")
+    if worst_obs > 1e-4 or mismatches:
+        raise SystemExit("Parity check FAILED")
+
+    same, other = noisy_rollout(3), noisy_rollout(3)
+    if not np.array_equal(same, other) or np.array_equal(same, noisy_rollout(4)):
+        raise SystemExit("Angular noise is not reproducible from the reset seed")
+    print("ray_noise=0.5: same reset seed gives the same observations, another seed different ones")
+
+    base_us = None
+    print(f"{'fan':>16} {'Game_Env step':>14} {'vs 17 rays':>11} {'no reuse':>10} {'batched cast':>13} "
+          f"{'per-ray loop':>13} {'Vec_Game_Env x' + str(VEC_ENVS):>20}")
+    for num_rays, fov in FANS:
+        env = Game_Env(None, num_rays=num_rays, fov=fov, layout_seed=0)
+        us = step_us(env)
+        base_us = base_us or us
+        no_reuse_us = step_us(env, reuse_rays=False)
+        env.reset(seed=0)
+        print(f"{num_rays:5d} rays {fov:5.0f} deg {us:11.1f} us {us / base_us:10.1f}x {no_reuse_us:7.1f} us "
+              f"{batched_cast_us(env):10.1f} us {per_ray_loop_us(env):10.1f} us "
+              f"{vec_steps_per_second(num_rays, fov):13.0f} steps/s")
+    noisy = step_us(Game_Env(None, num_rays=360, fov=360.0, ray_noise=0.5, layout_seed=0))
+    print(f"  360 rays, ray_noise=0.5 {noisy:7.1f} us/step (noisy rays are never reused)")
+
+    for num_rays, fov in FANS[:3]:
+        successes, mean_steps = search_success(num_rays, fov)
+        print(f"SimpleSearch, {num_rays:4d} rays over {fov:3.0f} deg: {successes}/{SEARCH_EPISODES} targets found, "
+              f"{mean_steps:.0f} steps on average")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+NumpyPolicy check: exports an A2C model (briefly trained here) with the VecNormalize stats of
+p_4_vec_normalize.pkl, compares its deterministic actions with SB3's on rollout and random
+observations, and measures per-call latency and cold start (imports, loading, first action;
+time and peak RSS of a fresh process) against A2C.load + VecNormalize.load.
+
+Run from the repository root:
+    python benchmarks/bench_numpy_policy.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stable_baselines3 import A2C
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
+from Game_Env import Game_Env
+from NumpyPolicy import NumpyPolicy, export_policy
+
+VEC_NORMALIZE = os.path.join(ROOT, "p_4_vec_normalize.pkl")
+COLD_START = {
+    "NumpyPolicy": """
+from NumpyPolicy import NumpyPolicy
+policy = NumpyPolicy(POLICY)
+policy.predict(OBS)
+""",
+    "SB3 A2C + VecNormalize": """
+from stable_baselines3 import A2C
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+from Game_Env import Game_Env
+model = A2C.load(MODEL, device="cpu")
+vec_normalize = VecNormalize.load(VEC_NORMALIZE, DummyVecEnv([lambda: Game_Env(None)]))
+model.predict(vec_normalize.normalize_obs(OBS), deterministic=True)
+""",
+}
+COLD_START_WRAPPER = """
+import time
+start = time.perf_counter()
+import sys
+import numpy as np
+sys.path.insert(0, {root!r})
+POLICY, MODEL, VEC_NORMALIZE = {policy!r}, {model!r}, {vec_normalize!r}
+OBS = np.zeros(20, dtype=np.float32)
+{body}
+elapsed = time.perf_counter() - start
+# VmHWM: peak RSS of this process image (ru_maxrss would include the forking parent)
+peak_kib = [line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM")][0]
+print(elapsed, peak_kib)
+"""
+
+
+def rollout_observations(steps=20000):
+    env = DummyVecEnv([lambda i=i: Game_Env(None, ran_house=bool(i % 2), layout_seed=i) for i in range(4)])
+    rng = np.random.default_rng(0)
+    observations = [env.reset()]
+    for _ in range(steps // 4):
+        obs, _, _, _ = env.step(rng.integers(0, 3, size=4))
+        observations.append(obs)
+    return np.concatenate(observations)
+
+
+def per_call_us(predict, obs, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(obs)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, "model.zip")
+        policy_path = os.path.join(tmp_dir, "policy.npz")
+        vec_normalize = VecNormalize.load(VEC_NORMALIZE, DummyVecEnv([lambda: Game_Env(None)]))
+        vec_normalize.training = False
+        model = A2C("MlpPolicy", vec_normalize, policy_kwargs=dict(net_arch=[64, 128, 64]), seed=0)
+        model.learn(5000)
+        model.save(model_path)
+        nbytes = export_policy(model_path, VEC_NORMALIZE, policy_path)
+        print(f"exported policy: {nbytes / 1024:.1f} KiB (model zip {os.path.getsize(model_path) / 1024:.1f} KiB)")
+
+        model = A2C.load(model_path, device="cpu")
+        policy = NumpyPolicy(policy_path)
+        rng = np.random.default_rng(1)
+        random_obs = np.concatenate([rng.random((50000, 17)), rng.random((50000, 1)) < 0.3,
+                                     rng.uniform(-30, 30, (50000, 1)), rng.integers(0, 10, (50000, 1))],
+                                    axis=1).astype(np.float32)
+        observations = np.concatenate([rollout_observations(), random_obs])
+        expected, _ = model.predict(vec_normalize.normalize_obs(observations), deterministic=True)
+        actions, _ = policy.predict(observations)
+        single = np.array([policy.predict(obs)[0] for obs in observations[:2000]])
+        if not (np.array_equal(actions, expected) and np.array_equal(single, expected[:2000])):
+            raise SystemExit(f"NumpyPolicy differs from SB3 on {int(np.sum(actions != expected))} observations")
+        print(f"{len(observations)} observations: NumpyPolicy actions match SB3 "
+              f"(counts {np.bincount(expected, minlength=3).tolist()})")
+
+        sb3_predict = lambda obs: model.predict(vec_normalize.normalize_obs(obs), deterministic=True)
+        for batch_size in (1, 64, 1024):
+            obs = observations[:batch_size] if batch_size > 1 else observations[0]
+            repeats = max(20, 20000 // batch_size)
+            sb3_us = per_call_us(sb3_predict, obs, repeats)
+            numpy_us = per_call_us(policy.predict, obs, repeats)
+            print(f"batch {batch_size:5d}: SB3 {sb3_us:8.1f} us/call, NumpyPolicy {numpy_us:8.1f} us/call "
+                  f"({sb3_us / numpy_us:5.1f}x)")
+
+        for name, body in COLD_START.items():
+            script = COLD_START_WRAPPER.format(root=ROOT, policy=policy_path, model=model_path,
+                                               vec_normalize=VEC_NORMALIZE, body=body)
+            output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+            seconds, max_rss_kib = output.stdout.split()[-2:]
+            print(f"cold start, {name:<24}: {float(seconds):5.2f} s, peak RSS {int(max_rss_kib) / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Memory and allocation check for Game_Env observation assembly.
+
+- Observations must be float32, match observation_space and live in the env's preallocated
+  buffers (at most two distinct buffers over a whole rollout). info["rays"] must be a copy.
+- Observation assembly (rays -> normalized float32 observation) is compared with the previous
+  np.array / divide / np.append version: bytes allocated (tracemalloc peak) and time per call.
+- Memory retained by a long headless rollout must not grow.
+
+Run from the repository root:
+    python benchmarks/bench_obs_alloc.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Game_Env import Game_Env
+
+NUM_STEPS = 20000
+NUM_CALLS = 20000
+
+
+def append_obs(env):
+    # Observation assembly before preallocated buffers
+    sensors = env.sensors
+    rays = np.array(sensors["rays"], dtype=np.float32) / env.robot.ray_length
+    return np.append(rays, [1 if sensors["target_found"] else 0, sensors["target_in_direction"],
+                            env.num_of_failed_moved])
+
+
+def allocated_bytes(fn):
+    # Peak bytes allocated by one call, including temporaries freed before it returns
+    fn()  # Warm up caches (ray tables, buffers)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - before
+
+
+def time_per_call(fn):
+    start = time.perf_counter()
+    for _ in range(NUM_CALLS):
+        fn()
+    return (time.perf_counter() - start) / NUM_CALLS * 1e6
+
+
+def rollout(env, rng):
+    buffers = set()
+    obs, _ = env.reset(seed=0)
+    for action in rng.integers(0, 3, size=NUM_STEPS):
+        obs, _, terminated, truncated, _ = env.step(int(action))
+        if obs.dtype != env.observation_space.dtype or obs.shape != env.observation_space.shape:
+            raise SystemExit(f"Observation {obs.dtype}{obs.shape} does not match {env.observation_space}")
+        buffers.add(obs.__array_interface__["data"][0])
+        if terminated or truncated:
+            obs, _ = env.reset()
+    return buffers
+
+
+def main():
+    rng = np.random.default_rng(0)
+    env = Game_Env(None, ran_house=False)
+    env.reset(seed=0)
+
+    tracemalloc.start()
+    rollout(env, rng)  # Warm up
+    retained_before, _ = tracemalloc.get_traced_memory()
+    buffers = rollout(env, rng)
+    retained_after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{NUM_STEPS} steps: obs dtype {env.observation_space.dtype}, {len(buffers)} distinct obs buffers, "
+          f"retained memory change {(retained_after - retained_before) / 1024:+.1f} KiB")
+    if len(buffers) > 2:
+        raise SystemExit("Observations are not written into the preallocated buffers")
+    obs, _, _, _, info = env.step(1)
+    if np.shares_memory(info["rays"], obs):
+        raise SystemExit('info["rays"] shares memory with the observation')
+
+    preallocated_bytes = allocated_bytes(env._fill_obs)
+    print("observation assembly per call:")
+    print(f"  np.append:    {allocated_bytes(lambda: append_obs(env)):6d} bytes allocated, "
+          f"{time_per_call(lambda: append_obs(env)):6.2f} us")
+    print(f"  preallocated: {preallocated_bytes:6d} bytes allocated, {time_per_call(env._fill_obs):6.2f} us")
+    print(f"full step peak allocation (ray kernel temporaries included): "
+          f"{allocated_bytes(lambda: env.step(1)) / 1024:.1f} KiB")
+    if preallocated_bytes:
+        raise SystemExit("Observation assembly allocated memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Parity check and timing for Robot.cast_rays (batched NumPy kernel) against the
+pygame clipline reference path.
+
+Run from the repository root:
+    python benchmarks/bench_ray_casting.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from new_House import House
+from Robot import Robot
+
+# clipline rasterizes the ray to integer pixels, so distances differ by about a pixel, grow
+# with distance at shallow incidence, and rays grazing a wall corner can flip between hit and
+# miss. Parity is therefore checked on the share of rays within tolerance, not the worst ray.
+PARITY_TOLERANCE = 2.0  # px
+PARITY_RELATIVE_TOLERANCE = 0.05
+MIN_FRACTION_WITHIN_TOLERANCE = 0.97
+MAX_MEDIAN_ERROR = 1.0
+NUM_POSES = 2000
+
+
+def random_poses(house, rng, count):
+    poses = []
+    while len(poses) < count:
+        pos = rng.uniform(house.wall_thickness, house.size - house.wall_thickness, size=2)
+        if not house.is_inside_wall(pos):
+            poses.append((pos, rng.uniform(-180.0, 180.0)))
+    return poses
+
+
+def ray_errors(house, robot, poses):
+    errors, references = [], []
+    for pos, angle in poses:
+        robot.pos = pos
+        robot.angle = angle
+        batched = robot.cast_rays(house.wall_array)
+        reference = np.array(robot.cast_rays_clipline(house.walls))
+        errors.append(np.abs(batched - reference))
+        references.append(reference)
+    return np.concatenate(errors), np.concatenate(references)
+
+
+def time_per_call(fn, poses, robot):
+    start = time.perf_counter()
+    for pos, angle in poses:
+        robot.pos = pos
+        robot.angle = angle
+        fn()
+    return (time.perf_counter() - start) / len(poses) * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for randomize in (False, True):
+        house = House(512, [40, 512 // 2 - 10], randomize_house=randomize)
+        robot = Robot(start_pos=[40, 246], start_angle=0.0, ray_length=house.size * 0.7)
+        poses = random_poses(house, rng, NUM_POSES)
+
+        errors, references = ray_errors(house, robot, poses)
+        within = float(np.mean((errors <= PARITY_TOLERANCE) | (errors <= PARITY_RELATIVE_TOLERANCE * references)))
+        median = float(np.median(errors))
+        batched_us = time_per_call(lambda: robot.cast_rays(house.wall_array), poses, robot)
+        reference_us = time_per_call(lambda: robot.cast_rays_clipline(house.walls), poses, robot)
+
+        print(f"random_house={randomize} walls={len(house.walls)} rays={robot.num_rays}")
+        print(f"  |batched - clipline|: median {median:.3f} px, p99 {np.percentile(errors, 99):.3f} px, "
+              f"{within * 100:.1f}% of rays within {PARITY_TOLERANCE} px / {PARITY_RELATIVE_TOLERANCE:.0%}")
+        print(f"  clipline: {reference_us:8.1f} us/call   batched: {batched_us:8.1f} us/call   "
+              f"speedup: {reference_us / batched_us:.1f}x")
+        if within < MIN_FRACTION_WITHIN_TOLERANCE or median > MAX_MEDIAN_ERROR:
+            raise SystemExit("Parity check FAILED")
+    print("Parity check passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measures incremental ray reuse in Robot.cast_rays: rays actually traced and time spent
+casting, with reuse on and off. The pose sequence of a SimpleSearch rollout (with some
+random actions mixed in) is recorded once and replayed into robots with different ray fans.
+Also checks that reuse does not change the distances.
+
+Run from the repository root:
+    python benchmarks/bench_ray_reuse.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Game_Env import Game_Env
+from Robot import Robot
+from SimpleSearch import SimpleSearch
+
+NUM_STEPS = 5000
+# (num_rays, fov): the default 17-ray fan and a 360 degree fan with the same 3.75 degree spacing
+RAY_FANS = [(17, 60.0), (96, 360.0)]  # 3.75 degree spacing: a 15 degree turn is 4 rays
+
+
+def record_poses(seed=0):
+    rng = np.random.default_rng(seed)
+    env = Game_Env(None, ran_house=False)
+    agent = SimpleSearch(env.observation_space, env.action_space)
+    obs, _ = env.reset()
+    poses, turns = [], 0
+    for _ in range(NUM_STEPS):
+        action, _ = agent.predict(obs)
+        if rng.random() < 0.2:
+            action = int(rng.integers(0, 3))
+        turns += action != 0
+        obs, _, terminated, truncated, _ = env.step(action)
+        poses.append((env.robot.pos.copy(), env.robot.angle))
+        if terminated or truncated:
+            obs, _ = env.reset()
+    return env.house, poses, turns / NUM_STEPS
+
+
+def replay(house, poses, num_rays, fov, reuse_rays):
+    robot = Robot(start_pos=poses[0][0], start_angle=0.0, num_rays=num_rays, fov=fov,
+                  ray_length=house.size * 0.7, reuse_rays=reuse_rays)
+    distances = np.empty((len(poses), num_rays))
+    start = time.perf_counter()
+    for i, (pos, angle) in enumerate(poses):
+        robot.pos = pos
+        robot.angle = angle
+        distances[i] = robot.cast_rays(house.wall_array)
+    return robot.rays_cast, time.perf_counter() - start, distances
+
+
+def main():
+    house, poses, turn_share = record_poses()
+    print(f"{NUM_STEPS} steps, {turn_share * 100:.0f}% turn actions, {len(house.walls)} walls")
+    for num_rays, fov in RAY_FANS:
+        full_rays, full_time, full_distances = replay(house, poses, num_rays, fov, reuse_rays=False)
+        reuse_rays, reuse_time, reuse_distances = replay(house, poses, num_rays, fov, reuse_rays=True)
+        worst = float(np.max(np.abs(full_distances - reuse_distances)))
+        print(f"num_rays={num_rays} fov={fov}")
+        print(f"  rays traced: full {full_rays:8d}   reuse {reuse_rays:8d}   ({full_rays / reuse_rays:.2f}x fewer)")
+        print(f"  cast time:   full {full_time * 1e3:8.1f} ms reuse {reuse_time * 1e3:8.1f} ms "
+              f"({full_time / reuse_time:.2f}x faster)")
+        print(f"  max |distance diff| = {worst:.2e}")
+        if worst > 1e-6:
+            raise SystemExit("Distance mismatch between full and incremental casting")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Reachable-area check for random layouts: cost of Geometry.ReachableArea per layout, agreement
+with a pixel-level flood fill of robot_boxes/boxes_hit_walls collisions, and how many targets
+the old placement (anything outside a wall) put where the robot cannot get next to.
+
+Run from the repository root:
+    python benchmarks/bench_reachability.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Geometry
+from new_House import House
+
+SIZE = 512
+START = [40, SIZE // 2 - 10]
+ROBOT_SIZE = 10
+NUM_LAYOUTS = 300
+NUM_PARITY_LAYOUTS = 10
+
+
+def pixel_reachable(walls):
+    # Reference: 4-connected flood fill over every integer robot centre
+    ys, xs = np.mgrid[0:SIZE, 0:SIZE]
+    centres = np.stack((xs, ys), axis=-1).reshape(-1, 2).astype(np.float64)
+    free = ~Geometry.boxes_hit_walls(Geometry.robot_boxes(centres, ROBOT_SIZE), walls).reshape(SIZE, SIZE)
+    reach = np.zeros_like(free)
+    reach[START[1], START[0]] = True
+    while True:
+        grown = reach.copy()
+        grown[1:] |= reach[:-1]
+        grown[:-1] |= reach[1:]
+        grown[:, 1:] |= reach[:, :-1]
+        grown[:, :-1] |= reach[:, 1:]
+        grown &= free
+        if np.array_equal(grown, reach):
+            return reach, centres
+        reach = grown
+
+
+def main():
+    for num_random_walls in (0, 10, 40):
+        rng = np.random.default_rng(0)
+        houses = [House(SIZE, START, True, num_random_walls, rng=rng) for _ in range(NUM_LAYOUTS)]
+        start = time.perf_counter()
+        areas = [Geometry.ReachableArea(house.wall_array, SIZE, START, ROBOT_SIZE) for house in houses]
+        elapsed_us = (time.perf_counter() - start) / NUM_LAYOUTS * 1e6
+        cells = np.mean([area.free.size for area in areas])
+
+        # Old placement: any point that is not inside a wall
+        unreachable = 0
+        for house, area in zip(houses, areas):
+            while True:
+                point = rng.integers(house.wall_thickness, SIZE - house.wall_thickness + 1, size=2)
+                if not house.is_inside_wall(point):
+                    break
+            unreachable += not area.near(point, ROBOT_SIZE)
+        partial = sum(not np.array_equal(area.reachable, area.free) for area in areas)
+        print(f"{num_random_walls:2d} random walls: {elapsed_us:6.1f} us per layout ({cells:.0f} cells), "
+              f"{partial}/{NUM_LAYOUTS} layouts with unreachable space, "
+              f"{unreachable / NUM_LAYOUTS * 100:.1f}% of old-style targets unreachable")
+
+    rng = np.random.default_rng(1)
+    for _ in range(NUM_PARITY_LAYOUTS):
+        house = House(SIZE, START, True, 40, rng=rng)
+        reach, centres = pixel_reachable(house.wall_array)
+        area = Geometry.ReachableArea(house.wall_array, SIZE, START, ROBOT_SIZE)
+        if not np.array_equal(area.contains(centres).reshape(SIZE, SIZE), reach):
+            raise SystemExit("ReachableArea differs from the pixel flood fill")
+        if not area.near(house.target_pos, ROBOT_SIZE):
+            raise SystemExit("Target placed outside the reachable area")
+    print(f"{NUM_PARITY_LAYOUTS} layouts match the pixel flood fill, targets reachable")
+
+
+if __name__ == "__main__":
+    main()
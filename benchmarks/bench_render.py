@@ -0,0 +1,99 @@
+"""
+rgb_array rendering check: the NumPy Rasterizer (cached background, robot and rays drawn per
+frame) against the pygame Surface path render() used before, per frame at full size and
+downsampled, and batched for Vec_Game_Env. Also reports how many pixels differ from pygame.
+
+Run from the repository root:
+    python benchmarks/bench_render.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from Game_Env import Game_Env
+from Vec_Game_Env import Vec_Game_Env
+
+STEPS = 300
+BATCH_ENVS = 64
+
+
+def pygame_frame(env):
+    # The rgb_array path of Game_Env.render() before the Rasterizer
+    import pygame
+
+    canvas = pygame.Surface((env.size, env.size))
+    canvas.fill((255, 255, 255))
+    env.house.draw(canvas)
+    env.robot.draw(canvas, env.sensors["rays"])
+    return np.transpose(np.array(pygame.surfarray.pixels3d(canvas)), axes=(1, 0, 2))
+
+
+def timed_frames(env, render, steps=STEPS):
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    total = 0.0
+    for _ in range(steps):
+        _, _, terminated, _, _ = env.step(int(rng.integers(0, 3)))
+        if terminated:
+            env.reset()
+        start = time.perf_counter()
+        render()
+        total += time.perf_counter() - start
+    return total / steps * 1e6
+
+
+def main():
+    env = Game_Env("rgb_array", resample_layout=True)
+    rng = np.random.default_rng(1)
+    env.reset(seed=1)
+    differing = []
+    for _ in range(200):
+        env.step(int(rng.integers(0, 3)))
+        differing.append(np.mean(np.any(env.render() != pygame_frame(env), axis=-1)))
+    print(f"pixels differing from pygame: mean {np.mean(differing) * 100:.2f}%, max {np.max(differing) * 100:.2f}%")
+
+    pygame_us = timed_frames(env, lambda: pygame_frame(env))
+    print(f"pygame Surface + pixels3d (512x512)    : {pygame_us:8.1f} us/frame")
+    render_us = timed_frames(env, env.render)
+    print(f"Game_Env.render() (512x512, new array) : {render_us:8.1f} us/frame ({pygame_us / render_us:.1f}x)")
+    frame_us = timed_frames(env, env.render_frame)
+    print(f"Game_Env.render_frame() (reused buffer): {frame_us:8.1f} us/frame ({pygame_us / frame_us:.1f}x)")
+    small_env = Game_Env("rgb_array", resample_layout=True, render_scale=0.25)
+    small_us = timed_frames(small_env, small_env.render_frame)
+    print(f"render_frame(), render_scale=0.25      : {small_us:8.1f} us/frame ({pygame_us / small_us:.1f}x), "
+          f"shape {small_env.render_frame().shape}")
+
+    # Batched frames match the single-env ones for the same houses and actions
+    envs = [Game_Env("rgb_array", ran_house=bool(i % 2)) for i in range(4)]
+    batched = Vec_Game_Env(len(envs), houses=[env.house for env in envs])
+    batched.reset()
+    for env in envs:
+        env.reset()
+    for step_actions in np.random.default_rng(3).integers(0, 3, size=(20, len(envs))):
+        batched.step(step_actions)
+        for env, action in zip(envs, step_actions):
+            env.step(int(action))
+    if not np.array_equal(batched.render_frames(), np.stack([env.render() for env in envs])):
+        raise SystemExit("Vec_Game_Env.render_frames differs from Game_Env.render")
+
+    vec_env = Vec_Game_Env(BATCH_ENVS, ran_house=False)
+    vec_env.reset()
+    actions = np.random.default_rng(2).integers(0, 3, size=(50, BATCH_ENVS))
+    for scale in (1.0, 0.25):
+        total = 0.0
+        for step_actions in actions:
+            vec_env.step(step_actions)
+            start = time.perf_counter()
+            frames = vec_env.render_frames(scale)
+            total += time.perf_counter() - start
+        print(f"Vec_Game_Env({BATCH_ENVS}).render_frames({scale}) : {total / len(actions) / BATCH_ENVS * 1e6:8.1f} "
+              f"us/frame, shape {frames.shape}")
+
+
+if __name__ == "__main__":
+    main()
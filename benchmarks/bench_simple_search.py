@@ -0,0 +1,113 @@
+"""
+Batched SimpleSearch.predict: agreement with the per-observation rules on random and rollout
+observations, per-observation vs batched cost, and a SimpleSearch rollout on Vec_Game_Env.
+
+Run from the repository root:
+    python benchmarks/bench_simple_search.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Game_Env import Game_Env
+from SimpleSearch import SimpleSearch
+from Vec_Game_Env import Vec_Game_Env
+
+BATCH_SIZES = (1, 64, 1024, 4096)
+ROLLOUT_ENVS = 1024
+ROLLOUT_STEPS = 200
+
+
+def reference_action(agent, observation):
+    # The rules of SimpleSearch.predict before batching, one observation at a time
+    rays = observation[:agent.num_rays]
+    target_angle = observation[agent.num_rays + 1]
+    if observation[agent.num_rays] > 0.5 and abs(target_angle) <= agent._target_reach:  # Targets in the side sectors
+        if abs(target_angle) <= agent.target_angle_threshold:
+            return 0
+        return 2 if target_angle < 0 else 1  # Action 2 lowers the heading, raising the target angle
+    if int(observation[agent.num_rays + 2]) >= agent.stuck_threshold:
+        return 1
+    min_front = np.min(rays[agent.front_ray_indices]) if agent.front_ray_indices else 1.0
+    if min_front < agent.wall_proximity_threshold:
+        avg_left = np.mean(rays[agent.left_ray_indices]) if agent.left_ray_indices else 1.0
+        avg_right = np.mean(rays[agent.right_ray_indices]) if agent.right_ray_indices else 1.0
+        if avg_left > avg_right + agent.side_clearance_hysteresis:
+            return 2  # Towards the clearer negative-offset side
+        return 1
+    return 0
+
+
+def random_observations(agent, count, rng):
+    obs = np.empty((count, agent.num_rays + 3), dtype=np.float32)
+    obs[:, :agent.num_rays] = rng.random((count, agent.num_rays)) ** 3  # Plenty of near walls
+    obs[:, agent.num_rays] = rng.random(count) < 0.3
+    obs[:, agent.num_rays + 1] = rng.uniform(-180, 180, count)
+    obs[:, agent.num_rays + 2] = rng.integers(0, 6, count)
+    return obs
+
+
+def check_parity(agent):
+    rng = np.random.default_rng(0)
+    observations = [random_observations(agent, 20000, rng)]
+    vec_env = Vec_Game_Env(64, ran_house=True)
+    obs = vec_env.reset()
+    for _ in range(300):
+        observations.append(obs)
+        actions, _ = agent.predict(obs)
+        explore = rng.random(len(actions)) < 0.2
+        actions[explore] = rng.integers(0, 3, size=int(explore.sum()))
+        obs, _, _, _ = vec_env.step(actions)
+    observations = np.concatenate(observations)
+
+    batched, _ = agent.predict(observations)
+    expected = np.array([reference_action(agent, obs) for obs in observations])
+    single = np.array([agent.predict(obs)[0] for obs in observations[:2000]])
+    if not (np.array_equal(batched, expected) and np.array_equal(single, expected[:2000])):
+        raise SystemExit("Batched SimpleSearch differs from the per-observation rules")
+    counts = np.bincount(expected, minlength=3)
+    print(f"{len(observations)} observations: batched actions match the per-observation rules "
+          f"(forward {counts[0]}, left {counts[1]}, right {counts[2]})")
+
+
+def main():
+    spaces_env = Game_Env(None)
+    agent = SimpleSearch(spaces_env.observation_space, spaces_env.action_space)
+    check_parity(agent)
+
+    rng = np.random.default_rng(1)
+    for batch_size in BATCH_SIZES:
+        obs = random_observations(agent, batch_size, rng)
+        repeats = max(1, 20000 // batch_size)
+        start = time.perf_counter()
+        for _ in range(max(1, repeats // 10)):
+            for env_obs in obs:
+                agent.predict(env_obs)
+        per_obs_us = (time.perf_counter() - start) / (max(1, repeats // 10) * batch_size) * 1e6
+        start = time.perf_counter()
+        for _ in range(repeats):
+            agent.predict(obs)
+        batched_us = (time.perf_counter() - start) / (repeats * batch_size) * 1e6
+        print(f"batch {batch_size:5d}: per-observation calls {per_obs_us:6.2f} us/obs, "
+              f"batched {batched_us:6.3f} us/obs ({per_obs_us / batched_us:6.1f}x)")
+
+    vec_env = Vec_Game_Env(ROLLOUT_ENVS, ran_house=True)
+    obs = vec_env.reset()
+    predict_s = 0.0
+    start = time.perf_counter()
+    for _ in range(ROLLOUT_STEPS):
+        predict_start = time.perf_counter()
+        actions, _ = agent.predict(obs)
+        predict_s += time.perf_counter() - predict_start
+        obs, _, _, _ = vec_env.step(actions)
+    elapsed = time.perf_counter() - start
+    print(f"SimpleSearch on Vec_Game_Env x{ROLLOUT_ENVS}: {ROLLOUT_STEPS * ROLLOUT_ENVS / elapsed:.0f} env-steps/s, "
+          f"predict {predict_s / elapsed * 100:.1f}% of the time")
+
+
+if __name__ == "__main__":
+    main()
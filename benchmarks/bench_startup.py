@@ -0,0 +1,61 @@
+"""
+Import-to-first-step time of a fresh worker process, the cost every SubprocVecEnv worker pays.
+
+- headless:      render_mode=None, pygame is never imported
+- eager pygame:  same, with pygame imported up front as Game_Env/Robot/new_House used to do
+- rgb_array:     first step plus one render() call, which loads and initialises pygame
+
+Each case runs in a new interpreter and the median over REPEATS runs is reported.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 7
+
+WORKER = """
+import sys, time
+start = time.perf_counter()
+{preamble}
+from Game_Env import Game_Env
+env = Game_Env({render_mode!r}, ran_house=False)
+env.reset()
+env.step(0)
+{render}
+print(time.perf_counter() - start, 'pygame' in sys.modules)
+"""
+
+CASES = {
+    "headless": dict(preamble="", render_mode=None, render=""),
+    "eager pygame": dict(preamble="import pygame", render_mode=None, render=""),
+    "rgb_array": dict(preamble="", render_mode="rgb_array", render="env.render()"),
+}
+
+
+def run_worker(code):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1", SDL_VIDEODRIVER="dummy")
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    seconds, pygame_loaded = result.stdout.split()[-2:]
+    return float(seconds), pygame_loaded == "True"
+
+
+def main():
+    print(f"{'case':>14} {'median ms':>10} {'min ms':>8}  pygame loaded")
+    for name, case in CASES.items():
+        runs = [run_worker(WORKER.format(**case)) for _ in range(REPEATS)]
+        times = np.array([seconds for seconds, _ in runs]) * 1e3
+        pygame_loaded = any(loaded for _, loaded in runs)
+        print(f"{name:>14} {np.median(times):10.1f} {times.min():8.1f}  {pygame_loaded}")
+        if name == "headless" and pygame_loaded:
+            raise SystemExit("Headless path imported pygame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Environment throughput suite: steps/sec and per-call latency percentiles for the hot paths
+(Game_Env.step and reset, Robot.cast_rays, Game_Env._check_target_found,
+House._create_random_layout and Vec_Game_Env.step), swept over num_rays, house size,
+num_random_walls and env count.
+
+Shared hosts change speed by well over 50% from one minute to the next, so every case run
+is preceded by a short calibration (small NumPy calls, which is what the hot paths are made
+of) and latencies are also recorded relative to it. The whole suite runs --repeats rounds;
+every case keeps its fastest run, its typical (median over rounds) relative latency and the
+spread (max - min over rounds) of its relative latency. Results are written as JSON and
+compared against a stored baseline: a case whose fastest relative latency is more than
+--tolerance above the baseline's typical one, and slower in absolute terms by more than
+--noise-factor times the baseline's spread for that case (at least --min-delta-us, at most
+the expected latency itself), is reported and the run exits with status 1. The floor follows
+each case's own noise, so a case that swings by a few us between runs does not fail on that,
+while any case that gets twice as slow does.
+Baselines are machine specific; after an intended change (or on a new machine) record a new
+one with --save-baseline.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py                      # run, write JSON, compare to baseline
+    python benchmarks/bench_suite.py --quick              # fewer calls per case
+    python benchmarks/bench_suite.py --save-baseline      # store this run as the baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from Game_Env import Game_Env
+from new_House import House
+from Robot import Robot
+from Vec_Game_Env import Vec_Game_Env
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+
+NUM_RAYS = [9, 17, 65, 257]
+SIZES = [256, 512, 1024]
+NUM_RANDOM_WALLS = [0, 10, 40]
+NUM_ENVS = [1, 16, 64, 256]
+
+
+def summarize(latencies_ns, items_per_call=1):
+    """Steps/sec and latency percentiles (microseconds) from per-call latencies."""
+    latencies_us = np.asarray(latencies_ns, dtype=np.float64) / 1e3
+    p50, p90, p99 = np.percentile(latencies_us, [50, 90, 99])
+    return {
+        "calls": len(latencies_us),
+        "steps_per_sec": items_per_call * len(latencies_us) / (latencies_us.sum() / 1e6),
+        "p50_us": p50,
+        "p90_us": p90,
+        "p99_us": p99,
+    }
+
+
+def timed_calls(fn, args_list):
+    latencies = np.empty(len(args_list), dtype=np.int64)
+    for i, args in enumerate(args_list):
+        start = time.perf_counter_ns()
+        fn(*args)
+        latencies[i] = time.perf_counter_ns() - start
+    return latencies
+
+
+def free_poses(house, rng, count):
+    poses = []
+    while len(poses) < count:
+        pos = rng.uniform(house.wall_thickness, house.size - house.wall_thickness, size=2)
+        if not house.is_inside_wall(pos):
+            poses.append((pos, float(rng.uniform(-180.0, 180.0))))
+    return poses
+
+
+# --- Cases ---
+def bench_env_step(calls, size, num_random_walls):
+    env = Game_Env(None, size=size, ran_house=True, num_random_walls=num_random_walls, layout_seed=0)
+    env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    latencies = np.empty(calls, dtype=np.int64)
+    for i, action in enumerate(rng.integers(0, 3, size=calls)):
+        start = time.perf_counter_ns()
+        _, _, terminated, truncated, _ = env.step(int(action))
+        latencies[i] = time.perf_counter_ns() - start
+        if terminated or truncated:
+            env.reset()
+    return summarize(latencies)
+
+
+def bench_env_reset(calls, size):
+    env = Game_Env(None, size=size, ran_house=True, layout_seed=0)
+    env.reset(seed=0)
+    return summarize(timed_calls(env.reset, [()] * calls))
+
+
+def bench_cast_rays(calls, num_rays):
+    house = House(512, [40, 246], randomize_house=True, rng=np.random.default_rng(0))
+    robot = Robot(start_pos=[40, 246], start_angle=0.0, num_rays=num_rays, ray_length=house.size * 0.7,
+                  reuse_rays=False)
+    poses = free_poses(house, np.random.default_rng(0), calls)
+
+    def cast(pos, angle):
+        robot.pos = pos
+        robot.angle = angle
+        robot.cast_rays(house.wall_index)
+
+    return summarize(timed_calls(cast, poses))
+
+
+def bench_check_target_found(calls, num_rays):
+    env = Game_Env(None, ran_house=True, layout_seed=0)
+    env.reset(seed=0)
+    env.robot.num_rays = num_rays
+    rng = np.random.default_rng(0)
+    poses = free_poses(env.house, rng, calls)
+    rays = [rng.uniform(0.0, env.robot.ray_length, size=num_rays) for _ in range(calls)]
+
+    def check(pose, ray_lengths):
+        env.robot.pos, env.robot.angle = pose
+        env._check_target_found(ray_lengths)
+
+    return summarize(timed_calls(check, list(zip(poses, rays))))
+
+
+def bench_random_layout(calls, size, num_random_walls):
+    house = House(size, [40, size // 2 - 10], randomize_house=True, num_random_walls=num_random_walls,
+                  rng=np.random.default_rng(0))
+    return summarize(timed_calls(house._create_random_layout, [()] * calls))
+
+
+def bench_vec_step(calls, num_envs):
+    vec_env = Vec_Game_Env(num_envs, ran_house=False)
+    vec_env.reset()
+    actions = np.random.default_rng(0).integers(0, 3, size=(calls, num_envs))
+    return summarize(timed_calls(vec_env.step, [(step_actions,) for step_actions in actions]),
+                     items_per_call=num_envs)
+
+
+def cases(calls):
+    """(name, thunk) pairs; calls is the number of timed calls for the cheap cases."""
+    for size in SIZES:
+        for num_random_walls in NUM_RANDOM_WALLS:
+            yield (f"env_step/size={size}/walls={num_random_walls}",
+                   lambda s=size, w=num_random_walls: bench_env_step(calls, s, w))
+    for size in SIZES:
+        yield f"env_reset/size={size}", lambda s=size: bench_env_reset(calls, s)
+    for num_rays in NUM_RAYS:
+        yield f"cast_rays/num_rays={num_rays}", lambda r=num_rays: bench_cast_rays(calls, r)
+    for num_rays in NUM_RAYS:
+        yield f"check_target_found/num_rays={num_rays}", lambda r=num_rays: bench_check_target_found(calls, r)
+    for size in SIZES:
+        for num_random_walls in NUM_RANDOM_WALLS:
+            yield (f"random_layout/size={size}/walls={num_random_walls}",
+                   lambda s=size, w=num_random_walls: bench_random_layout(calls, s, w))
+    for num_envs in NUM_ENVS:
+        yield f"vec_step/num_envs={num_envs}", lambda n=num_envs: bench_vec_step(max(calls // 10, 20), n)
+
+
+# --- Baseline comparison ---
+def calibrate(rounds=5, calls=300):
+    """Host speed reference in microseconds: best time of a fixed batch of small NumPy calls."""
+    values = np.random.default_rng(0).random((17, 16))
+    best = np.inf
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            np.minimum(values, 0.5).min(axis=1)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / 1e3
+
+
+def compare(results, baseline, tolerance, min_delta_us, noise_factor):
+    """
+    Returns the names of cases whose relative median latency regressed by more than tolerance
+    and whose absolute median latency by more than noise_factor times the baseline's spread
+    over rounds (at least min_delta_us, at most the expected latency).
+    """
+    regressions = []
+    print(f"\n{'case':<42} {'p50 us':>10} {'expected':>10} {'change':>8}")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<42} {result['p50_us']:10.1f} {'-':>10} {'new':>8}")
+            continue
+        # Baseline's typical relative latency at the host speed of this run
+        expected = reference["p50_relative_typical"] * result["calibration_us"]
+        change = result["p50_us"] / expected - 1.0
+        noise_us = noise_factor * reference.get("p50_relative_spread", 0.0) * result["calibration_us"]
+        flag = ""
+        if change > tolerance and result["p50_us"] - expected > max(min_delta_us, min(noise_us, expected)):
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<42} {result['p50_us']:10.1f} {expected:10.1f} {change * 100:+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON file for this run's results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed median latency increase before failing (0.5 = 50%%)")
+    parser.add_argument("--min-delta-us", type=float, default=1.0,
+                        help="Median latency increases below this many microseconds are never regressions")
+    parser.add_argument("--noise-factor", type=float, default=3.0,
+                        help="Median latency increases below this multiple of the baseline's spread over "
+                             "rounds are never regressions")
+    parser.add_argument("--calls", type=int, default=2000, help="Timed calls per case")
+    parser.add_argument("--repeats", type=int, default=3, help="Rounds over all cases")
+    parser.add_argument("--quick", action="store_true", help="Shortcut for --calls 300")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this string")
+    args = parser.parse_args()
+    calls = 300 if args.quick else args.calls
+
+    selected = [(name, run) for name, run in cases(calls) if args.filter in name]
+    runs = {name: [] for name, _ in selected}
+    for round_index in range(args.repeats):
+        print(f"round {round_index + 1}/{args.repeats}", flush=True)
+        for name, run in selected:
+            calibration_us = calibrate()
+            result = run()
+            result["calibration_us"] = calibration_us
+            result["p50_relative"] = result["p50_us"] / calibration_us
+            runs[name].append(result)
+
+    results = {}
+    print(f"{'case (fastest run)':<42} {'steps/s':>12} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10}")
+    for name, _ in selected:
+        result = dict(min(runs[name], key=lambda r: r["p50_relative"]))
+        relative = [r["p50_relative"] for r in runs[name]]
+        result["p50_relative_typical"] = float(np.median(relative))
+        result["p50_relative_spread"] = float(np.max(relative) - np.min(relative))
+        results[name] = result
+        print(f"{name:<42} {result['steps_per_sec']:12.0f} {result['p50_us']:10.1f} "
+              f"{result['p90_us']:10.1f} {result['p99_us']:10.1f}")
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "calls": calls,
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one with --save-baseline")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_us, args.noise_factor)
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.tolerance * 100:.0f}%:")
+        for name in regressions:
+            print(f"  {name}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
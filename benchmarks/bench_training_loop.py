@@ -0,0 +1,105 @@
+"""
+Training loop comparison: the old main.py loop (vec_env.reset(), a new TrainingLogger and a
+learn() call per epoch) against one learn() over the whole budget with EpochCallback, on the
+same seeded fixed layouts. Reports env steps/sec, wall clock and the wall clock until the
+5-epoch moving average of the per-epoch mean episode return first reaches --target
+(default: the lower of the two final moving averages).
+
+Run from the repository root:
+    python benchmarks/bench_training_loop.py
+    python benchmarks/bench_training_loop.py --epochs 100
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stable_baselines3.common.callbacks import CallbackList
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+
+from Game_Env import Game_Env
+from Policy_A2C import Policy_A2C
+from TrainingCallbacks import EpochCallback
+from TrainingLogger import TrainingLogger
+
+NUM_OF_ENV = 5
+ENT_COEF = 0.015
+WINDOW = 5
+
+
+def make_policy(seed):
+    # Seeded layouts and targets, so both loops train on the same houses
+    vec_env = DummyVecEnv([lambda i=i: Game_Env(None, ran_house=False, layout_seed=seed + i) for i in range(NUM_OF_ENV)])
+    vec_env.seed(seed)
+    normalized_vec_env = VecNormalize(vec_env, norm_obs=True, norm_reward=True, clip_obs=10., clip_reward=10.)
+    policy = Policy_A2C(normalized_vec_env, ENT_COEF)
+    policy.model.verbose = 0
+    policy.model.set_random_seed(seed)
+    return policy, vec_env
+
+
+def epoch_loop(epochs, steps_per_epoch, seed):
+    policy, vec_env = make_policy(seed)
+    rewards, times = [], []
+    start = time.perf_counter()
+    for _ in range(epochs):
+        vec_env.reset()
+        training_logger = TrainingLogger()
+        policy.model.learn(total_timesteps=steps_per_epoch, log_interval=50, callback=training_logger)
+        totals = training_logger.get_totals()
+        rewards.append(totals["return"] / totals["episodes"] if totals["episodes"] else np.nan)
+        times.append(time.perf_counter() - start)
+    return rewards, times, policy.model.num_timesteps
+
+
+def single_learn(epochs, steps_per_epoch, seed):
+    policy, _ = make_policy(seed)
+    training_logger = TrainingLogger()
+    epoch_callback = EpochCallback(steps_per_epoch, training_logger)
+    start = time.perf_counter()
+    policy.model.learn(total_timesteps=epochs * steps_per_epoch, log_interval=50,
+                       callback=CallbackList([training_logger, epoch_callback]))
+    times = list(np.cumsum([snapshot["seconds"] for snapshot in epoch_callback.snapshots]))
+    times[-1] = time.perf_counter() - start
+    return epoch_callback.get_rewards(), times, policy.model.num_timesteps
+
+
+def moving_average(rewards):
+    # Epochs in which no episode finished have a NaN mean return and are skipped
+    rewards = np.asarray(rewards, dtype=np.float64)
+    windows = np.lib.stride_tricks.sliding_window_view(rewards, WINDOW)
+    counts = np.sum(~np.isnan(windows), axis=1)
+    return np.where(counts > 0, np.nansum(windows, axis=1) / np.maximum(counts, 1), -np.inf)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--epochs", type=int, default=40)
+    parser.add_argument("--steps-per-epoch", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", type=float, default=None, help="Moving-average episode return to reach")
+    args = parser.parse_args()
+
+    runs = {}
+    for name, run in (("learn() per epoch", epoch_loop), ("single learn()", single_learn)):
+        rewards, times, total_steps = run(args.epochs, args.steps_per_epoch, args.seed)
+        runs[name] = (moving_average(rewards), times)
+        print(f"{name:<18} {times[-1]:7.1f} s, {args.epochs * args.steps_per_epoch / times[-1]:6.0f} env steps/s, "
+              f"model timesteps {total_steps}, final {WINDOW}-epoch mean return {moving_average(rewards)[-1]:9.1f}")
+
+    target = args.target if args.target is not None else min(averages[-1] for averages, _ in runs.values())
+    for name, (averages, times) in runs.items():
+        reached = np.flatnonzero(averages >= target)
+        if len(reached):
+            epoch = reached[0] + WINDOW
+            print(f"{name:<18} reached {target:.1f} after epoch {epoch} ({times[epoch - 1]:.1f} s)")
+        else:
+            print(f"{name:<18} did not reach {target:.1f}")
+
+
+if __name__ == "__main__":
+    main()
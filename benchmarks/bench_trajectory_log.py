@@ -0,0 +1,102 @@
+"""
+Trajectory log check: per-step cost of Game_Env.start_trajectory_log (its profiler stage, wall
+time is too noisy for a few us), bytes per step, and replay: every replayed frame must match the
+live one, and a frame deep into an episode is rendered without re-simulating.
+
+Run from the repository root:
+    python benchmarks/bench_trajectory_log.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Game_Env import Game_Env
+from SimpleSearch import SimpleSearch
+from TrajectoryLog import TrajectoryLog, write_video
+
+EPISODES = 20
+FRAME_EPISODES = 5
+MAX_STEPS = 400
+FRAME_SCALE = 0.25
+CHUNK_SIZE = 1000  # Small, so episodes cross chunk boundaries
+
+
+def run_episodes(env, agent, episodes, frames=None):
+    rng = np.random.default_rng(0)
+    steps = 0
+    for episode in range(episodes):
+        obs, _ = env.reset(seed=100 + episode)
+        episode_frames = [env.render_frame().copy()] if frames is not None else None
+        for _ in range(MAX_STEPS):
+            action = int(rng.integers(0, 3)) if rng.random() < 0.3 else int(agent.predict(obs)[0])
+            obs, _, terminated, _, _ = env.step(action)
+            steps += 1
+            if episode_frames is not None:
+                episode_frames.append(env.render_frame().copy())
+            if terminated:
+                break
+        if frames is not None:
+            frames.append(episode_frames)
+    return steps
+
+
+def main():
+    env = Game_Env(None, resample_layout=True, profile=True)
+    agent = SimpleSearch(env.observation_space, env.action_space)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = os.path.join(tmp_dir, "log")
+        env.start_trajectory_log(directory, chunk_size=CHUNK_SIZE)
+        steps = run_episodes(env, agent, EPISODES)
+        env.stop_trajectory_log()
+        stats = env.get_step_stats()
+        step_us = sum(values["total_s"] for values in stats.values()) / steps * 1e6
+        if any(name.endswith(".tmp") for name in os.listdir(directory)):
+            raise SystemExit("Temporary table files were left in the log directory")
+        nbytes = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{steps} steps: logging {stats['log']['mean_us']:.1f} us/step of {step_us:.1f} us/step in total, "
+              f"{nbytes / (steps + EPISODES):.0f} bytes/row ({nbytes / 1024:.0f} KiB)")
+
+        # Same episodes again, live frames kept for comparison
+        env = Game_Env(None, resample_layout=True, render_scale=FRAME_SCALE)
+        live_frames = []
+        env.start_trajectory_log(os.path.join(tmp_dir, "log_frames"), chunk_size=CHUNK_SIZE)
+        run_episodes(env, agent, FRAME_EPISODES, live_frames)
+        env.close()
+        log = TrajectoryLog(os.path.join(tmp_dir, "log_frames"))
+        if len(log) != FRAME_EPISODES:
+            raise SystemExit(f"Expected {FRAME_EPISODES} episodes, the log has {len(log)}")
+        differing = differing_pixels = 0
+        for i, episode_frames in enumerate(live_frames):
+            replayed = list(frame.copy() for frame in log.frames(i, scale=FRAME_SCALE))
+            if len(replayed) != len(episode_frames):
+                raise SystemExit(f"Episode {i}: {len(replayed)} replayed frames, {len(episode_frames)} live")
+            for replayed_frame, live_frame in zip(replayed, episode_frames):
+                pixels = int(np.any(replayed_frame != live_frame, axis=-1).sum())
+                differing += pixels > 0
+                differing_pixels += pixels
+        total = sum(len(frames) for frames in live_frames)
+        print(f"replayed {total} frames of {len(log)} episodes: {differing} differ from the live frames "
+              f"({differing_pixels} pixels; rays are stored as float32)")
+
+        index = int(np.argmax(log.episodes["rows"]))
+        start = time.perf_counter()
+        reopened = TrajectoryLog(os.path.join(tmp_dir, "log_frames"))
+        frame = reopened.frame(index, int(reopened.episodes["rows"][index]) - 1, scale=FRAME_SCALE)
+        print(f"open log + render the last frame of episode {index} (seed {reopened.episodes['seed'][index]}): "
+              f"{(time.perf_counter() - start) * 1e3:.1f} ms, frame {frame.shape}")
+        if not np.array_equal(frame, live_frames[index][-1]):
+            raise SystemExit("Random access frame differs from the live one")
+
+        start = time.perf_counter()
+        count = write_video(os.path.join(tmp_dir, "episode.gif"), log.frames(index, scale=0.5), fps=30)
+        print(f"GIF of {count} frames at scale 0.5 in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Parity check and throughput of the batched Vec_Game_Env against Game_Env wrapped in
+Stable-Baselines3's DummyVecEnv (what main.py uses through make_vec_env).
+
+Run from the repository root:
+    python benchmarks/bench_vec_env.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+from Game_Env import Game_Env
+from SimpleSearch import SimpleSearch
+from Vec_Game_Env import Vec_Game_Env
+
+PARITY_ENVS = 4
+PARITY_STEPS = 3000
+TIMED_STEPS = 200
+
+
+def check_parity():
+    envs = [Game_Env(None, ran_house=bool(i % 2)) for i in range(PARITY_ENVS)]
+    reference = DummyVecEnv([lambda env=env: env for env in envs])
+    batched = Vec_Game_Env(PARITY_ENVS, houses=[env.house for env in envs])
+
+    # SimpleSearch actions with some random ones mixed in, so that episodes actually finish
+    agent = SimpleSearch(reference.observation_space, reference.action_space)
+    rng = np.random.default_rng(0)
+    expected_obs = reference.reset()
+    obs = batched.reset()
+    worst_obs, mismatches, episodes = 0.0, 0, 0
+    for _ in range(PARITY_STEPS):
+        worst_obs = max(worst_obs, float(np.max(np.abs(expected_obs - obs))))
+        actions, _ = agent.predict(expected_obs)
+        explore = rng.random(PARITY_ENVS) < 0.3
+        actions[explore] = rng.integers(0, 3, size=int(explore.sum()))
+        expected_obs, expected_rewards, expected_dones, _ = reference.step(actions)
+        obs, rewards, dones, _ = batched.step(actions)
+        mismatches += int(np.sum(expected_rewards != rewards) + np.sum(expected_dones != dones))
+        episodes += int(np.sum(dones))
+    return worst_obs, mismatches, episodes
+
+
+def steps_per_second(vec_env, steps):
+    vec_env.reset()
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 3, size=(steps, vec_env.num_envs))
+    start = time.perf_counter()
+    for step_actions in actions:
+        vec_env.step(step_actions)
+    return steps * vec_env.num_envs / (time.perf_counter() - start)
+
+
+def main():
+    worst_obs, mismatches, episodes = check_parity()
+    print(f"parity over {PARITY_STEPS} steps x {PARITY_ENVS} envs ({episodes} episodes finished): "
+          f"max |obs diff| = {worst_obs:.2e}, reward/done mismatches = {mismatches}")
+    if worst_obs > 1e-4 or mismatches:
+        raise SystemExit("Parity check FAILED")
+
+    dummy = DummyVecEnv([lambda: Game_Env(None, ran_house=False) for _ in range(5)])
+    print(f"DummyVecEnv(Game_Env) x5: {steps_per_second(dummy, TIMED_STEPS):10.0f} env-steps/s")
+    for num_envs in (5, 64, 256, 1024):
+        batched = Vec_Game_Env(num_envs, ran_house=False)
+        print(f"Vec_Game_Env x{num_envs:<5}:   {steps_per_second(batched, TIMED_STEPS):10.0f} env-steps/s")
+
+
+if __name__ == "__main__":
+    main()
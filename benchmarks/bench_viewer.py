@@ -0,0 +1,92 @@
+"""
+Live view check: env steps/sec without rendering, with render_mode="human" (capped by
+clock.tick at render_fps) and with attach_viewer (snapshots drawn by a separate process),
+plus the frames the viewer drew, for Game_Env and for one env of Vec_Game_Env. The snapshot
+is also read back and compared with the env state.
+
+Runs without a display by default (SDL dummy video driver); set SDL_VIDEODRIVER to watch.
+
+Run from the repository root:
+    python benchmarks/bench_viewer.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import Viewer
+from Game_Env import Game_Env
+from Vec_Game_Env import Vec_Game_Env
+
+SECONDS = 3.0
+HUMAN_STEPS = 60
+
+
+def run(env, steps=None, seconds=SECONDS):
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    count = 0
+    start = time.perf_counter()
+    while (steps is None or count < steps) and time.perf_counter() - start < seconds:
+        _, _, terminated, truncated, _ = env.step(int(rng.integers(0, 3)))
+        if terminated or truncated:
+            env.reset()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def check_snapshot(viewer, pos, angle, rays):
+    snapshot = Viewer._read_snapshot(viewer._values)
+    num_rays = viewer.num_rays
+    if not (np.array_equal(snapshot[[Viewer.X, Viewer.Y]], pos) and snapshot[Viewer.ANGLE] == angle and
+            np.array_equal(snapshot[Viewer.HEADER_SIZE + num_rays:Viewer.HEADER_SIZE + 2 * num_rays], rays)):
+        raise SystemExit("Viewer snapshot differs from the env state")
+
+
+def main():
+    env = Game_Env(None, resample_layout=True)
+    headless = run(env)
+    print(f"Game_Env, no rendering          : {headless:8.0f} steps/s")
+
+    human_env = Game_Env("human", resample_layout=True)
+    human = run(human_env, HUMAN_STEPS)
+    human_env.close()
+    print(f"Game_Env, render_mode='human'   : {human:8.0f} steps/s")
+
+    env.attach_viewer()
+    time.sleep(1.0)  # Viewer process start-up
+    viewed = run(env)
+    time.sleep(0.2)
+    viewer = env.viewer
+    check_snapshot(viewer, env.robot.pos, env.robot.angle, env.sensors["rays"])
+    print(f"Game_Env, attach_viewer         : {viewed:8.0f} steps/s ({viewed / headless * 100:.0f}% of no "
+          f"rendering), {viewer.published} snapshots, {viewer.frames_drawn} frames drawn")
+    path = viewer.path
+    env.close()
+    if os.path.exists(path) or viewer._process.poll() is None:
+        raise SystemExit("Viewer process or snapshot file left behind")
+
+    vec_env = Vec_Game_Env(16, ran_house=False)
+    vec_env.reset()
+    vec_env.attach_viewer(index=3)
+    time.sleep(1.0)
+    rng = np.random.default_rng(0)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        vec_env.step(rng.integers(0, 3, size=16))
+        steps += 1
+    elapsed = time.perf_counter() - start
+    viewer = vec_env.viewer
+    check_snapshot(viewer, vec_env.pos[3], vec_env.angle[3], vec_env.rays[3])
+    print(f"Vec_Game_Env(16), env 3 viewed  : {steps * 16 / elapsed:8.0f} steps/s, {viewer.frames_drawn} frames drawn")
+    vec_env.close()
+
+
+if __name__ == "__main__":
+    main()
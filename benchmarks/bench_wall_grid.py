@@ -0,0 +1,91 @@
+"""
+Per-step geometry cost (robot collision check + 17-ray cast) as the wall count grows, with
+and without the Geometry.WallGrid spatial index. Also checks that the grid returns exactly
+the brute-force results. The wall counts are dense around the point where the grid starts to
+pay off, which sets WallGrid's brute_force_below default.
+
+Run from the repository root:
+    python benchmarks/bench_wall_grid.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Geometry
+from Robot import Robot
+
+HOUSE_SIZE = 2048
+WALL_COUNTS = [10, 30, 100, 200, 300, 400, 500, 550, 600, 700, 800, 1000, 2000]
+NUM_POSES = 300
+REPEATS = 5
+
+
+def synthetic_walls(count, rng):
+    # Border walls plus short random inner walls (10 px thick, 20-120 px long)
+    walls = [(0, 0, HOUSE_SIZE, 10), (0, 0, 10, HOUSE_SIZE),
+             (0, HOUSE_SIZE - 10, HOUSE_SIZE, 10), (HOUSE_SIZE - 10, 0, 10, HOUSE_SIZE)]
+    for _ in range(count - len(walls)):
+        length = rng.integers(20, 120)
+        x, y = rng.integers(10, HOUSE_SIZE - 130, size=2)
+        walls.append((x, y, length, 10) if rng.random() < 0.5 else (x, y, 10, length))
+    return Geometry.pack_walls(walls)
+
+
+def free_poses(grid, rng, count):
+    poses = []
+    while len(poses) < count:
+        pos = rng.uniform(20, HOUSE_SIZE - 20, size=2)
+        if not grid.box_hits(Geometry.robot_boxes(pos, 10)):
+            poses.append((pos, rng.uniform(-180.0, 180.0)))
+    return poses
+
+
+def time_steps(robot, walls, poses):
+    # Best of REPEATS passes, so other load on the machine does not move the crossover
+    robot.reuse_rays = False
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for pos, angle in poses:
+            robot.pos = pos
+            robot.angle = angle
+            robot.check_collision_walls(walls)
+            robot.cast_rays(walls)
+        best = min(best, time.perf_counter() - start)
+    return best / len(poses) * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    robot = Robot(start_pos=[40, 40], start_angle=0.0, ray_length=HOUSE_SIZE * 0.7)
+    print(f"house {HOUSE_SIZE}x{HOUSE_SIZE}, {robot.num_rays} rays of {robot.ray_length:.0f} px")
+    print(f"{'walls':>6} {'brute us/step':>14} {'grid us/step':>13} {'grid speedup':>13} {'default us/step':>16}")
+    for count in WALL_COUNTS:
+        walls = synthetic_walls(count, rng)
+        grid = Geometry.WallGrid(walls, HOUSE_SIZE, brute_force_below=0)
+        default_grid = Geometry.WallGrid(walls, HOUSE_SIZE)
+        poses = free_poses(grid, rng, NUM_POSES)
+
+        for pos, angle in poses:
+            robot.pos = pos
+            robot.angle = angle
+            directions = Geometry.ray_directions(robot.get_ray_angles())
+            expected = Geometry.cast_rays(pos, directions, walls, robot.ray_length)
+            if not np.allclose(grid.cast_rays(pos, directions, robot.ray_length), expected, atol=1e-9):
+                raise SystemExit(f"Grid ray cast mismatch with {count} walls")
+            box = Geometry.robot_boxes(pos + rng.uniform(-15, 15, size=2), robot.size)
+            if grid.box_hits(box) != bool(Geometry.boxes_hit_walls(box, walls)):
+                raise SystemExit(f"Grid collision mismatch with {count} walls")
+
+        brute_us = time_steps(robot, walls, poses)
+        grid_us = time_steps(robot, grid, poses)
+        default_us = time_steps(robot, default_grid, poses)
+        print(f"{count:6d} {brute_us:14.1f} {grid_us:13.1f} {brute_us / grid_us:12.2f}x {default_us:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
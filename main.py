@@ -1,20 +1,62 @@
 
+from gymnasium.wrappers import TimeLimit
+from stable_baselines3.common.callbacks import CallbackList
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
 import matplotlib.pyplot as plt
 from Game_Env import Game_Env
+from TrainingCallbacks import AsyncCheckpointCallback, EpochCallback, latest_checkpoint, load_checkpoint, \
+    restore_checkpoint
 from TrainingLogger import TrainingLogger
 from Policy_A2C import Policy_A2C
+from Vec_Game_Env import Vec_Game_Env
 
 # Global:
 NUM_OF_EPOCH = 600
 NUM_OF_STEPS_PER_EPOCH = 3000
 NUM_OF_ENV = 5
+MAX_EPISODE_STEPS = 3000  # Episodes are truncated after this many steps (unsuccessful for the success rate)
 ENT_COEF = 0.015
+BATCHED_ENV = False  # True: simulate all envs in a single Vec_Game_Env (array state, scales to 256+ envs)
+DISTANCE_FIELD = False  # True: bake a clearance field per layout (O(1) collisions, exact rays)
+PROFILE_STEPS = False  # True: time env step stages and report them with the rewards on each rollout
+RESAMPLE_LAYOUT = False  # True: new layout and target every episode instead of one per env
+REWARD_SHAPING = False  # True: potential-based shaping from the shortest-path distance to the target
+DEMONSTRATIONS = None  # Directory of SimpleSearch demonstrations (Demonstrations.py): behavior-cloning warm start
+BC_EPOCHS = 3
+CHECKPOINT_EVERY = 50  # Epochs between background checkpoints of the full training state (0: only at the end)
+CHECKPOINT_DIR = "checkpoints"
+KEEP_CHECKPOINTS = 3
+RESUME = False  # True: continue from the latest checkpoint in CHECKPOINT_DIR (same settings, unfinished run)
+LIVE_VIEW = False  # True: watch env 0 in a separate viewer process while training (does not slow the envs down)
+NUM_RAYS = 17  # Range sensor rays; e.g. 360 with FOV = 360.0 for a full lidar scan
+FOV = 60.0
 
 
 def env_fn(render_type=None):
-    return Game_Env(render_type, ran_house=False)
+    env = Game_Env(render_type, ran_house=False, distance_field=DISTANCE_FIELD, profile=PROFILE_STEPS,
+                   resample_layout=RESAMPLE_LAYOUT, reward_shaping=REWARD_SHAPING, num_rays=NUM_RAYS, fov=FOV)
+    return TimeLimit(env, MAX_EPISODE_STEPS)
+
+def training_config():
+    # Settings a checkpoint must share with this run to be resumed
+    return {"num_of_epoch": NUM_OF_EPOCH, "steps_per_epoch": NUM_OF_STEPS_PER_EPOCH, "num_of_env": NUM_OF_ENV,
+            "ent_coef": ENT_COEF, "max_episode_steps": MAX_EPISODE_STEPS, "batched_env": BATCHED_ENV,
+            "distance_field": DISTANCE_FIELD, "resample_layout": RESAMPLE_LAYOUT, "reward_shaping": REWARD_SHAPING,
+            "demonstrations": DEMONSTRATIONS, "num_rays": NUM_RAYS, "fov": FOV}
+
+
+def check_resumable(state, total_timesteps):
+    # Refuses checkpoints of other settings or of a finished run, instead of silently continuing them
+    saved = state.get("extra", {}).get("config")
+    if saved != training_config():
+        changed = sorted(key for key in training_config() if saved is None or saved.get(key) != training_config()[key])
+        raise SystemExit(f"Checkpoint settings differ from main.py ({', '.join(changed) if saved else 'not recorded'}): "
+                         f"set RESUME = False or use another CHECKPOINT_DIR")
+    if state["num_timesteps"] >= total_timesteps:
+        raise SystemExit(f"Checkpoint is from a finished run ({state['num_timesteps']} steps): "
+                         f"set RESUME = False or use another CHECKPOINT_DIR")
+
 
 def plot_metrics(reward_history, iterations):
     plt.figure(figsize=(10, 6))
@@ -32,7 +74,13 @@ def plot_metrics(reward_history, iterations):
 
 def main():
     print(">>> creating env \n")
-    vec_env = make_vec_env(env_fn, n_envs=NUM_OF_ENV)
+    if BATCHED_ENV:
+        vec_env = Vec_Game_Env(NUM_OF_ENV, ran_house=False, profile=PROFILE_STEPS, reward_shaping=REWARD_SHAPING,
+                               num_rays=NUM_RAYS, fov=FOV, max_episode_steps=MAX_EPISODE_STEPS)
+    else:
+        vec_env = make_vec_env(env_fn, n_envs=NUM_OF_ENV)
+    if LIVE_VIEW:
+        vec_env.env_method("attach_viewer", indices=0)
 
     normalized_vec_env = VecNormalize(vec_env,
                                       norm_obs=True,  # normalize observations
@@ -42,27 +90,39 @@ def main():
 
     print(">>> creating policy \n")
     policy = Policy_A2C(normalized_vec_env, ENT_COEF)
+    checkpoint_path = latest_checkpoint(CHECKPOINT_DIR) if RESUME else None
+    if DEMONSTRATIONS is not None and checkpoint_path is None:
+        print(">>> behavior cloning warm start \n")
+        for epoch, (loss, accuracy) in enumerate(policy.pretrain(DEMONSTRATIONS, epochs=BC_EPOCHS)):
+            print(f"     epoch {epoch + 1}: loss {loss:.3f}, action accuracy {accuracy * 100:.1f}%")
+
+    name = "p_4"
+    total_timesteps = NUM_OF_EPOCH * NUM_OF_STEPS_PER_EPOCH
 
     print(">>> setting up training loger \n")
-    reward = []
-    time = []
+    # One learn() over the whole budget: epochs, metric snapshots and checkpoints come from callbacks
+    training_logger = TrainingLogger(verbose=int(PROFILE_STEPS), log_stage_timings=PROFILE_STEPS)
+    epochs = EpochCallback(NUM_OF_STEPS_PER_EPOCH, training_logger, verbose=1)
+    checkpoints = AsyncCheckpointCallback(CHECKPOINT_DIR, CHECKPOINT_EVERY * NUM_OF_STEPS_PER_EPOCH or total_timesteps,
+                                          normalized_vec_env, keep_last=KEEP_CHECKPOINTS,
+                                          extra_state=lambda: {"epochs": epochs.snapshots, "config": training_config()},
+                                          verbose=1)
+    if checkpoint_path is not None:
+        print(f">>> resuming from {checkpoint_path} \n")
+        state = load_checkpoint(checkpoint_path)
+        check_resumable(state, total_timesteps)
+        restore_checkpoint(policy.model, state, normalized_vec_env)
+        epochs.snapshots = state["extra"]["epochs"]
 
     print(">>> starting training: \n")
-    for i in range(NUM_OF_EPOCH):
-
-        print("     starting iteration: ", i+1)
-        vec_env.reset()
-        training_logger = TrainingLogger()
-        policy.model.learn(total_timesteps=NUM_OF_STEPS_PER_EPOCH,
-                           log_interval=50,
-                           callback=training_logger)
-
-        reward.append(training_logger.get_rewards())
-        time.append(training_logger.get_episode_lengths())
+    policy.model.learn(total_timesteps=total_timesteps - policy.model.num_timesteps,
+                       log_interval=50,
+                       callback=CallbackList([training_logger, epochs, checkpoints]),
+                       reset_num_timesteps=checkpoint_path is None)
+    reward = epochs.get_rewards()
+    time = epochs.get_episode_lengths()
 
     vec_env.close()
-
-    name = "p_4"
     policy.save_model(name)
     normalized_vec_env.save(f"{name}_vec_normalize_try.pkl")  # Save normalization statistics
 
@@ -1,23 +1,129 @@
-import pygame
-import numpy as np
 import random
 
+import numpy as np
+
+import Geometry
+
+# Baked distance fields, wall grids, reachable areas and geodesic fields of the fixed layouts,
+# keyed by (layout name, size) and shared by every House
+_distance_field_cache = {}
+_wall_grid_cache = {}
+
+# Geodesic fields kept per layout (oldest dropped first); layouts with fixed target candidates
+# (corpus, layout pool) reuse them across episodes
+GEODESIC_CACHE_SIZE = 64
+
+# Everything that describes one layout; the rest of a House (size, rng, target) is independent of it
+_LAYOUT_ATTRIBUTES = ("walls", "wall_array", "wall_grid", "reachable_area", "distance_field", "wall_index",
+                      "layout_name", "layout_index", "_layout_key", "_target_candidates", "_geodesic_fields")
+
+
 class House:
-    def __init__(self, size, robot_start_pos, randomize_house=True, num_random_walls=10):
+    def __init__(self, size, robot_start_pos, randomize_house=True, num_random_walls=10,
+                 bake_distance_field=False, rng=None, corpus=None, layout_index=None, robot_size=10):
         self.size = size
         self.wall_thickness = 10
         self.num_random_walls = num_random_walls  # Store the number of random walls
         self.robot_start_pos = np.array(robot_start_pos)  # Store robot start position
+        self.robot_size = robot_size  # Half size of the robot box, for the reachable area
         self.randomize_house = randomize_house
-        self.walls = self._create_layout()
-        self.target_pos = self.place_target()
+        # Layout and target randomness: pass the env's np_random to make houses reproducible
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._draws_rng = None  # Generator self._random was seeded from (see _draws)
+        self.layout_name = None  # Name of the fixed layout, None for random layouts
+        self.layout_index = None  # Index in the layout corpus, None for generated layouts
+        self._layout_key = None  # Key for sharing baked data between houses with the same fixed layout
+        self.bake_distance_field = bake_distance_field
+        self._build_layout(corpus, layout_index)
+        self.target_pos = self._pick_target()
         self.target_size = 10  # Size of the target circle TODO return to size 10
 
+    def _build_layout(self, corpus, layout_index):
+        self.layout_name = None
+        self.layout_index = None
+        self._layout_key = None
+        self._target_candidates = None  # Validated target positions of corpus layouts
+        if corpus is not None:
+            self.walls, self._target_candidates = self._load_layout(corpus, layout_index)
+        else:
+            self.walls = self._create_layout()
+        # The reachable area also depends on the robot
+        grid_key = self._layout_key + (tuple(self.robot_start_pos), self.robot_size) if self._layout_key else None
+        if grid_key in _wall_grid_cache:
+            self.wall_array, self.wall_grid, self.reachable_area, self._geodesic_fields = _wall_grid_cache[grid_key]
+        else:
+            self.wall_array = Geometry.pack_walls(self.walls)  # Packed (W, 4) walls for the ray casting kernel
+            self.wall_grid = Geometry.WallGrid(self.wall_array, self.size)  # Spatial index for collisions and rays
+            # Where the robot can go from its start position; targets are only placed there. Corpus
+            # layouts come with target positions that were checked when the corpus was generated.
+            self.reachable_area = None if corpus is not None else Geometry.ReachableArea(
+                self.wall_array, self.size, self.robot_start_pos, self.robot_size)
+            self._geodesic_fields = {}  # Target position -> GeodesicField (see geodesic_field)
+            if grid_key is not None:
+                _wall_grid_cache[grid_key] = (self.wall_array, self.wall_grid, self.reachable_area,
+                                              self._geodesic_fields)
+        self.distance_field = self._bake_distance_field() if self.bake_distance_field else None
+        # What the robot queries for collisions and rays
+        self.wall_index = self.distance_field if self.distance_field is not None else self.wall_grid
+
+    def _pick_target(self):
+        if self._target_candidates is not None:
+            return np.array(self._target_candidates[self.rng.integers(len(self._target_candidates))])
+        return self.place_target()
+
+    def resample(self, corpus=None, layout_index=None):
+        """
+        Swaps in a new layout and target in place: generated like in the constructor, or
+        loaded from corpus (layout_index, or one drawn from self.rng).
+        """
+        self._build_layout(corpus, layout_index)
+        self.target_pos = self._pick_target()
+
+    def get_layout(self, num_targets=0):
+        """
+        The current layout with its built spatial structures, for reuse with set_layout.
+
+        Args:
+            num_targets: Number of target positions to draw now (with place_target) for
+                generated layouts, so set_layout only picks one of them.
+
+        Returns:
+            dict: Layout attributes (walls, packed walls, wall grid, distance field, ...).
+        """
+        layout = {name: getattr(self, name) for name in _LAYOUT_ATTRIBUTES}
+        if num_targets and layout["_target_candidates"] is None:
+            layout["_target_candidates"] = np.array([self.place_target() for _ in range(num_targets)])
+        return layout
+
+    def set_layout(self, layout):
+        """Switches to a layout from get_layout (no rebuilding) and places a new target in it."""
+        for name in _LAYOUT_ATTRIBUTES:
+            setattr(self, name, layout[name])
+        self.target_pos = self._pick_target()
+
+    def geodesic_field(self):
+        """
+        Shortest-path distances to the current target (Geometry.GeodesicField), built on first
+        use and cached with the layout.
+        """
+        key = (float(self.target_pos[0]), float(self.target_pos[1]))
+        fields = self._geodesic_fields
+        if key not in fields:
+            if self.reachable_area is None:  # Not built for corpus layouts
+                self.reachable_area = Geometry.ReachableArea(self.wall_array, self.size, self.robot_start_pos,
+                                                             self.robot_size)
+            if len(fields) >= GEODESIC_CACHE_SIZE:
+                del fields[next(iter(fields))]
+            fields[key] = Geometry.GeodesicField(self.reachable_area, self.target_pos, self.robot_size)
+        return fields[key]
+
     def _create_layout(self):
         if self.randomize_house:
             return self._create_random_layout()
         else:
-            layout = random.choice(["layout1", "layout2", "layout3"])
+            layout = ("layout1", "layout2", "layout3")[self.rng.integers(3)]
+            self.layout_name = layout
+            self._layout_key = (layout, self.size)
             if layout == "layout1":
                 return self._create_constant_layout1()
             elif layout == "layout2":
@@ -27,6 +133,27 @@ class House:
             else:
                 return self._create_constant_layout1()
 
+    def _load_layout(self, corpus, layout_index):
+        # Walls and target candidates are read-only views into the memory-mapped corpus (no copy)
+        if corpus.size != self.size:
+            raise ValueError(f"Layout corpus {corpus.path} holds {corpus.size}px houses, not {self.size}px")
+        if not np.array_equal(corpus.robot_start_pos, self.robot_start_pos):
+            raise ValueError(f"Layout corpus {corpus.path} was validated for robot start "
+                             f"{list(corpus.robot_start_pos)}, not {list(self.robot_start_pos)}")
+        if layout_index is None:
+            layout_index = corpus.sample_index(self.rng)
+        self.layout_index = int(layout_index)
+        self.layout_name = corpus.layout_name(self.layout_index)
+        return corpus.walls(self.layout_index), corpus.target_candidates(self.layout_index)
+
+    def _bake_distance_field(self):
+        if self._layout_key is None:
+            return Geometry.DistanceField(self.wall_array, self.size, self.wall_grid)
+        if self._layout_key not in _distance_field_cache:
+            _distance_field_cache[self._layout_key] = Geometry.DistanceField(self.wall_array, self.size,
+                                                                             self.wall_grid)
+        return _distance_field_cache[self._layout_key]
+
     def _create_constant_layout1(self):
         # Define room sizes and positions (adjust these)
         room_width = self.size // 4
@@ -36,43 +163,43 @@ class House:
         # Create walls
         walls = [
             # Outer walls DO NO TOUCH
-            pygame.Rect(0, 0, self.size, self.wall_thickness),  # Top wall
-            pygame.Rect(0, 0, self.wall_thickness, self.size),  # Left wall
-            pygame.Rect(0, self.size - self.wall_thickness, self.size, self.wall_thickness),  # Bottom wall
-            pygame.Rect(self.size - self.wall_thickness, 0, self.wall_thickness, self.size),  # Right wall
+            Geometry.wall_rect(0, 0, self.size, self.wall_thickness),  # Top wall
+            Geometry.wall_rect(0, 0, self.wall_thickness, self.size),  # Left wall
+            Geometry.wall_rect(0, self.size - self.wall_thickness, self.size, self.wall_thickness),  # Bottom wall
+            Geometry.wall_rect(self.size - self.wall_thickness, 0, self.wall_thickness, self.size),  # Right wall
 
             # Internal Walls Defining Rooms with Doorways
-            pygame.Rect(room_width, 0, self.wall_thickness, room_height // 2 - door_width // 2), # y = 0, y = 1/8 * board , x = 1/4 *board
+            Geometry.wall_rect(room_width, 0, self.wall_thickness, room_height // 2 - door_width // 2), # y = 0, y = 1/8 * board , x = 1/4 *board
             # Room 1/2 divider (top)
             # pygame.Rect(room_width, room_height // 2 + door_width // 2, self.wall_thickness,
             #             room_height - (room_height // 2 - door_width // 2) - (room_height // 2 + door_width // 2)),
             # Room 1/2 divider (bottom)
 
-            pygame.Rect(0, room_height, room_width // 2 - door_width // 2, self.wall_thickness), # x = 0, x = 1/8 *board, y = 1/4 * board
+            Geometry.wall_rect(0, room_height, room_width // 2 - door_width // 2, self.wall_thickness), # x = 0, x = 1/8 *board, y = 1/4 * board
             # Room 2/3 divider (left)
             # pygame.Rect(room_width // 2 + door_width // 2, room_height,
             #             room_width - (room_width // 2 - door_width // 2) - (room_width // 2 + door_width // 2),
             #             self.wall_thickness),  # Room 2/3 divider (right)
 
-            pygame.Rect(room_width * 2, 0, self.wall_thickness, room_height - door_width // 2),  # x = 1/2 * board, y = 0, y = 1/4 * board
+            Geometry.wall_rect(room_width * 2, 0, self.wall_thickness, room_height - door_width // 2),  # x = 1/2 * board, y = 0, y = 1/4 * board
             # pygame.Rect(room_width * 2, room_height + door_width // 2, self.wall_thickness,
             #             room_height - (room_height + door_width // 2)),  # Room 4 divider (bottom)
 
-            pygame.Rect(0, room_height * 2, room_width * 3, self.wall_thickness),  # x=0, x = 3/4 * board, y =1/2 * board
+            Geometry.wall_rect(0, room_height * 2, room_width * 3, self.wall_thickness),  # x=0, x = 3/4 * board, y =1/2 * board
 
-            pygame.Rect(room_width * 3, room_height * 2, self.wall_thickness, room_height // 2 - door_width // 2), # x = 3/4 * board, y = 1/2 * borad, y = 5/8 * board
+            Geometry.wall_rect(room_width * 3, room_height * 2, self.wall_thickness, room_height // 2 - door_width // 2), # x = 3/4 * board, y = 1/2 * borad, y = 5/8 * board
             # Room 6 divider (top)
             # pygame.Rect(room_width * 3, room_height * 2 + room_height // 2 + door_width // 2, self.wall_thickness,
             #             room_height - (room_height // 2 - door_width // 2) - (
             #                         room_height * 2 + room_height // 2 + door_width // 2)),  # Room 6 divider (bottom)
 
-            pygame.Rect(room_width * 3, room_height, self.size - room_width * 3, self.wall_thickness), # y = 1/4 * board, x = 3/4 * board, x = board
+            Geometry.wall_rect(room_width * 3, room_height, self.size - room_width * 3, self.wall_thickness), # y = 1/4 * board, x = 3/4 * board, x = board
             # TopRightRoomsDivider
 
-            pygame.Rect(room_width, room_height * 3, self.wall_thickness, self.size - room_height * 3),
+            Geometry.wall_rect(room_width, room_height * 3, self.wall_thickness, self.size - room_height * 3),
             # BottomLeftRoomsDivider
 
-            pygame.Rect(room_width, room_height, room_width // 2 - door_width // 2, self.wall_thickness), # tiny floating wall on top left
+            Geometry.wall_rect(room_width, room_height, room_width // 2 - door_width // 2, self.wall_thickness), # tiny floating wall on top left
             # HorizontalWallForMiddleRooms (left)
             # pygame.Rect(room_width + room_width // 2 + door_width // 2, room_height,
             #             room_width - (room_width // 2 - door_width // 2) - (room_width // 2 + door_width // 2),
@@ -91,34 +218,34 @@ class House:
         # Create walls
         walls = [
             # Outer walls DO NO TOUCH
-            pygame.Rect(0, 0, self.size, self.wall_thickness),  # Top wall
-            pygame.Rect(0, 0, self.wall_thickness, self.size),  # Left wall
-            pygame.Rect(0, self.size - self.wall_thickness, self.size, self.wall_thickness),  # Bottom wall
-            pygame.Rect(self.size - self.wall_thickness, 0, self.wall_thickness, self.size),  # Right wall
+            Geometry.wall_rect(0, 0, self.size, self.wall_thickness),  # Top wall
+            Geometry.wall_rect(0, 0, self.wall_thickness, self.size),  # Left wall
+            Geometry.wall_rect(0, self.size - self.wall_thickness, self.size, self.wall_thickness),  # Bottom wall
+            Geometry.wall_rect(self.size - self.wall_thickness, 0, self.wall_thickness, self.size),  # Right wall
 
             # Internal Walls Defining Rooms with Doorways
-            pygame.Rect(0, room_width, room_height // 2 - door_width // 2, self.wall_thickness),
+            Geometry.wall_rect(0, room_width, room_height // 2 - door_width // 2, self.wall_thickness),
             # x = 0, x = 1/8 * board , y = 1/4 *board
 
-            pygame.Rect(room_height, 0, self.wall_thickness, room_width // 2 - door_width // 2),
+            Geometry.wall_rect(room_height, 0, self.wall_thickness, room_width // 2 - door_width // 2),
             # y = 0, y = 1/8 *board, x = 1/4 * board
 
-            pygame.Rect(0, room_width * 2, room_height - door_width // 2, self.wall_thickness),
+            Geometry.wall_rect(0, room_width * 2, room_height - door_width // 2, self.wall_thickness),
             # y = 1/2 * board, x = 0, x = 1/4 * board
 
-            pygame.Rect(room_height * 2, 0, self.wall_thickness, room_width * 3),
+            Geometry.wall_rect(room_height * 2, 0, self.wall_thickness, room_width * 3),
             # y=0, y = 3/4 * board, x =1/2 * board
 
-            pygame.Rect(room_height * 2, room_width * 3, room_height // 2 - door_width // 2, self.wall_thickness),
+            Geometry.wall_rect(room_height * 2, room_width * 3, room_height // 2 - door_width // 2, self.wall_thickness),
             # y = 3/4 * board, x = 1/2 * borad, x = 5/8 * board
 
-            pygame.Rect(room_height, room_width * 3, self.wall_thickness, self.size - room_width * 3),
+            Geometry.wall_rect(room_height, room_width * 3, self.wall_thickness, self.size - room_width * 3),
             # x = 1/4 * board, y = 3/4 * board, y = board
 
-            pygame.Rect(room_height * 3, room_width, self.size - room_height * 3, self.wall_thickness),
+            Geometry.wall_rect(room_height * 3, room_width, self.size - room_height * 3, self.wall_thickness),
             # BottomLeftRoomsDivider
 
-            pygame.Rect(room_height, room_width, self.wall_thickness, room_width // 2 - door_width // 2),
+            Geometry.wall_rect(room_height, room_width, self.wall_thickness, room_width // 2 - door_width // 2),
             # tiny floating wall on top left
 
         ]
@@ -133,28 +260,28 @@ class House:
         # Create walls
         walls = [
             # Outer walls
-            pygame.Rect(0, 0, self.size, self.wall_thickness),  # Top wall
-            pygame.Rect(0, 0, self.wall_thickness, self.size),  # Left wall
-            pygame.Rect(0, self.size - self.wall_thickness, self.size, self.wall_thickness),  # Bottom wall
-            pygame.Rect(self.size - self.wall_thickness, 0, self.wall_thickness, self.size),  # Right wall
+            Geometry.wall_rect(0, 0, self.size, self.wall_thickness),  # Top wall
+            Geometry.wall_rect(0, 0, self.wall_thickness, self.size),  # Left wall
+            Geometry.wall_rect(0, self.size - self.wall_thickness, self.size, self.wall_thickness),  # Bottom wall
+            Geometry.wall_rect(self.size - self.wall_thickness, 0, self.wall_thickness, self.size),  # Right wall
 
             # Vertical dividers
             # Central vertical divider with wide gap in middle
-            pygame.Rect(self.size // 2, 0, self.wall_thickness, room_height * 2 - passage_width),  # Top section
+            Geometry.wall_rect(self.size // 2, 0, self.wall_thickness, room_height * 2 - passage_width),  # Top section
 
 
             # Right quarter divider
-            pygame.Rect(room_width * 3, room_height, self.wall_thickness, room_height * 2.5),  # Longer wall
+            Geometry.wall_rect(room_width * 3, room_height, self.wall_thickness, room_height * 2.5),  # Longer wall
 
             # Horizontal dividers
             # Upper horizontal divider
-            pygame.Rect(0, room_height, room_width - passage_width, self.wall_thickness),  # Left section
-            pygame.Rect(room_width + passage_width, room_height, room_width - passage_width, self.wall_thickness),
+            Geometry.wall_rect(0, room_height, room_width - passage_width, self.wall_thickness),  # Left section
+            Geometry.wall_rect(room_width + passage_width, room_height, room_width - passage_width, self.wall_thickness),
             # Right section
 
             # Lower horizontal divider with wide opening
-            pygame.Rect(0, room_height * 3, room_width * 2 - passage_width, self.wall_thickness),  # Left section
-            pygame.Rect(room_width * 2 + passage_width, room_height * 3, room_width * 2 - passage_width,
+            Geometry.wall_rect(0, room_height * 3, room_width * 2 - passage_width, self.wall_thickness),  # Left section
+            Geometry.wall_rect(room_width * 2 + passage_width, room_height * 3, room_width * 2 - passage_width,
                         self.wall_thickness),  # Right section
         ]
 
@@ -163,10 +290,10 @@ class House:
     def _create_random_layout(self):
         # Start with border walls
         walls = [
-            pygame.Rect(0, 0, self.size, self.wall_thickness),  # Top wall
-            pygame.Rect(0, 0, self.wall_thickness, self.size),  # Left wall
-            pygame.Rect(0, self.size - self.wall_thickness, self.size, self.wall_thickness),  # Bottom wall
-            pygame.Rect(self.size - self.wall_thickness, 0, self.wall_thickness, self.size),  # Right wall
+            Geometry.wall_rect(0, 0, self.size, self.wall_thickness),  # Top wall
+            Geometry.wall_rect(0, 0, self.wall_thickness, self.size),  # Left wall
+            Geometry.wall_rect(0, self.size - self.wall_thickness, self.size, self.wall_thickness),  # Bottom wall
+            Geometry.wall_rect(self.size - self.wall_thickness, 0, self.wall_thickness, self.size),  # Right wall
         ]
 
         # Generate random inner walls
@@ -175,38 +302,39 @@ class House:
         min_wall_gap = self.size // 5  # Minimum gap between walls and from borders
 
         wall_free_zone_size = 30  # Adjust size as needed
-        wall_free_zone = pygame.Rect(
+        wall_free_zone = Geometry.wall_rect(
             self.robot_start_pos[0] - wall_free_zone_size // 2,
             self.robot_start_pos[1] - wall_free_zone_size // 2,
             wall_free_zone_size,
             wall_free_zone_size
         )
 
+        draws = self._draws() if self.num_random_walls else None
         for _ in range(self.num_random_walls):
-            orientation = random.choice(['horizontal', 'vertical'])
+            orientation = draws.choice(('horizontal', 'vertical'))
             if orientation == 'horizontal':
                 # Horizontal wall
-                length = random.randint(min_wall_length, max_wall_length)
-                x = random.randint(self.wall_thickness + min_wall_gap,
+                length = draws.randint(min_wall_length, max_wall_length)
+                x = draws.randint(self.wall_thickness + min_wall_gap,
                                    self.size - self.wall_thickness - min_wall_gap - length)
-                y = random.randint(self.wall_thickness + min_wall_gap, self.size - self.wall_thickness - min_wall_gap)
-                wall = pygame.Rect(x, y, length, self.wall_thickness)
+                y = draws.randint(self.wall_thickness + min_wall_gap, self.size - self.wall_thickness - min_wall_gap)
+                wall = Geometry.wall_rect(x, y, length, self.wall_thickness)
             else:  # vertical
                 # Vertical wall
-                length = random.randint(min_wall_length, max_wall_length)
-                x = random.randint(self.wall_thickness + min_wall_gap, self.size - self.wall_thickness - min_wall_gap)
-                y = random.randint(self.wall_thickness + min_wall_gap,
+                length = draws.randint(min_wall_length, max_wall_length)
+                x = draws.randint(self.wall_thickness + min_wall_gap, self.size - self.wall_thickness - min_wall_gap)
+                y = draws.randint(self.wall_thickness + min_wall_gap,
                                    self.size - self.wall_thickness - min_wall_gap - length)
-                wall = pygame.Rect(x, y, self.wall_thickness, length)
+                wall = Geometry.wall_rect(x, y, self.wall_thickness, length)
 
             # Basic check to avoid overlapping with border walls too closely (can be improved)
             valid_position = True
 
-            if wall_free_zone.colliderect(wall):  # Check against wall_free_zone
+            if Geometry.rects_overlap(wall_free_zone, wall):  # Check against wall_free_zone
                 valid_position = False  # Reject if in wall_free_zone
             else:
                 for existing_wall in walls:
-                    if wall.colliderect(existing_wall):
+                    if Geometry.rects_overlap(wall, existing_wall):
                         valid_position = False
                         break
 
@@ -215,40 +343,52 @@ class House:
 
         return walls
 
-    def place_target(self):
-        # Place target randomly within a randomly chosen quarter of the house
+    def _draws(self):
+        # Scalar draws from a NumPy Generator cost a few us each; rejection sampling uses a
+        # random.Random seeded from self.rng instead (reseeded whenever self.rng is replaced),
+        # so layouts and targets stay reproducible from the seed
+        if self._draws_rng is not self.rng:
+            self._random = random.Random(int(self.rng.integers(2 ** 63)))
+            self._draws_rng = self.rng
+        return self._random
 
-        quarter = random.randint(1, 4)  # Choose a random quarter (1, 2, 3, or 4)
+    def place_target(self):
+        # Place target randomly within a randomly chosen quarter of the house, next to a position
+        # the robot can reach from its start (a quarter it cannot reach is swapped for another)
+        draws = self._draws()
+        reach = self.robot_size
+        low, middle, high = self.wall_thickness, self.size // 2, self.size - self.wall_thickness
+        quarters = [(low, low, middle, middle),  # Top-Left
+                    (middle, low, high, middle),  # Top-Right
+                    (low, middle, middle, high),  # Bottom-Left
+                    (middle, middle, high, high)]  # Bottom-Right
+        quarter = quarters[draws.randint(1, 4) - 1]  # Choose a random quarter (1, 2, 3, or 4)
+        if not self._quarter_reachable(quarter):
+            reachable_quarters = [q for q in quarters if self._quarter_reachable(q)]
+            if not reachable_quarters:
+                raise ValueError(f"Robot start position {list(self.robot_start_pos)} is inside a wall")
+            quarter = draws.choice(reachable_quarters)
+        left, top, right, bottom = quarter
 
         while True:
-            if quarter == 1:  # Top-Left
-                x = random.randint(self.wall_thickness, self.size // 2)
-                y = random.randint(self.wall_thickness, self.size // 2)
-            elif quarter == 2:  # Top-Right
-                x = random.randint(self.size // 2, self.size - self.wall_thickness)
-                y = random.randint(self.wall_thickness, self.size // 2)
-            elif quarter == 3:  # Bottom-Left
-                x = random.randint(self.wall_thickness, self.size // 2)
-                y = random.randint(self.size // 2, self.size - self.wall_thickness)
-            else:  # Bottom-Right (quarter == 4)
-                x = random.randint(self.size // 2, self.size - self.wall_thickness)
-                y = random.randint(self.size // 2, self.size - self.wall_thickness)
-
-            target_pos = np.array([x, y], dtype=np.float32)
-
-            if not self.is_inside_wall(target_pos):
+            target_pos = np.array([draws.randint(left, right), draws.randint(top, bottom)], dtype=np.float32)
+            if not self.is_inside_wall(target_pos) and self.reachable_area.near(target_pos, reach):
                 return target_pos
 
+    def _quarter_reachable(self, quarter):
+        left, top, right, bottom = quarter
+        reach = self.robot_size
+        return self.reachable_area.any_in(left - reach, top - reach, right + reach, bottom + reach)
+
     def is_inside_wall(self, pos):
-        point = pygame.Rect(pos[0], pos[1], 1, 1)  # Treat position as a point rect
-        for wall in self.walls:
-            if point.colliderect(wall):
-                return True
-        return False
+        # Treat position as a point rect, like pygame.Rect(pos[0], pos[1], 1, 1)
+        return self.wall_grid.point_in_wall(np.trunc(pos))
 
     def draw(self, surface):
+        import pygame  # Only needed for rendering
+
         # Draw walls
         for wall in self.walls:
-            pygame.draw.rect(surface, (0, 0, 0), wall)  # Black walls
+            pygame.draw.rect(surface, (0, 0, 0), Geometry.wall_rect(*wall))  # Black walls
         # Draw target
         pygame.draw.circle(surface, (0, 255, 0), self.target_pos.astype(int), self.target_size)  # Green target
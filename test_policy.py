@@ -1,9 +1,9 @@
-from stable_baselines3.common.env_util import make_vec_env
-from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
-import matplotlib.pyplot as plt
+import os
+
 from Game_Env import Game_Env
-from TrainingLogger import TrainingLogger
-from Policy_A2C import Policy_A2C
+from NumpyPolicy import NumpyPolicy, export_policy
+
+POLICY_FILE = "p_2_policy.npz"
 
 
 def env_fn(render_type=None):
@@ -13,21 +13,18 @@ def env_fn(render_type=None):
 
 if __name__ == "__main__":
 
-    env = env_fn("human")
-    vec_env = DummyVecEnv([lambda: env])
-    # normalized_vec_env = VecNormalize.load("p_2_vec_normalize.pkl", vec_env) # rl alg
-    normalized_vec_env = VecNormalize.load("p_4_vec_normalize.pkl", vec_env)
-    normalized_vec_env.training = False  # Don't update normalization stats during testing
-    normalized_vec_env.norm_reward = False  # Don't normalize rewards during testing
+    if not os.path.exists(POLICY_FILE):
+        # One-off export; needs stable-baselines3 and torch, running the policy does not
+        # export_policy("p_2.zip", "p_2_vec_normalize.pkl", POLICY_FILE) # rl alg
+        export_policy("p_2.zip", "p_4_vec_normalize.pkl", POLICY_FILE)
+    policy = NumpyPolicy(POLICY_FILE)
 
-    policy = Policy_A2C(normalized_vec_env)
-    policy.load_model("p_2")
-    obs = normalized_vec_env.reset()
-    terminated = False
+    env = env_fn("human")
+    obs, _ = env.reset()
+    terminated = truncated = False
 
     print(">>> stating test \n")
-    while not terminated:
-        action, _states = policy.model.predict(obs)
-        obs, reward, terminated, info = normalized_vec_env.step(action)
+    while not (terminated or truncated):
+        action, _states = policy.predict(obs)
+        obs, reward, terminated, truncated, info = env.step(int(action))
     print(">>> finished test \n")
-